@@ -2,14 +2,16 @@
 Read file into texts and calls.
 It's ok if you don't understand how to read files.
 """
-import csv
-with open('texts.csv', 'r') as f:
-    reader = csv.reader(f)
-    texts = list(reader)
+import sys
+from collections import deque
+from pathlib import Path
 
-with open('calls.csv', 'r') as f:
-    reader = csv.reader(f)
-    calls = list(reader)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src'))
+from telecom_records import iter_calls, iter_texts  # noqa: E402
+
+# Records are streamed one at a time (header rows are skipped)
+texts = iter_texts('texts.csv')
+calls = iter_calls('calls.csv')
 
 
 """
@@ -21,13 +23,13 @@ Print messages:
 """
 
 
-first = texts[0]
+first = next(texts)
 i1 = first[0]
 a1 = first[1]
 sT1 = first[2]
 
 
-last = calls[-1]
+last = deque(calls, maxlen=1)[0]
 i2 = last[0]
 a2 = last[1]
 sT2 = last[2]
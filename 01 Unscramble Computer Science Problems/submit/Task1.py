@@ -2,14 +2,15 @@
 Read file into texts and calls.
 It's ok if you don't understand how to read files.
 """
-import csv
-with open('texts.csv', 'r') as f:
-    reader = csv.reader(f)
-    texts = list(reader)
-
-with open('calls.csv', 'r') as f:
-    reader = csv.reader(f)
-    calls = list(reader)
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src'))
+from telecom_records import iter_calls, iter_texts  # noqa: E402
+
+# Records are streamed one at a time (header rows are skipped)
+texts = iter_texts('texts.csv')
+calls = iter_calls('calls.csv')
 
 
 """
@@ -2,15 +2,15 @@
 Read file into texts and calls.
 It's ok if you don't understand how to read files.
 """
-import csv
+import sys
+from pathlib import Path
 
-with open('texts.csv', 'r') as f:
-    reader = csv.reader(f)
-    texts = list(reader)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src'))
+from telecom_records import iter_calls, iter_texts  # noqa: E402
 
-with open('calls.csv', 'r') as f:
-    reader = csv.reader(f)
-    calls = list(reader)
+# Records are streamed one at a time (header rows are skipped)
+texts = iter_texts('texts.csv')
+calls = iter_calls('calls.csv')
 
 """
 TASK 3:
@@ -45,22 +45,25 @@ The percentage should have 2 decimal digits
 """
 
 # Part A
-called_numbers = []
-for i in range(len(calls)):
-    if calls[i][0][:5] == '(080)':
-        if calls[i][1][0] == '(':
-            par_index = calls[i][1].find(')')
-            called_numbers.append(calls[i][1][:par_index+1])
-        elif calls[i][1][:3] == '140':
-            called_numbers.append('140')
+called_codes = set()
+count = 0
+l = 0
+for call in calls:
+    if call[0][:5] == '(080)':
+        if call[1][0] == '(':
+            par_index = call[1].find(')')
+            code = call[1][:par_index+1]
+        elif call[1][:3] == '140':
+            code = '140'
         else:
-            called_numbers.append(calls[i][1][:4])
+            code = call[1][:4]
+        called_codes.add(code)
+        l += 1
+        if code == '(080)':
+            count += 1
 
-l = len(called_numbers)
-count = called_numbers.count('(080)')
-called_numbers = sorted(set(called_numbers))
 print("The numbers called by people in Bangalore have codes:")
-for code in called_numbers:
+for code in sorted(called_codes):
     print(code)
 
 # Part B
@@ -2,15 +2,15 @@
 Read file into texts and calls.
 It's ok if you don't understand how to read files.
 """
-import csv
+import sys
+from pathlib import Path
 
-with open('texts.csv', 'r') as f:
-    reader = csv.reader(f)
-    texts = list(reader)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src'))
+from telecom_records import iter_calls, iter_texts  # noqa: E402
 
-with open('calls.csv', 'r') as f:
-    reader = csv.reader(f)
-    calls = list(reader)
+# Records are streamed one at a time (header rows are skipped)
+texts = iter_texts('texts.csv')
+calls = iter_calls('calls.csv')
 
 """
 TASK 4:
@@ -26,14 +26,16 @@ The list of numbers should be print out one per line in lexicographic order with
 """
 
 
-dials = {call[0] for call in calls}
-receives = [call[1] for call in calls]
+dials = set()
 real_people = set()
 
-for text, receive in zip(texts, receives):
-    for i in range(0, 2):
-        real_people.add(text[i])
-    real_people.add(receive)
+for call in calls:
+    dials.add(call[0])
+    real_people.add(call[1])
+
+for text in texts:
+    real_people.add(text[0])
+    real_people.add(text[1])
 
 potential_telemarketers = {call for call in dials if call not in real_people}
 
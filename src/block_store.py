@@ -0,0 +1,500 @@
+"""
+Append-Only Block Store
+=======================
+
+Persistent storage for ``enhanced_blockchain`` blocks:
+- Serialized blocks are appended to numbered segment files that roll over
+  at a size limit, so no file grows without bound
+- ``index.dat`` holds one fixed-width record per height (segment, offset,
+  length, block hash) and is read through ``mmap``, so a lookup by height
+  is one record read plus one block read
+- At most ``max_open_segments`` segment files stay open for reading
+  (least recently read closed first), however long the chain grows
+- ``hashes.dat`` is an on-disk open-addressing hash table (mmap'd) mapping
+  block hash -> height, checked against the hash in the index record
+- Reopening only maps the two index files; no block is read
+
+Directory layout (integers big-endian)::
+
+    segment_00000.dat ...  serialized blocks
+    index.dat              per height: segment (u32) | offset (u64)
+                           | length (u32) | hash (32)
+    hashes.dat             slot count (u64) | entry count (u64)
+                           | slots (u64 height + 1, 0 = empty)
+
+Time Complexity: O(1) append and lookup by height or hash (amortized)
+Space Complexity: O(n) on disk; O(1) in memory beyond the mappings
+"""
+
+import mmap
+import os
+import random
+import struct
+import tempfile
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+from enhanced_blockchain import (
+    GENESIS_PREVIOUS_HASH,
+    Block,
+    Blockchain,
+    MerkleTree,
+)
+
+BLOCK_HEADER = struct.Struct(">Qd32s32s32sBQBI")
+LENGTH = struct.Struct(">I")
+TRANSACTION = struct.Struct(">BI")
+INDEX_RECORD = struct.Struct(">IQI32s")
+TABLE_HEADER = struct.Struct(">QQ")
+SLOT = struct.Struct(">Q")
+
+INDEX_FILE = "index.dat"
+HASH_TABLE_FILE = "hashes.dat"
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024
+DEFAULT_OPEN_SEGMENTS = 8
+INITIAL_SLOTS = 1024
+
+
+def _segment_path(directory: Path, segment: int) -> Path:
+    return directory / f"segment_{segment:05d}.dat"
+
+
+def serialize_block(block: Block) -> bytes:
+    """
+    Serialize a block (header, data and any Merkle body transactions).
+
+    Args:
+        block: Block to serialize
+
+    Returns:
+        Serialized bytes
+    """
+    data = block.data.encode("utf-8")
+    parts = [
+        BLOCK_HEADER.pack(
+            block.index,
+            block.timestamp,
+            block.previous_hash,
+            block.data_hash,
+            block.hash,
+            block.difficulty,
+            block.nonce,
+            block.body is not None,
+            len(data),
+        ),
+        data,
+    ]
+    if block.body is not None:
+        parts.append(LENGTH.pack(len(block.body.transactions)))
+        for tx in block.body.transactions:
+            raw = tx.encode("utf-8") if isinstance(tx, str) else tx
+            parts.append(TRANSACTION.pack(isinstance(tx, str), len(raw)))
+            parts.append(raw)
+    return b"".join(parts)
+
+
+def deserialize_block(buffer: bytes) -> Block:
+    """
+    Rebuild a block from ``serialize_block`` output.
+
+    Args:
+        buffer: Serialized block
+
+    Returns:
+        The block (its Merkle body is rebuilt from the transactions)
+    """
+    (
+        index,
+        timestamp,
+        previous_hash,
+        data_hash,
+        block_hash,
+        difficulty,
+        nonce,
+        has_body,
+        size,
+    ) = BLOCK_HEADER.unpack_from(buffer, 0)
+    offset = BLOCK_HEADER.size
+    data = buffer[offset : offset + size].decode("utf-8")
+    offset += size
+    body = None
+    if has_body:
+        (count,) = LENGTH.unpack_from(buffer, offset)
+        offset += LENGTH.size
+        transactions: List[Union[str, bytes]] = []
+        for _ in range(count):
+            is_text, tx_size = TRANSACTION.unpack_from(buffer, offset)
+            offset += TRANSACTION.size
+            raw = buffer[offset : offset + tx_size]
+            offset += tx_size
+            transactions.append(raw.decode("utf-8") if is_text else raw)
+        body = MerkleTree(transactions)
+    return Block(
+        index,
+        timestamp,
+        data,
+        previous_hash,
+        data_hash,
+        block_hash,
+        body,
+        difficulty,
+        nonce,
+    )
+
+
+def stored_height(directory: Union[str, Path]) -> int:
+    """Number of complete blocks in a store, from the index size alone."""
+    return os.path.getsize(Path(directory) / INDEX_FILE) // INDEX_RECORD.size
+
+
+def read_blocks(
+    directory: Union[str, Path], start: int = 0, stop: Optional[int] = None
+) -> Iterator[Block]:
+    """
+    Read stored blocks ``[start, stop)`` without opening the store for writing.
+
+    Safe to call from several processes at once (e.g. parallel verifiers).
+
+    Args:
+        directory: Store directory
+        start: First height
+        stop: Height to stop at (default: the stored height)
+
+    Yields:
+        Blocks in height order
+    """
+    directory = Path(directory)
+    height = stored_height(directory)
+    stop = height if stop is None else min(stop, height)
+    if start >= stop:
+        return
+    # Heights are read in order, so only the current segment is kept open
+    reader: Optional[BinaryIO] = None
+    current = -1
+    try:
+        with open(directory / INDEX_FILE, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as index:
+            for position in range(start, stop):
+                segment, offset, length, _ = INDEX_RECORD.unpack_from(
+                    index, position * INDEX_RECORD.size
+                )
+                if reader is None or segment != current:
+                    if reader is not None:
+                        reader.close()
+                    reader = open(_segment_path(directory, segment), "rb")
+                    current = segment
+                reader.seek(offset)
+                yield deserialize_block(reader.read(length))
+    finally:
+        if reader is not None:
+            reader.close()
+
+
+class BlockStore:
+    """
+    Segmented append-only block store with mmap'd height and hash indexes.
+
+    Only blocks that extend the stored chain (next height, linked to the
+    current tip) are accepted.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        max_open_segments: int = DEFAULT_OPEN_SEGMENTS,
+    ) -> None:
+        """
+        Open (or create) a store.
+
+        A partially written trailing index record or block left by a crash
+        is truncated away; no complete block is read.
+
+        Args:
+            directory: Store directory
+            segment_size: Bytes after which a new segment file is started
+            max_open_segments: Segment read handles kept open (LRU)
+
+        Raises:
+            ValueError: If max_open_segments is not positive
+        """
+        if max_open_segments <= 0:
+            raise ValueError("max_open_segments must be positive")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+        self.max_open_segments = max_open_segments
+        # segment -> read handle, least recently read first
+        self._readers: "OrderedDict[int, BinaryIO]" = OrderedDict()
+
+        index_path = self.directory / INDEX_FILE
+        index_path.touch()
+        complete = os.path.getsize(index_path) // INDEX_RECORD.size
+        with open(index_path, "r+b") as f:
+            f.truncate(complete * INDEX_RECORD.size)
+        self._index_file = open(index_path, "ab")
+        self._index_map: Optional[mmap.mmap] = None
+        self._height = complete
+
+        if complete:
+            segment, offset, length, tip = self._record(complete - 1)
+            self._segment, self._segment_end = segment, offset + length
+            self._tip_hash = tip
+        else:
+            self._segment, self._segment_end = 0, 0
+            self._tip_hash = GENESIS_PREVIOUS_HASH
+        segment_path = self._segment_path(self._segment)
+        segment_path.touch()
+        with open(segment_path, "r+b") as f:
+            f.truncate(self._segment_end)
+        self._writer = open(segment_path, "ab")
+
+        self._open_hash_table()
+
+    def _segment_path(self, segment: int) -> Path:
+        return _segment_path(self.directory, segment)
+
+    def _record(self, height: int) -> Tuple[int, int, int, bytes]:
+        """
+        Read the index record for ``height`` through the mapping.
+
+        Appends never read the index, so the file is only remapped when a
+        read asks for a record written since the last mapping.
+        """
+        end = (height + 1) * INDEX_RECORD.size
+        if self._index_map is None or len(self._index_map) < end:
+            if self._index_map is not None:
+                self._index_map.close()
+            self._index_file.flush()
+            with open(self.directory / INDEX_FILE, "rb") as f:
+                self._index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return INDEX_RECORD.unpack_from(self._index_map, height * INDEX_RECORD.size)
+
+    # Hash table -----------------------------------------------------------
+
+    def _open_hash_table(self) -> None:
+        """Map the hash table, creating or catching it up if needed."""
+        path = self.directory / HASH_TABLE_FILE
+        if not path.exists() or os.path.getsize(path) < TABLE_HEADER.size:
+            self._build_hash_table(INITIAL_SLOTS)
+            return
+        self._table_file = open(path, "r+b")
+        self._table = mmap.mmap(self._table_file.fileno(), 0)
+        slots, count = TABLE_HEADER.unpack_from(self._table, 0)
+        self._slots = slots
+        if count > self._height or 2 * self._height > slots:
+            self._close_hash_table()
+            self._build_hash_table(self._slots)
+            return
+        for height in range(count, self._height):
+            self._table_insert(height, self._record(height)[3])
+
+    def _build_hash_table(self, slots: int) -> None:
+        """Write a fresh table with ``slots`` slots from the index records."""
+        while slots < 2 * (self._height + 1):
+            slots *= 2
+        path = self.directory / HASH_TABLE_FILE
+        temporary = path.with_suffix(".tmp")
+        with open(temporary, "wb") as f:
+            f.write(TABLE_HEADER.pack(slots, 0))
+            f.truncate(TABLE_HEADER.size + slots * SLOT.size)
+        os.replace(temporary, path)
+        self._table_file = open(path, "r+b")
+        self._table = mmap.mmap(self._table_file.fileno(), 0)
+        self._slots = slots
+        for height in range(self._height):
+            self._table_insert(height, self._record(height)[3])
+
+    def _close_hash_table(self) -> None:
+        self._table.close()
+        self._table_file.close()
+
+    def _slot_offset(self, slot: int) -> int:
+        return TABLE_HEADER.size + slot * SLOT.size
+
+    def _table_insert(self, height: int, block_hash: bytes) -> None:
+        """Record ``block_hash -> height`` (linear probing)."""
+        slot = int.from_bytes(block_hash[:8], "big") % self._slots
+        while SLOT.unpack_from(self._table, self._slot_offset(slot))[0]:
+            slot = (slot + 1) % self._slots
+        SLOT.pack_into(self._table, self._slot_offset(slot), height + 1)
+        count = TABLE_HEADER.unpack_from(self._table, 0)[1]
+        TABLE_HEADER.pack_into(self._table, 0, self._slots, count + 1)
+
+    def height_of(self, block_hash: bytes) -> Optional[int]:
+        """
+        Look up the height of a block by its hash.
+
+        Args:
+            block_hash: 32-byte block digest
+
+        Returns:
+            Height, or None if no stored block has that hash
+        """
+        slot = int.from_bytes(block_hash[:8], "big") % self._slots
+        while True:
+            entry = SLOT.unpack_from(self._table, self._slot_offset(slot))[0]
+            if not entry:
+                return None
+            if self._record(entry - 1)[3] == block_hash:
+                return entry - 1
+            slot = (slot + 1) % self._slots
+
+    # Blocks -----------------------------------------------------------------
+
+    def append(self, block: Block) -> None:
+        """
+        Persist ``block`` as the new tip.
+
+        Args:
+            block: Next block of the chain
+
+        Raises:
+            ValueError: If the block does not extend the stored chain
+        """
+        if block.index != self._height or block.previous_hash != self._tip_hash:
+            raise ValueError(
+                f"Block {block.index} does not extend the store at height "
+                f"{self._height}"
+            )
+        blob = serialize_block(block)
+        if self._segment_end and self._segment_end + len(blob) > self.segment_size:
+            self._writer.close()
+            self._segment += 1
+            self._segment_end = 0
+            # "wb" discards any unindexed tail left by a crash mid-rollover
+            self._writer = open(self._segment_path(self._segment), "wb")
+        self._writer.write(blob)
+        self._writer.flush()
+        self._index_file.write(
+            INDEX_RECORD.pack(self._segment, self._segment_end, len(blob), block.hash)
+        )
+        self._index_file.flush()
+        self._segment_end += len(blob)
+        self._height += 1
+        self._tip_hash = block.hash
+
+        if 2 * self._height > self._slots:
+            self._close_hash_table()
+            self._build_hash_table(self._slots * 2)
+        else:
+            self._table_insert(block.index, block.hash)
+
+    def get(self, height: int) -> Block:
+        """
+        Read the block at ``height``.
+
+        Raises:
+            IndexError: If no block is stored at that height
+        """
+        if not 0 <= height < self._height:
+            raise IndexError(f"No block at height {height}")
+        segment, offset, length, _ = self._record(height)
+        reader = self._readers.get(segment)
+        if reader is None:
+            if len(self._readers) >= self.max_open_segments:
+                self._readers.popitem(last=False)[1].close()
+            reader = self._readers[segment] = open(self._segment_path(segment), "rb")
+        else:
+            self._readers.move_to_end(segment)
+        reader.seek(offset)
+        return deserialize_block(reader.read(length))
+
+    def get_by_hash(self, block_hash: bytes) -> Optional[Block]:
+        """Read the block with ``block_hash``, or None if it is not stored."""
+        height = self.height_of(block_hash)
+        return None if height is None else self.get(height)
+
+    def hash_at(self, height: int) -> bytes:
+        """Return the hash of the block at ``height`` from the index alone."""
+        if not 0 <= height < self._height:
+            raise IndexError(f"No block at height {height}")
+        return self._record(height)[3]
+
+    @property
+    def tip_hash(self) -> bytes:
+        """Hash of the last stored block (the genesis sentinel when empty)."""
+        return self._tip_hash
+
+    def __len__(self) -> int:
+        return self._height
+
+    def __getitem__(self, height: int) -> Block:
+        return self.get(height)
+
+    def __iter__(self) -> Iterator[Block]:
+        for height in range(self._height):
+            yield self.get(height)
+
+    def close(self) -> None:
+        """Flush and release every file handle and mapping."""
+        self._writer.close()
+        self._index_file.close()
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_map = None
+        for reader in self._readers.values():
+            reader.close()
+        self._readers.clear()
+        self._table.flush()
+        self._close_hash_table()
+
+    def __enter__(self) -> "BlockStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def benchmark_block_store(blocks: int = 100_000, lookups: int = 10_000) -> None:
+    """
+    Measure append, reopen and random-access cost of the block store.
+
+    Args:
+        blocks: Blocks to write
+        lookups: Random reads by height and by hash
+    """
+    chain = Blockchain()
+    for i in range(blocks):
+        chain.append(f"transaction batch {i}", timestamp=float(i))
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        with BlockStore(directory, segment_size=4 * 1024 * 1024) as store:
+            for block in chain:
+                store.append(block)
+        append_us = (time.perf_counter() - start) * 1e6 / blocks
+
+        start = time.perf_counter()
+        store = BlockStore(directory)
+        reopen_ms = (time.perf_counter() - start) * 1000
+
+        heights = [random.randrange(blocks) for _ in range(lookups)]
+        start = time.perf_counter()
+        for height in heights:
+            store.get(height)
+        by_height_us = (time.perf_counter() - start) * 1e6 / lookups
+
+        hashes = [chain[height].hash for height in heights]
+        start = time.perf_counter()
+        for block_hash in hashes:
+            store.get_by_hash(block_hash)
+        by_hash_us = (time.perf_counter() - start) * 1e6 / lookups
+        store.close()
+
+        segments = len(list(Path(directory).glob("segment_*.dat")))
+        print(
+            f"{blocks} blocks in {segments} segments: append {append_us:.1f} us | "
+            f"reopen {reopen_ms:.2f} ms | get by height {by_height_us:.1f} us | "
+            f"get by hash {by_hash_us:.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("BLOCK STORE BENCHMARK")
+    print("=" * 60)
+    benchmark_block_store()
@@ -0,0 +1,494 @@
+"""
+Columnar Call Log Archive
+=========================
+
+A compact on-disk format for the ``calls.csv`` / ``texts.csv`` datasets.
+Each CSV column is stored separately so an analysis only reads and decodes
+the columns it needs:
+- Phone numbers are interned into a dictionary ordered by frequency, so
+  busy numbers get small ids
+- Timestamps are stored as deltas of epoch seconds, parsed by fixed-position
+  slicing instead of ``strptime``
+- Integer columns (ids, timestamp deltas, durations) are bit-packed at the
+  column's own width above its minimum (frame of reference); with NumPy a
+  whole column unpacks in a few vectorized steps
+- The dictionary is Huffman coded with ``enhanced_huffman`` when that is
+  smaller than the raw bytes
+- CSV input is streamed row by row into compact ``array`` columns
+- ``read_records`` serves archive rows to the Task 2-4 readers, decoding
+  only the columns an analysis asks for
+
+File layout (integers big-endian)::
+
+    MAGIC (4) | kind (u8) | row count (u32) | column count (u8)
+    directory: per column name length (u8) | name | codec (u8)
+               | offset (u64) | length (u64)
+    column blobs ...
+    bit-packed blob = width (u8) | base (i64) | values - base, ``width``
+                      bits each, most significant bit first
+    timestamp blob = first timestamp (i64) | bit-packed deltas
+
+Time Complexity: O(n) to build, O(n) per column read
+Space Complexity: O(u + n) where u is the number of distinct phone numbers
+"""
+
+import calendar
+import csv
+import struct
+import sys
+import time
+from array import array
+from functools import lru_cache
+from itertools import accumulate, chain, repeat
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from enhanced_huffman import huffman_decoding, huffman_encoding
+from telecom_records import iter_rows
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is an optional speed-up
+    np = None
+
+MAGIC = b"CLA1"
+HEADER = struct.Struct(">4sBIB")
+DIRECTORY_ENTRY = struct.Struct(">BQQ")
+BITPACK_HEADER = struct.Struct(">Bq")
+DELTA_ORIGIN = struct.Struct(">q")
+TIMESTAMP_FORMAT = "%d-%m-%Y %H:%M:%S"
+SECONDS_PER_DAY = 86400
+# Values unpacked per vectorized step (bounds the temporary bit matrix)
+NUMPY_CHUNK_VALUES = 1 << 18
+
+CODEC_RAW = 0
+CODEC_HUFFMAN = 1
+CODEC_BITPACK = 2
+CODEC_DELTA_BITPACK = 3
+
+DICTIONARY = "numbers"
+KINDS: Dict[int, Tuple[str, ...]] = {
+    0: ("caller", "receiver", "timestamp", "duration"),
+    1: ("sender", "receiver", "timestamp"),
+}
+NUMBER_COLUMNS = {"caller", "receiver", "sender"}
+
+
+@lru_cache(maxsize=4096)
+def _day_start(date: str) -> int:
+    """Epoch seconds at midnight (UTC) of a ``dd-mm-YYYY`` date."""
+    return calendar.timegm((int(date[6:10]), int(date[3:5]), int(date[:2]), 0, 0, 0))
+
+
+@lru_cache(maxsize=4096)
+def _day_label(day: int) -> str:
+    """``dd-mm-YYYY`` label of an epoch day number."""
+    return time.strftime("%d-%m-%Y", time.gmtime(day * SECONDS_PER_DAY))
+
+
+def parse_timestamp(timestamp: str) -> int:
+    """
+    Convert a ``dd-mm-YYYY HH:MM:SS`` timestamp to epoch seconds (UTC).
+
+    Fields are read by position; the date part is converted once per day.
+
+    Raises:
+        ValueError: If the timestamp is not in the CSV format
+    """
+    if len(timestamp) != 19 or timestamp[2] != "-" or timestamp[13] != ":":
+        raise ValueError(f"Bad timestamp {timestamp!r}; expected {TIMESTAMP_FORMAT}")
+    return (
+        _day_start(timestamp[:10])
+        + int(timestamp[11:13]) * 3600
+        + int(timestamp[14:16]) * 60
+        + int(timestamp[17:19])
+    )
+
+
+@lru_cache(maxsize=1)
+def _clock_labels() -> List[str]:
+    """``HH:MM:SS`` label of every second of a day."""
+    two_digits = [f"{value:02d}" for value in range(60)]
+    return [
+        f"{hour}:{minute}:{second}"
+        for hour in two_digits[:24]
+        for minute in two_digits
+        for second in two_digits
+    ]
+
+
+def format_timestamp(seconds: int) -> str:
+    """Convert epoch seconds back to the CSV timestamp format."""
+    day, second = divmod(seconds, SECONDS_PER_DAY)
+    return f"{_day_label(day)} {_clock_labels()[second]}"
+
+
+def format_timestamps(seconds: Iterable[int]) -> List[str]:
+    """``format_timestamp`` for a whole column, formatting each day once."""
+    clock = _clock_labels()
+    prefixes: Dict[int, str] = {}
+    labels = []
+    for day, second in map(divmod, seconds, repeat(SECONDS_PER_DAY)):
+        prefix = prefixes.get(day)
+        if prefix is None:
+            prefix = prefixes[day] = _day_label(day) + " "
+        labels.append(prefix + clock[second])
+    return labels
+
+
+def pack_column(values: Sequence[int]) -> bytes:
+    """
+    Bit-pack integers at the narrowest width that holds ``value - min``.
+
+    Args:
+        values: Integers (any sign)
+
+    Returns:
+        Bit-packed blob (width, base, packed values)
+    """
+    base = min(values) if len(values) else 0
+    width = (max(values) - base).bit_length() if len(values) else 0
+    header = BITPACK_HEADER.pack(width, base)
+    if not width:
+        return header
+    offsets = [value - base for value in values]
+    offsets += [0] * (-len(offsets) % 8)
+    # Eight values of ``width`` bits fill exactly ``width`` bytes
+    output = bytearray()
+    for start in range(0, len(offsets), 8):
+        group = 0
+        for value in offsets[start : start + 8]:
+            group = (group << width) | value
+        output += group.to_bytes(width, "big")
+    return header + bytes(output)
+
+
+def _unpack_numpy(packed: bytes, count: int, width: int) -> List[int]:
+    """Vectorized ``unpack_column`` body: bits to a matrix, matrix to ints."""
+    weights = np.left_shift(np.int64(1), np.arange(width - 1, -1, -1, dtype=np.int64))
+    data = np.frombuffer(packed, dtype=np.uint8)
+    values: List[int] = []
+    # A multiple of 8 values starts on a byte boundary
+    step = NUMPY_CHUNK_VALUES
+    for start in range(0, count, step):
+        stop = min(start + step, count)
+        chunk = data[start * width // 8 : -(-stop * width // 8)]
+        bits = np.unpackbits(chunk)[: (stop - start) * width]
+        values.extend((bits.reshape(-1, width).astype(np.int64) @ weights).tolist())
+    return values
+
+
+def unpack_column(blob: bytes, count: int) -> List[int]:
+    """
+    Inverse of ``pack_column``.
+
+    Args:
+        blob: Bit-packed blob
+        count: Number of values packed
+
+    Returns:
+        Decoded integers
+    """
+    width, base = BITPACK_HEADER.unpack_from(blob)
+    if not width:
+        return [base] * count
+    packed = blob[BITPACK_HEADER.size :]
+    if np is not None and width < 63:
+        offsets = _unpack_numpy(packed, count, width)
+    else:
+        mask = (1 << width) - 1
+        shifts = range(7 * width, -1, -width)
+        offsets = []
+        for start in range(0, len(packed), width):
+            group = int.from_bytes(packed[start : start + width], "big")
+            offsets.extend((group >> shift) & mask for shift in shifts)
+        del offsets[count:]
+    return [base + value for value in offsets] if base else offsets
+
+
+def _compress(blob: bytes) -> Tuple[int, bytes]:
+    """Huffman code ``blob`` if that makes it smaller."""
+    encoded = huffman_encoding(blob)
+    if len(encoded) < len(blob):
+        return CODEC_HUFFMAN, encoded
+    return CODEC_RAW, blob
+
+
+def build_archive(rows: Iterable[Sequence[str]], archive_path: Union[str, Path]) -> int:
+    """
+    Write call or text records to a columnar archive.
+
+    Rows are consumed once; each column is kept as a compact ``array``.
+
+    Args:
+        rows: Records with 4 fields (calls) or 3 fields (texts), no header
+        archive_path: Destination file
+
+    Returns:
+        Size of the written archive in bytes
+
+    Raises:
+        ValueError: If the records are neither call nor text records
+    """
+    iterator = iter(rows)
+    first = next(iterator, None)
+    width = len(first) if first is not None else 4
+    kind = next((k for k, names in KINDS.items() if len(names) == width), None)
+    if kind is None:
+        raise ValueError("Records must all have 4 (calls) or 3 (texts) fields")
+    names = KINDS[kind]
+    number_fields = [i for i, name in enumerate(names) if name in NUMBER_COLUMNS]
+    timestamp_field = names.index("timestamp")
+
+    # Numbers get first-seen ids while streaming, renumbered by frequency below
+    first_seen: Dict[str, int] = {}
+    counts: List[int] = []
+    columns = [array("q") for _ in names]
+    previous_second: Optional[int] = None
+    row_count = 0
+    for row in chain([first], iterator) if first is not None else ():
+        if len(row) != width:
+            raise ValueError("Records must all have 4 (calls) or 3 (texts) fields")
+        for index in number_fields:
+            number_id = first_seen.setdefault(row[index], len(counts))
+            if number_id == len(counts):
+                counts.append(0)
+            counts[number_id] += 1
+            columns[index].append(number_id)
+        second = parse_timestamp(row[timestamp_field])
+        if previous_second is None:
+            origin = previous_second = second
+        columns[timestamp_field].append(second - previous_second)
+        previous_second = second
+        if "duration" in names:
+            columns[3].append(int(row[3]))
+        row_count += 1
+
+    # Stable sort keeps first-seen order among equally busy numbers
+    by_frequency = sorted(range(len(counts)), key=counts.__getitem__, reverse=True)
+    new_ids = [0] * len(counts)
+    for new_id, old_id in enumerate(by_frequency):
+        new_ids[old_id] = new_id
+    numbers = list(first_seen)
+    dictionary = "\n".join(numbers[old_id] for old_id in by_frequency)
+
+    codec, dictionary_blob = _compress(dictionary.encode("utf-8"))
+    compressed: List[Tuple[str, int, bytes]] = [(DICTIONARY, codec, dictionary_blob)]
+    for index, name in enumerate(names):
+        column: Sequence[int] = columns[index]
+        if index in number_fields:
+            column = [new_ids[old_id] for old_id in column]
+        if index == timestamp_field:
+            blob = DELTA_ORIGIN.pack(origin if row_count else 0) + pack_column(column)
+            compressed.append((name, CODEC_DELTA_BITPACK, blob))
+        else:
+            compressed.append((name, CODEC_BITPACK, pack_column(column)))
+    directory_size = sum(
+        1 + len(name) + DIRECTORY_ENTRY.size for name, *_ in compressed
+    )
+    offset = HEADER.size + directory_size
+
+    with open(archive_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, kind, row_count, len(compressed)))
+        for name, codec, blob in compressed:
+            encoded_name = name.encode("ascii")
+            f.write(bytes([len(encoded_name)]) + encoded_name)
+            f.write(DIRECTORY_ENTRY.pack(codec, offset, len(blob)))
+            offset += len(blob)
+        for _, _, blob in compressed:
+            f.write(blob)
+    return offset
+
+
+def convert_csv(csv_path: Union[str, Path], archive_path: Union[str, Path]) -> int:
+    """
+    Convert ``calls.csv`` or ``texts.csv`` into a columnar archive.
+
+    Args:
+        csv_path: Source CSV file (header row optional)
+        archive_path: Destination archive file
+
+    Returns:
+        Size of the written archive in bytes
+    """
+    return build_archive(iter_rows(csv_path), archive_path)
+
+
+def is_archive(path: Union[str, Path]) -> bool:
+    """Return True if ``path`` is a call log archive (checks the magic bytes)."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def read_records(
+    path: Union[str, Path], columns: Optional[Sequence[str]] = None
+) -> List[List[str]]:
+    """
+    Read the records of an archive as CSV-style rows (no header row).
+
+    Args:
+        path: Archive file
+        columns: Columns to decode, in order (defaults to all)
+
+    Returns:
+        One list of strings per record
+    """
+    return list(CallLogArchive(path).iter_rows(columns))
+
+
+class CallLogArchive:
+    """Reader that decodes individual columns of a call/text archive."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Open an archive and read its directory (no column data is read).
+
+        Args:
+            path: Archive file
+
+        Raises:
+            ValueError: If the file is not a call log archive
+        """
+        self.path = Path(path)
+        self._numbers: Optional[List[str]] = None
+        self._directory: Dict[str, Tuple[int, int, int]] = {}
+        with open(self.path, "rb") as f:
+            header = f.read(HEADER.size)
+            if len(header) != HEADER.size:
+                raise ValueError(f"Truncated call log archive: {path}")
+            magic, kind, self.row_count, column_count = HEADER.unpack(header)
+            if magic != MAGIC or kind not in KINDS:
+                raise ValueError(f"Not a call log archive: {path}")
+            for _ in range(column_count):
+                name_length = f.read(1)
+                name = f.read(name_length[0]) if name_length else b""
+                entry = f.read(DIRECTORY_ENTRY.size)
+                complete = name_length and len(name) == name_length[0]
+                if not complete or len(entry) != DIRECTORY_ENTRY.size:
+                    raise ValueError(f"Truncated call log archive: {path}")
+                self._directory[name.decode("ascii")] = DIRECTORY_ENTRY.unpack(entry)
+        self.kind = "calls" if kind == 0 else "texts"
+        self.columns: Tuple[str, ...] = KINDS[kind]
+
+    def _read_blob(self, name: str) -> Tuple[int, bytes]:
+        """Read one column blob; returns (codec, bytes), Huffman decoded."""
+        if name not in self._directory:
+            raise KeyError(f"Unknown column {name!r}; available: {self.columns}")
+        codec, offset, length = self._directory[name]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            blob = f.read(length)
+        if codec == CODEC_HUFFMAN:
+            return codec, huffman_decoding(blob)
+        return codec, blob
+
+    @property
+    def numbers(self) -> List[str]:
+        """Phone number dictionary (id -> number), loaded on first use."""
+        if self._numbers is None:
+            text = self._read_blob(DICTIONARY)[1].decode("utf-8")
+            self._numbers = text.split("\n") if text else []
+        return self._numbers
+
+    def raw_column(self, name: str) -> List[int]:
+        """
+        Decode a column to integers without converting back to strings.
+
+        Number columns yield dictionary ids, timestamps epoch seconds and
+        durations seconds.
+
+        Args:
+            name: Column name
+
+        Returns:
+            One integer per row
+        """
+        codec, blob = self._read_blob(name)
+        if codec == CODEC_BITPACK:
+            return unpack_column(blob, self.row_count)
+        if codec == CODEC_DELTA_BITPACK:
+            (origin,) = DELTA_ORIGIN.unpack_from(blob)
+            deltas = unpack_column(blob[DELTA_ORIGIN.size :], self.row_count)
+            if deltas:
+                deltas[0] += origin
+            return list(accumulate(deltas))
+        raise ValueError(f"Unknown codec {codec} for column {name!r}")
+
+    def column(self, name: str) -> List[str]:
+        """
+        Decode a column to the strings found in the original CSV.
+
+        Args:
+            name: Column name
+
+        Returns:
+            One string per row
+        """
+        values = self.raw_column(name)
+        if name in NUMBER_COLUMNS:
+            numbers = self.numbers
+            return [numbers[value] for value in values]
+        if name == "timestamp":
+            return format_timestamps(values)
+        return [str(value) for value in values]
+
+    def iter_rows(self, columns: Optional[Sequence[str]] = None) -> Iterator[List[str]]:
+        """
+        Yield records as lists of strings, like ``csv.reader`` rows.
+
+        Args:
+            columns: Columns to include, in order (defaults to all)
+
+        Yields:
+            One list per record
+        """
+        selected = [self.column(name) for name in (columns or self.columns)]
+        for row in zip(*selected):
+            yield list(row)
+
+    def stored_size(self, name: str) -> int:
+        """Bytes a column occupies on disk."""
+        return self._directory[name][2]
+
+
+def benchmark_scan(csv_path: Union[str, Path], archive_path: Union[str, Path]) -> None:
+    """
+    Compare parsing the CSV with decoding archive columns.
+
+    Args:
+        csv_path: Source CSV file
+        archive_path: Archive built from it
+    """
+    start = time.perf_counter()
+    with open(csv_path, "r", encoding="utf-8", newline="") as f:
+        for _ in csv.reader(f):
+            pass
+    print(f"  csv.reader, all columns: {time.perf_counter() - start:.3f}s")
+    archive = CallLogArchive(archive_path)
+    for name in archive.columns:
+        start = time.perf_counter()
+        archive.raw_column(name)
+        print(f"  raw {name:>9} column:  {time.perf_counter() - start:.3f}s")
+    start = time.perf_counter()
+    for _ in archive.iter_rows():
+        pass
+    print(f"  iter_rows, all columns:  {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python call_log_archive.py <input.csv> <output.cla>")
+        sys.exit(1)
+    source, target = sys.argv[1], sys.argv[2]
+    archive_size = convert_csv(source, target)
+    csv_size = Path(source).stat().st_size
+    archive = CallLogArchive(target)
+    print(f"{source}: {csv_size} bytes -> {target}: {archive_size} bytes")
+    print(f"Compression ratio: {csv_size / archive_size:.2f}x")
+    for column_name in (DICTIONARY,) + archive.columns:
+        print(f"  {column_name:>10}: {archive.stored_size(column_name)} bytes")
+    print("Scan times:")
+    benchmark_scan(source, target)
@@ -0,0 +1,421 @@
+"""
+Approximate Union and Intersection Sizes
+========================================
+
+Cardinality sketches for when only the *size* of a union or overlap is
+needed, not the sets themselves (the exact operations live in
+``enhanced_union_intersection``):
+- ``HyperLogLog``: distinct count in ``2 ** precision`` one-byte
+  registers, standard error about ``1.04 / sqrt(2 ** precision)``;
+  sketches merge by register-wise max, which is the sketch of the union
+- ``BottomKSketch`` (bottom-k MinHash): the ``k`` smallest value hashes,
+  standard error about ``1 / sqrt(k)``; two sketches give the Jaccard
+  similarity and so ``|A ∩ B| = J * |A ∪ B|``, which stays accurate
+  when the overlap is small relative to either set
+- Both are built from a target error (``for_error``), merge in place,
+  and serialize to a few kilobytes with ``to_bytes`` / ``from_bytes``
+- ``estimate_telemarketers`` streams the calls and texts logs into
+  sketches to size the overlaps used by ``enhanced_task4``
+
+Values are hashed by their ``str()`` with an unkeyed 64-bit BLAKE2b
+digest, so sketches built in different processes or runs can be merged.
+
+Time Complexity: O(1) per added value (HyperLogLog), O(log k) (bottom-k)
+Space Complexity: O(2 ** precision) bytes and O(k) hashes, whatever the
+number of values
+"""
+
+import heapq
+import math
+import random
+import struct
+import time
+from hashlib import blake2b
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+from telecom_records import iter_rows
+
+HLL_HEADER = struct.Struct(">4sB")
+BOTTOM_K_HEADER = struct.Struct(">4sII")
+HLL_MAGIC = b"HLL1"
+BOTTOM_K_MAGIC = b"BTK1"
+
+MIN_PRECISION = 4
+MAX_PRECISION = 18
+DEFAULT_PRECISION = 14
+DEFAULT_K = 1024
+HASH_BITS = 64
+_HASH_RANGE = float(1 << HASH_BITS)
+_INVERSE_POWERS = [2.0**-rank for rank in range(HASH_BITS + 1)]
+
+
+def hash64(value: Any) -> int:
+    """Stable 64-bit hash of ``str(value)`` (same in every process)."""
+    digest = blake2b(str(value).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch."""
+
+    __slots__ = ("precision", "registers")
+
+    def __init__(self, precision: int = DEFAULT_PRECISION) -> None:
+        """
+        Create an empty sketch.
+
+        Args:
+            precision: log2 of the register count (4 to 18)
+
+        Raises:
+            ValueError: If ``precision`` is out of range
+        """
+        if not MIN_PRECISION <= precision <= MAX_PRECISION:
+            raise ValueError(
+                f"precision must be between {MIN_PRECISION} and {MAX_PRECISION}"
+            )
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    @classmethod
+    def for_error(cls, error: float) -> "HyperLogLog":
+        """Smallest sketch whose standard error is at most ``error``."""
+        if not 0 < error < 1:
+            raise ValueError("error must be between 0 and 1")
+        precision = math.ceil(math.log2((1.04 / error) ** 2))
+        return cls(min(max(precision, MIN_PRECISION), MAX_PRECISION))
+
+    @property
+    def standard_error(self) -> float:
+        """Relative standard error of ``cardinality()``."""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add(self, value: Any) -> None:
+        """Add one value."""
+        self.add_hash(hash64(value))
+
+    def add_hash(self, hashed: int) -> None:
+        """Add a value already hashed with ``hash64``."""
+        rest_bits = HASH_BITS - self.precision
+        register = hashed >> rest_bits
+        rest = hashed & ((1 << rest_bits) - 1)
+        rank = rest_bits - rest.bit_length() + 1
+        if rank > self.registers[register]:
+            self.registers[register] = rank
+
+    def update(self, values: Iterable[Any]) -> None:
+        """Add every value of ``values``."""
+        for value in values:
+            self.add_hash(hash64(value))
+
+    def cardinality(self) -> float:
+        """Estimated number of distinct values added."""
+        m = len(self.registers)
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        powers = _INVERSE_POWERS
+        estimate = alpha * m * m / sum(powers[rank] for rank in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate while registers are still empty
+            return m * math.log(m / zeros)
+        return estimate
+
+    def _check_compatible(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError(
+                f"Cannot combine precision {self.precision} with {other.precision}"
+            )
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Fold ``other`` into this sketch (becomes the sketch of the union)."""
+        self._check_compatible(other)
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def __or__(self, other: "HyperLogLog") -> "HyperLogLog":
+        result = self.copy()
+        result.merge(other)
+        return result
+
+    def copy(self) -> "HyperLogLog":
+        """Return an independent copy."""
+        clone = HyperLogLog(self.precision)
+        clone.registers[:] = self.registers
+        return clone
+
+    def union_size(self, other: "HyperLogLog") -> float:
+        """Estimated ``|A ∪ B|``."""
+        return (self | other).cardinality()
+
+    def intersection_size(self, other: "HyperLogLog") -> float:
+        """
+        Estimated ``|A ∩ B|`` by inclusion-exclusion, clamped at zero.
+
+        The error scales with ``|A ∪ B|``, not with the overlap; prefer
+        ``BottomKSketch.intersection_size`` for small overlaps.
+        """
+        overlap = self.cardinality() + other.cardinality() - self.union_size(other)
+        return max(overlap, 0.0)
+
+    def to_bytes(self) -> bytes:
+        """Serialize as a 5-byte header followed by the registers."""
+        return HLL_HEADER.pack(HLL_MAGIC, self.precision) + bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        """
+        Load a sketch written by ``to_bytes``.
+
+        Raises:
+            ValueError: If ``data`` is not a serialized sketch
+        """
+        if len(data) < HLL_HEADER.size:
+            raise ValueError("Not a serialized HyperLogLog")
+        magic, precision = HLL_HEADER.unpack_from(data)
+        sketch = cls(precision)
+        if magic != HLL_MAGIC or len(data) != HLL_HEADER.size + len(sketch.registers):
+            raise ValueError("Not a serialized HyperLogLog")
+        sketch.registers[:] = data[HLL_HEADER.size :]
+        return sketch
+
+    def __len__(self) -> int:
+        return round(self.cardinality())
+
+    def __repr__(self) -> str:
+        return f"HyperLogLog(precision={self.precision}, ~{len(self)} values)"
+
+
+class BottomKSketch:
+    """Mergeable bottom-k MinHash signature."""
+
+    __slots__ = ("k", "_heap", "_hashes")
+
+    def __init__(self, k: int = DEFAULT_K) -> None:
+        """
+        Create an empty sketch.
+
+        Args:
+            k: Number of smallest hashes kept
+
+        Raises:
+            ValueError: If ``k`` < 2
+        """
+        if k < 2:
+            raise ValueError("k must be at least 2")
+        self.k = k
+        # Max-heap (negated) of the kept hashes, for O(1) access to the largest
+        self._heap: List[int] = []
+        self._hashes: Set[int] = set()
+
+    @classmethod
+    def for_error(cls, error: float) -> "BottomKSketch":
+        """Smallest sketch whose standard error is at most ``error``."""
+        if not 0 < error < 1:
+            raise ValueError("error must be between 0 and 1")
+        return cls(max(2, math.ceil(1 / error**2)))
+
+    @property
+    def standard_error(self) -> float:
+        """Relative standard error of ``cardinality()`` once saturated."""
+        return 1 / math.sqrt(self.k)
+
+    def add(self, value: Any) -> None:
+        """Add one value."""
+        self.add_hash(hash64(value))
+
+    def add_hash(self, hashed: int) -> None:
+        """Add a value already hashed with ``hash64``."""
+        if hashed in self._hashes:
+            return
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, -hashed)
+            self._hashes.add(hashed)
+        elif hashed < -self._heap[0]:
+            evicted = -heapq.heapreplace(self._heap, -hashed)
+            self._hashes.discard(evicted)
+            self._hashes.add(hashed)
+
+    def update(self, values: Iterable[Any]) -> None:
+        """Add every value of ``values``."""
+        for value in values:
+            self.add_hash(hash64(value))
+
+    def hashes(self) -> List[int]:
+        """The kept hashes in ascending order."""
+        return sorted(self._hashes)
+
+    def cardinality(self) -> float:
+        """Estimated distinct count (exact while fewer than ``k`` were seen)."""
+        if len(self._heap) < self.k:
+            return float(len(self._heap))
+        return (self.k - 1) / (-self._heap[0] / _HASH_RANGE)
+
+    def merge(self, other: "BottomKSketch") -> None:
+        """Fold ``other`` into this sketch (keeps this sketch's ``k``)."""
+        for hashed in other._hashes:
+            self.add_hash(hashed)
+
+    def __or__(self, other: "BottomKSketch") -> "BottomKSketch":
+        result = BottomKSketch(min(self.k, other.k))
+        result.merge(self)
+        result.merge(other)
+        return result
+
+    def jaccard(self, other: "BottomKSketch") -> float:
+        """Estimated ``|A ∩ B| / |A ∪ B|``."""
+        union = self | other
+        if not union._hashes:
+            return 0.0
+        shared = sum(
+            1
+            for hashed in union._hashes
+            if hashed in self._hashes and hashed in other._hashes
+        )
+        return shared / len(union._hashes)
+
+    def union_size(self, other: "BottomKSketch") -> float:
+        """Estimated ``|A ∪ B|``."""
+        return (self | other).cardinality()
+
+    def intersection_size(self, other: "BottomKSketch") -> float:
+        """Estimated ``|A ∩ B|`` as Jaccard similarity times union size."""
+        return self.jaccard(other) * self.union_size(other)
+
+    def to_bytes(self) -> bytes:
+        """Serialize as a header followed by the sorted 64-bit hashes."""
+        hashes = self.hashes()
+        return BOTTOM_K_HEADER.pack(BOTTOM_K_MAGIC, self.k, len(hashes)) + struct.pack(
+            f">{len(hashes)}Q", *hashes
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BottomKSketch":
+        """
+        Load a sketch written by ``to_bytes``.
+
+        Raises:
+            ValueError: If ``data`` is not a serialized sketch
+        """
+        if len(data) < BOTTOM_K_HEADER.size:
+            raise ValueError("Not a serialized BottomKSketch")
+        magic, k, count = BOTTOM_K_HEADER.unpack_from(data)
+        if magic != BOTTOM_K_MAGIC or len(data) != BOTTOM_K_HEADER.size + 8 * count:
+            raise ValueError("Not a serialized BottomKSketch")
+        sketch = cls(k)
+        for hashed in struct.unpack_from(f">{count}Q", data, BOTTOM_K_HEADER.size):
+            sketch.add_hash(hashed)
+        return sketch
+
+    def __len__(self) -> int:
+        return round(self.cardinality())
+
+    def __repr__(self) -> str:
+        return f"BottomKSketch(k={self.k}, ~{len(self)} values)"
+
+
+def _number_pairs(path: Path) -> Iterator[Tuple[str, str]]:
+    """Stream the first two columns of a calls/texts log."""
+    for row in iter_rows(path):
+        if len(row) >= 2:
+            yield row[0], row[1]
+
+
+def estimate_telemarketers(
+    calls_csv: Path, texts_csv: Path, error: float = 0.01
+) -> Dict[str, float]:
+    """
+    Estimate the overlaps behind ``enhanced_task4`` in one streaming pass.
+
+    Callers are compared with every number that shows legitimate activity
+    (receives a call, sends or receives a text) without holding either
+    set in memory.
+
+    Args:
+        calls_csv: Calls log (caller, receiver, timestamp, duration)
+        texts_csv: Texts log (sender, receiver, timestamp)
+        error: Target relative standard error of each sketch
+
+    Returns:
+        Estimated ``callers``, ``legitimate``, ``union``, ``overlap`` and
+        ``telemarketers`` (callers with no legitimate activity)
+    """
+    callers = BottomKSketch.for_error(error)
+    legitimate = BottomKSketch.for_error(error)
+    for caller, receiver in _number_pairs(calls_csv):
+        callers.add(caller)
+        legitimate.add(receiver)
+    for sender, receiver in _number_pairs(texts_csv):
+        legitimate.add(sender)
+        legitimate.add(receiver)
+
+    overlap = callers.intersection_size(legitimate)
+    return {
+        "callers": callers.cardinality(),
+        "legitimate": legitimate.cardinality(),
+        "union": callers.union_size(legitimate),
+        "overlap": overlap,
+        "telemarketers": max(callers.cardinality() - overlap, 0.0),
+    }
+
+
+def demonstrate_sketches() -> None:
+    """Compare sketch estimates with exact set sizes."""
+    left = range(0, 60_000)
+    right = range(50_000, 100_000)
+    exact_union, exact_overlap = 100_000, 10_000
+    for sketch_type in (HyperLogLog, BottomKSketch):
+        a, b = sketch_type.for_error(0.02), sketch_type.for_error(0.02)
+        a.update(left)
+        b.update(right)
+        print(
+            f"{sketch_type.__name__:>13}: |A ∪ B| ~ {a.union_size(b):9.0f} "
+            f"(exact {exact_union}) | |A ∩ B| ~ {a.intersection_size(b):8.0f} "
+            f"(exact {exact_overlap}) | {len(a.to_bytes())} bytes"
+        )
+
+    sample_data = Path(__file__).resolve().parent.parent / "sample_data"
+    if (sample_data / "calls.csv").exists():
+        estimates = estimate_telemarketers(
+            sample_data / "calls.csv", sample_data / "texts.csv"
+        )
+        print(
+            "Sample logs: "
+            + ", ".join(f"{name} ~ {value:.0f}" for name, value in estimates.items())
+        )
+
+
+def benchmark_sketches(values: int = 1_000_000, error: float = 0.01) -> None:
+    """
+    Time sketch updates and report accuracy against the exact count.
+
+    Args:
+        values: Random phone-number-like strings to add (with repeats)
+        error: Target relative standard error
+    """
+    rng = random.Random(0)
+    numbers = [f"9{rng.randrange(values):09d}" for _ in range(values)]
+    distinct = len(set(numbers))
+    for sketch_type in (HyperLogLog, BottomKSketch):
+        sketch = sketch_type.for_error(error)
+        start = time.perf_counter()
+        sketch.update(numbers)
+        seconds = time.perf_counter() - start
+        estimate = sketch.cardinality()
+        print(
+            f"{sketch_type.__name__:>13}: {values} adds in {seconds:.2f}s | "
+            f"estimate {estimate:.0f} vs {distinct} distinct "
+            f"({(estimate - distinct) / distinct:+.2%}) | "
+            f"{len(sketch.to_bytes()) / 1024:.1f} KiB serialized"
+        )
+
+
+if __name__ == "__main__":
+    demonstrate_sketches()
+
+    print("\n" + "=" * 60)
+    print("SKETCH BENCHMARK")
+    print("=" * 60)
+    benchmark_sketches()
@@ -0,0 +1,186 @@
+"""
+Parallel Chain Verification
+===========================
+
+Verifies ``enhanced_blockchain`` chains across processes:
+- The chain is split into contiguous height ranges
+- Each range is checked in a ``ProcessPoolExecutor`` worker: heights,
+  data/Merkle digests, header hashes and the links inside the range
+- The parent checks the link at every range boundary (first block's
+  ``previous_hash`` against the last hash of the range before it) and
+  reports the lowest invalid height, cancelling ranges past it
+
+Chains stored in a ``BlockStore`` directory are read by the workers
+themselves, so the parent never deserializes or pickles a block; in-memory
+``Blockchain`` ranges are pickled to the workers.
+
+Time Complexity: O(n / workers) hashing per worker
+Space Complexity: O(range size) per worker
+"""
+
+import os
+import tempfile
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from block_store import BlockStore, read_blocks, stored_height
+from enhanced_blockchain import GENESIS_PREVIOUS_HASH, Block, Blockchain
+
+# (first invalid height, previous_hash of the first block, hash of the last block)
+RangeResult = Tuple[Optional[int], bytes, bytes]
+ChainSource = Union[Blockchain, str, Path]
+
+RANGES_PER_WORKER = 4
+
+
+def _check_blocks(blocks: Iterable[Block], start: int) -> RangeResult:
+    """Check consecutive blocks starting at height ``start``."""
+    first_previous = b""
+    previous: Optional[bytes] = None
+    for height, block in enumerate(blocks, start):
+        if previous is None:
+            first_previous = block.previous_hash
+        elif block.previous_hash != previous:
+            return height, first_previous, b""
+        if block.index != height or not block.is_consistent():
+            return height, first_previous, b""
+        previous = block.hash
+    return None, first_previous, previous or b""
+
+
+def _verify_stored_range(directory: str, start: int, stop: int) -> RangeResult:
+    """Worker: read and check ``[start, stop)`` of a block store."""
+    return _check_blocks(read_blocks(directory, start, stop), start)
+
+
+def _verify_block_list(blocks: List[Block], start: int) -> RangeResult:
+    """Worker: check a pickled slice of an in-memory chain."""
+    return _check_blocks(blocks, start)
+
+
+def _height_ranges(height: int, parts: int) -> List[Tuple[int, int]]:
+    """Split ``[0, height)`` into at most ``parts`` contiguous ranges."""
+    size = max(1, -(-height // max(parts, 1)))
+    return [(start, min(start + size, height)) for start in range(0, height, size)]
+
+
+def parallel_first_invalid(
+    source: ChainSource,
+    workers: Optional[int] = None,
+    ranges_per_worker: int = RANGES_PER_WORKER,
+) -> Optional[int]:
+    """
+    Find the first invalid block of a chain using a process pool.
+
+    Args:
+        source: In-memory ``Blockchain`` or a ``BlockStore`` directory
+        workers: Process count (defaults to ``os.cpu_count()``)
+        ranges_per_worker: Ranges per process, so an early invalid block
+            lets the remaining ranges be cancelled
+
+    Returns:
+        Height of the first invalid block, or None if the chain is valid
+    """
+    workers = workers or os.cpu_count() or 1
+    in_memory = isinstance(source, Blockchain)
+    if in_memory:
+        height = len(source)  # type: ignore[arg-type]
+    else:
+        height = stored_height(source)  # type: ignore[arg-type]
+    ranges = _height_ranges(height, workers * ranges_per_worker)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures: List[Future] = []
+        for start, stop in ranges:
+            if in_memory:
+                blocks = [source[i] for i in range(start, stop)]  # type: ignore
+                futures.append(pool.submit(_verify_block_list, blocks, start))
+            else:
+                futures.append(
+                    pool.submit(_verify_stored_range, str(source), start, stop)
+                )
+        try:
+            expected_previous = GENESIS_PREVIOUS_HASH
+            for (start, _), future in zip(ranges, futures):
+                invalid, first_previous, last_hash = future.result()
+                if first_previous != expected_previous:
+                    return start
+                if invalid is not None:
+                    return invalid
+                expected_previous = last_hash
+        finally:
+            for future in futures:
+                future.cancel()
+    return None
+
+
+def parallel_verify(source: ChainSource, workers: Optional[int] = None) -> bool:
+    """
+    Return True if every block of the chain is valid.
+
+    Args:
+        source: In-memory ``Blockchain`` or a ``BlockStore`` directory
+        workers: Process count (defaults to ``os.cpu_count()``)
+    """
+    return parallel_first_invalid(source, workers) is None
+
+
+def benchmark_verification_scaling(
+    blocks: int = 200_000,
+    max_workers: Optional[int] = None,
+    worker_counts: Optional[Sequence[int]] = None,
+) -> List[Dict[str, float]]:
+    """
+    Measure verification throughput of a stored chain for several pool sizes.
+
+    Args:
+        blocks: Chain length
+        max_workers: Largest pool size to try (defaults to ``os.cpu_count()``)
+        worker_counts: Explicit pool sizes (overrides ``max_workers``)
+
+    Returns:
+        One row per worker count with blocks/s and speedup over 1 worker
+    """
+    chain = Blockchain()
+    for i in range(blocks):
+        if i % 100 == 0:
+            chain.append(f"batch {i}", float(i), [f"tx {i}.{j}" for j in range(64)])
+        else:
+            chain.append(f"transaction batch {i}", timestamp=float(i))
+
+    counts = worker_counts or range(1, (max_workers or os.cpu_count() or 1) + 1)
+    rows: List[Dict[str, float]] = []
+    with tempfile.TemporaryDirectory() as directory:
+        with BlockStore(directory) as store:
+            for block in chain:
+                store.append(block)
+        for workers in counts:
+            start = time.perf_counter()
+            invalid = parallel_first_invalid(directory, workers)
+            seconds = time.perf_counter() - start
+            if invalid is not None:
+                raise RuntimeError(f"Valid chain rejected at block {invalid}")
+            blocks_per_second = blocks / seconds
+            baseline = rows[0]["blocks_per_second"] if rows else blocks_per_second
+            rows.append(
+                {
+                    "workers": workers,
+                    "seconds": seconds,
+                    "blocks_per_second": blocks_per_second,
+                    "speedup": blocks_per_second / baseline,
+                }
+            )
+    return rows
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print(f"PARALLEL VERIFICATION SCALING ({os.cpu_count()} CPUs)")
+    print("=" * 60)
+    for row in benchmark_verification_scaling():
+        print(
+            f"workers={row['workers']:2.0f} | {row['seconds']:6.2f}s | "
+            f"{row['blocks_per_second']:9.0f} blocks/s (x{row['speedup']:.2f})"
+        )
@@ -0,0 +1,364 @@
+"""
+Columnar NumPy Backend for Calls and Texts
+==========================================
+
+Loads ``calls.csv`` / ``texts.csv`` (or call log archives) into NumPy
+columns and answers the Task 2-4 questions with array operations instead
+of per-row Python:
+- Phone numbers are interned to ``int32`` ids shared by calls and texts
+  (first-seen order), so every number column is an id array
+- Timestamps are ``int64`` epoch seconds (parsed by position with
+  ``call_log_archive.parse_timestamp``) and durations ``int32``
+- Month filter: one range comparison on the timestamp column
+- Duration totals: exact ``int64`` scatter-adds over caller and receiver ids
+- Area codes: each distinct number is classified once, then rows look
+  up their receiver's code by id
+- Telemarketers: boolean masks over ids instead of set differences
+- Archives load from their integer columns without formatting any text
+- ``cache_dir=`` maps ``columnar_cache`` files instead of parsing the CSV
+
+Parsing the CSV is still a Python loop; the analyses after loading are
+vectorized and can be repeated on the loaded columns. With the cache the
+parse happens once per source file.
+
+NumPy is optional for the rest of the package but required here.
+
+Time Complexity: O(n) to load; O(n) vectorized per analysis
+Space Complexity: 16 bytes per call, 12 per text, plus the number table
+"""
+
+import calendar
+import time
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from call_log_archive import CallLogArchive, is_archive, parse_timestamp
+from columnar_cache import CachedLog, open_cache
+from enhanced_task3 import PhoneNumberAnalyzer
+from telecom_records import iter_rows
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional for the package
+    np = None
+
+HAS_NUMPY = np is not None
+
+PathLike = Union[str, Path]
+
+
+@dataclass
+class CallColumns:
+    """Call records as parallel arrays (one element per call)."""
+
+    caller: "np.ndarray"
+    receiver: "np.ndarray"
+    timestamp: "np.ndarray"
+    duration: "np.ndarray"
+
+
+@dataclass
+class TextColumns:
+    """Text records as parallel arrays (one element per text)."""
+
+    sender: "np.ndarray"
+    receiver: "np.ndarray"
+    timestamp: "np.ndarray"
+
+
+class NumberTable:
+    """Interning table: phone number <-> dense integer id."""
+
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+
+    def intern(self, number: str) -> int:
+        """Return the id of ``number``, assigning the next one if new."""
+        return self.ids.setdefault(number, len(self.ids))
+
+    @property
+    def numbers(self) -> List[str]:
+        """Numbers indexed by id."""
+        return list(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def _archive_ids(
+    archive: Union[CallLogArchive, CachedLog], table: NumberTable
+) -> "np.ndarray":
+    """Map an archive's or cache's own number ids onto ``table`` ids."""
+    return np.array([table.intern(n) for n in archive.numbers], dtype=np.int32)
+
+
+def _integer_source(
+    path: PathLike, cache_dir: Optional[PathLike]
+) -> Optional[Union[CallLogArchive, CachedLog]]:
+    """The cache or archive to read integer columns from, if any."""
+    if cache_dir is not None:
+        return open_cache(path, cache_dir)
+    if is_archive(path):
+        return CallLogArchive(path)
+    return None
+
+
+def _release(archive: Union[CallLogArchive, CachedLog]) -> None:
+    """Close a cache once its columns have been copied out."""
+    if isinstance(archive, CachedLog):
+        archive.close()
+
+
+def _load_calls(
+    path: PathLike, table: NumberTable, cache_dir: Optional[PathLike]
+) -> CallColumns:
+    """Read calls (CSV, archive or cache) into columns, interning into ``table``."""
+    archive = _integer_source(path, cache_dir)
+    if archive is not None:
+        remap = _archive_ids(archive, table)
+        columns = CallColumns(
+            remap[np.array(archive.raw_column("caller"), dtype=np.int64)],
+            remap[np.array(archive.raw_column("receiver"), dtype=np.int64)],
+            np.array(archive.raw_column("timestamp"), dtype=np.int64),
+            np.array(archive.raw_column("duration"), dtype=np.int32),
+        )
+        _release(archive)
+        return columns
+    intern = table.intern
+    callers, receivers = array("i"), array("i")
+    timestamps, durations = array("q"), array("i")
+    for caller, receiver, timestamp, duration in iter_rows(path):
+        callers.append(intern(caller))
+        receivers.append(intern(receiver))
+        timestamps.append(parse_timestamp(timestamp))
+        durations.append(int(duration))
+    return CallColumns(
+        np.frombuffer(callers, dtype=np.int32),
+        np.frombuffer(receivers, dtype=np.int32),
+        np.frombuffer(timestamps, dtype=np.int64),
+        np.frombuffer(durations, dtype=np.int32),
+    )
+
+
+def _load_texts(
+    path: PathLike, table: NumberTable, cache_dir: Optional[PathLike]
+) -> TextColumns:
+    """Read texts (CSV, archive or cache) into columns, interning into ``table``."""
+    archive = _integer_source(path, cache_dir)
+    if archive is not None:
+        remap = _archive_ids(archive, table)
+        columns = TextColumns(
+            remap[np.array(archive.raw_column("sender"), dtype=np.int64)],
+            remap[np.array(archive.raw_column("receiver"), dtype=np.int64)],
+            np.array(archive.raw_column("timestamp"), dtype=np.int64),
+        )
+        _release(archive)
+        return columns
+    intern = table.intern
+    senders, receivers, timestamps = array("i"), array("i"), array("q")
+    for sender, receiver, timestamp in iter_rows(path):
+        senders.append(intern(sender))
+        receivers.append(intern(receiver))
+        timestamps.append(parse_timestamp(timestamp))
+    return TextColumns(
+        np.frombuffer(senders, dtype=np.int32),
+        np.frombuffer(receivers, dtype=np.int32),
+        np.frombuffer(timestamps, dtype=np.int64),
+    )
+
+
+class ColumnarDataset:
+    """Calls and texts as NumPy columns over one shared number table."""
+
+    def __init__(
+        self,
+        calls_path: PathLike,
+        texts_path: Optional[PathLike] = None,
+        cache_dir: Optional[PathLike] = None,
+    ) -> None:
+        """
+        Load the logs into columns.
+
+        Args:
+            calls_path: Calls CSV (header optional) or archive
+            texts_path: Texts CSV or archive (optional)
+            cache_dir: Load through ``columnar_cache`` files in this directory,
+                building them on first use (default: no cache)
+
+        Raises:
+            ImportError: If NumPy is not installed
+            FileNotFoundError: If a file doesn't exist
+        """
+        if not HAS_NUMPY:
+            raise ImportError("NumPy is required for the columnar backend")
+        self.table = NumberTable()
+        self.calls = _load_calls(calls_path, self.table, cache_dir)
+        self.texts = (
+            _load_texts(texts_path, self.table, cache_dir)
+            if texts_path is not None
+            else TextColumns(
+                np.empty(0, np.int32), np.empty(0, np.int32), np.empty(0, np.int64)
+            )
+        )
+        self.numbers = self.table.numbers
+
+    def month_mask(self, year: int, month: int) -> "np.ndarray":
+        """Boolean mask of the calls made in ``month`` of ``year`` (UTC)."""
+        start = calendar.timegm((year, month, 1, 0, 0, 0))
+        stop = calendar.timegm((year + month // 12, month % 12 + 1, 1, 0, 0, 0))
+        timestamps = self.calls.timestamp
+        return (timestamps >= start) & (timestamps < stop)
+
+    def duration_totals(self, year: int = 2016, month: int = 9) -> "np.ndarray":
+        """
+        Total call seconds per number id for one month (Task 2).
+
+        Sums are accumulated in ``int64`` (``np.add.at``), so they stay exact
+        where float ``bincount`` weights would round past 2**53.
+
+        Returns:
+            ``int64`` array indexed by number id (0 for numbers without calls)
+        """
+        mask = self.month_mask(year, month)
+        weights = self.calls.duration[mask].astype(np.int64)
+        totals = np.zeros(len(self.numbers), dtype=np.int64)
+        np.add.at(totals, self.calls.caller[mask], weights)
+        np.add.at(totals, self.calls.receiver[mask], weights)
+        return totals
+
+    def month_participants(self, year: int = 2016, month: int = 9) -> "np.ndarray":
+        """
+        Ids of the numbers in the month's calls, in order of first appearance.
+
+        Callers and receivers interleave row by row, the order in which
+        ``parse_call_duration`` inserts them.
+        """
+        mask = self.month_mask(year, month)
+        parties = np.column_stack((self.calls.caller[mask], self.calls.receiver[mask]))
+        ids, first = np.unique(parties.ravel(), return_index=True)
+        return ids[np.argsort(first)]
+
+    def call_durations(self, year: int = 2016, month: int = 9) -> Dict[str, int]:
+        """
+        ``parse_call_duration`` as a drop-in: the same keys, values and order.
+
+        Every number in the month's calls is included, even with 0 seconds.
+        """
+        totals = self.duration_totals(year, month)
+        numbers = self.numbers
+        return {
+            numbers[i]: int(totals[i])
+            for i in self.month_participants(year, month).tolist()
+        }
+
+    def top_callers(
+        self, k: int = 5, year: int = 2016, month: int = 9
+    ) -> List[Tuple[str, int]]:
+        """
+        Top ``k`` numbers by call time, like ``enhanced_task2.top_callers``.
+
+        Ties keep first-appearance order (a stable sort over the month's
+        participants).
+        """
+        totals = self.duration_totals(year, month)
+        participants = self.month_participants(year, month)
+        order = np.argsort(-totals[participants], kind="stable")[: max(k, 0)]
+        return [(self.numbers[i], int(totals[i])) for i in participants[order]]
+
+    def bangalore_codes(self) -> Tuple[List[str], float]:
+        """
+        Codes called from Bangalore fixed lines and the share of local calls.
+
+        Returns:
+            ``(sorted codes, percentage)`` as ``analyze_bangalore_calls``
+        """
+        analyzer = PhoneNumberAnalyzer()
+        codes: Dict[str, int] = {}
+        code_ids = np.array(
+            [
+                -1 if code is None else codes.setdefault(code, len(codes))
+                for code in map(analyzer.classify_phone_number, self.numbers)
+            ],
+            dtype=np.int32,
+        )
+        is_bangalore = np.array(
+            [analyzer.is_bangalore_number(n) for n in self.numbers], dtype=bool
+        )
+        from_bangalore = is_bangalore[self.calls.caller]
+        called = code_ids[self.calls.receiver[from_bangalore]]
+        called_codes = np.unique(called[called >= 0])
+        names = list(codes)
+        result = sorted(names[i] for i in called_codes)
+        total = int(from_bangalore.sum())
+        if not total:
+            return result, 0.0
+        local = codes.get(PhoneNumberAnalyzer.BANGALORE_PREFIX, -2)
+        return result, float(np.count_nonzero(called == local)) * 100.0 / total
+
+    def telemarketers(self) -> List[str]:
+        """Numbers that call but never receive calls or send/receive texts."""
+        size = len(self.numbers)
+        calls = np.zeros(size, dtype=bool)
+        calls[self.calls.caller] = True
+        legitimate = np.zeros(size, dtype=bool)
+        legitimate[self.calls.receiver] = True
+        legitimate[self.texts.sender] = True
+        legitimate[self.texts.receiver] = True
+        return sorted(self.numbers[i] for i in np.flatnonzero(calls & ~legitimate))
+
+
+def benchmark_columnar(calls_path: PathLike, texts_path: PathLike) -> None:
+    """
+    Compare the row-by-row Task 2-4 code with the columnar backend.
+
+    Args:
+        calls_path: Calls CSV or archive
+        texts_path: Texts CSV or archive
+    """
+    from enhanced_task2 import parse_call_duration
+    from enhanced_task4 import TelemarketerDetector
+
+    start = time.perf_counter()
+    calls = list(iter_rows(calls_path))
+    texts = list(iter_rows(texts_path))
+    rows_load = time.perf_counter() - start
+    start = time.perf_counter()
+    parse_call_duration(calls)
+    analyzer, detector = PhoneNumberAnalyzer(), TelemarketerDetector()
+    for caller, receiver, *_ in calls:
+        analyzer.process_call_record(caller, receiver)
+        detector.process_call_record(caller, receiver)
+    for sender, receiver, *_ in texts:
+        detector.process_text_record(sender, receiver)
+    detector.get_potential_telemarketers()
+    rows_analyze = time.perf_counter() - start
+
+    start = time.perf_counter()
+    dataset = ColumnarDataset(calls_path, texts_path)
+    columns_load = time.perf_counter() - start
+    start = time.perf_counter()
+    dataset.duration_totals()
+    dataset.bangalore_codes()
+    dataset.telemarketers()
+    columns_analyze = time.perf_counter() - start
+    print(
+        f"{len(calls)} calls, {len(texts)} texts | rows: load {rows_load:.2f}s, "
+        f"analyze {rows_analyze:.3f}s | columns: load {columns_load:.2f}s, "
+        f"analyze {columns_analyze:.3f}s "
+        f"(x{rows_analyze / columns_analyze:.0f} on the analyses)"
+    )
+
+
+if __name__ == "__main__":
+    sample_data = Path(__file__).resolve().parent.parent / "sample_data"
+    dataset = ColumnarDataset(sample_data / "calls.csv", sample_data / "texts.csv")
+    print("Top callers:", dataset.top_callers(3))
+    print("Bangalore codes:", dataset.bangalore_codes())
+    print("Telemarketers:", dataset.telemarketers())
+
+    print("\n" + "=" * 60)
+    print("COLUMNAR BENCHMARK")
+    print("=" * 60)
+    benchmark_columnar(sample_data / "calls.csv", sample_data / "texts.csv")
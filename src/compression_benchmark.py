@@ -0,0 +1,233 @@
+"""
+Compression Benchmark Suite
+===========================
+
+Measures what the Huffman codecs in this repository actually achieve
+against the standard library compressors on a mixed corpus:
+- Compression ratio (original size / compressed size)
+- Encode and decode throughput in MB/s (best of several runs)
+- Peak Python heap allocated during encode + decode (``tracemalloc``)
+
+Codec modes:
+- ``huffman``: static block-framed codec (``enhanced_huffman``)
+- ``huffman-limit15``: static codec with 15-bit length-limited codes
+- ``huffman-parallel``: process-pool codec (peak memory covers the parent only)
+- ``adaptive``: one-pass FGK codec (``enhanced_adaptive_huffman``)
+- ``zlib``, ``lzma``, ``bz2``: standard library baselines at default levels
+
+Usage:
+    python src/compression_benchmark.py --json results.json [FILE ...]
+"""
+
+import argparse
+import bz2
+import json
+import lzma
+import sys
+import time
+import tracemalloc
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from enhanced_adaptive_huffman import (
+    adaptive_huffman_decoding,
+    adaptive_huffman_encoding,
+)
+from enhanced_huffman import (
+    DEFAULT_MAX_CODE_LENGTH,
+    huffman_decoding,
+    huffman_encoding,
+    parallel_huffman_decoding,
+    parallel_huffman_encoding,
+)
+
+Codec = Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+CODECS: Dict[str, Codec] = {
+    "huffman": (huffman_encoding, huffman_decoding),
+    "huffman-limit15": (
+        lambda data: huffman_encoding(data, max_code_length=DEFAULT_MAX_CODE_LENGTH),
+        huffman_decoding,
+    ),
+    "huffman-parallel": (parallel_huffman_encoding, parallel_huffman_decoding),
+    "adaptive": (adaptive_huffman_encoding, adaptive_huffman_decoding),
+    "zlib": (zlib.compress, zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+    "bz2": (bz2.compress, bz2.decompress),
+}
+
+DEFAULT_CORPUS = {
+    "text": REPO_ROOT / "README.md",
+    "binary": REPO_ROOT / "04 Route Planner" / "home" / "map-40.pickle",
+    "calls_csv": REPO_ROOT / "sample_data" / "calls.csv",
+    "texts_csv": REPO_ROOT / "sample_data" / "texts.csv",
+}
+
+
+def load_corpus(paths: Optional[Sequence[str]] = None) -> Dict[str, bytes]:
+    """
+    Load benchmark inputs.
+
+    Args:
+        paths: Files to benchmark (defaults to the bundled text, binary and
+            CSV call-log samples)
+
+    Returns:
+        Mapping of corpus name to file contents (missing defaults are skipped)
+    """
+    if paths:
+        return {Path(path).name: Path(path).read_bytes() for path in paths}
+    return {
+        name: path.read_bytes()
+        for name, path in DEFAULT_CORPUS.items()
+        if path.exists()
+    }
+
+
+def _best_time(
+    function: Callable[[bytes], bytes], data: bytes, repeat: int
+) -> Tuple[float, bytes]:
+    """Run ``function(data)`` ``repeat`` times; return the fastest time and output."""
+    best = float("inf")
+    result = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(data)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _peak_memory(codec: Codec, data: bytes) -> int:
+    """Peak traced allocation, in bytes, for one encode + decode."""
+    encode, decode = codec
+    tracemalloc.start()
+    try:
+        decode(encode(data))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_codec(
+    name: str, codec: Codec, corpus_name: str, data: bytes, repeat: int = 3
+) -> Dict[str, object]:
+    """
+    Benchmark one codec on one input.
+
+    Args:
+        name: Codec mode name
+        codec: (encode, decode) pair
+        corpus_name: Name of the input
+        data: Input bytes
+        repeat: Timing runs (best is reported)
+
+    Returns:
+        Result row suitable for JSON serialization
+
+    Raises:
+        RuntimeError: If the codec does not round-trip the input
+    """
+    encode, decode = codec
+    encode_seconds, encoded = _best_time(encode, data, repeat)
+    decode_seconds, decoded = _best_time(decode, encoded, repeat)
+    if decoded != data:
+        raise RuntimeError(f"{name} failed to round-trip {corpus_name}")
+
+    megabytes = len(data) / 1e6
+    return {
+        "corpus": corpus_name,
+        "codec": name,
+        "original_bytes": len(data),
+        "compressed_bytes": len(encoded),
+        "ratio": len(data) / len(encoded) if encoded else 0.0,
+        "encode_mb_s": megabytes / max(encode_seconds, 1e-9),
+        "decode_mb_s": megabytes / max(decode_seconds, 1e-9),
+        "peak_memory_bytes": _peak_memory(codec, data),
+    }
+
+
+def run_benchmark(
+    corpus: Dict[str, bytes],
+    codecs: Optional[Sequence[str]] = None,
+    repeat: int = 3,
+) -> Dict[str, object]:
+    """
+    Benchmark every selected codec on every corpus entry.
+
+    Args:
+        corpus: Mapping of corpus name to bytes
+        codecs: Codec mode names (defaults to all of ``CODECS``)
+        repeat: Timing runs per measurement
+
+    Returns:
+        Report with the corpus sizes and one result row per (corpus, codec)
+
+    Raises:
+        ValueError: If an unknown codec is requested
+    """
+    selected = list(codecs) if codecs else list(CODECS)
+    unknown = [name for name in selected if name not in CODECS]
+    if unknown:
+        raise ValueError(f"Unknown codec(s): {', '.join(unknown)}")
+
+    results = [
+        benchmark_codec(name, CODECS[name], corpus_name, data, repeat)
+        for corpus_name, data in corpus.items()
+        for name in selected
+    ]
+    return {
+        "python": sys.version.split()[0],
+        "corpus": {name: len(data) for name, data in corpus.items()},
+        "results": results,
+    }
+
+
+def print_report(report: Dict[str, object]) -> None:
+    """Print benchmark results as a table."""
+    print(
+        f"{'corpus':>12} | {'codec':>16} | {'ratio':>6} | {'enc MB/s':>9} | "
+        f"{'dec MB/s':>9} | {'peak KiB':>9}"
+    )
+    print("-" * 76)
+    for row in report["results"]:  # type: ignore
+        print(
+            f"{row['corpus']:>12} | {row['codec']:>16} | {row['ratio']:6.2f} | "
+            f"{row['encode_mb_s']:9.2f} | {row['decode_mb_s']:9.2f} | "
+            f"{row['peak_memory_bytes'] / 1024:9.1f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("files", nargs="*", help="files to benchmark")
+    parser.add_argument(
+        "--codec",
+        action="append",
+        choices=sorted(CODECS),
+        help="codec mode to run (repeatable; default: all)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="timing runs per measurement"
+    )
+    parser.add_argument("--json", metavar="PATH", help="write the report as JSON")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.files)
+    if not corpus:
+        print("No corpus files found.")
+        return 1
+
+    report = run_benchmark(corpus, args.codec, args.repeat)
+    print_report(report)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+        print(f"\nWrote {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
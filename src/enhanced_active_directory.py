@@ -0,0 +1,694 @@
+"""
+Enhanced Active Directory Implementation
+========================================
+
+Group membership queries for the nested group model from
+``02 Show Me The Data Structures/single/problem_4.py`` with:
+- Fixed ``is_user_in_group`` (the original returned after the first subgroup)
+- Iterative, cycle-safe traversal (no recursion limit on deep nesting)
+- ``SetGroup``: set-backed storage with O(1) add/lookup and no duplicates
+- Change notifications from ``Group.add_user`` / ``Group.add_group``
+- A transitive-closure ``MembershipIndex`` kept up to date incrementally
+- A ``MembershipResolver`` answering bulk queries from memoized expansions
+- A ``BitsetDirectory`` storing transitive membership as roaring bitmaps
+  over interned user ids, for directories with millions of memberships
+- Type hints and comprehensive documentation
+
+As in the original, a group's own name counts as a member, so
+``is_user_in_group("child", parent)`` is True when ``child`` is nested
+in ``parent``.
+
+Time Complexity: O(1) indexed lookups; O(subtree) per indexed change
+Space Complexity: O(total memberships in the transitive closure)
+"""
+
+import sys
+import time
+from typing import (
+    Collection,
+    Container,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Set,
+)
+
+from roaring_bitmap import RoaringBitmap
+
+
+class MembershipObserver(Protocol):
+    """Receiver of ``Group`` change notifications."""
+
+    def group_added(self, parent: "Group", child: "Group") -> None:
+        """Called after ``child`` is nested inside ``parent``."""
+
+    def user_added(self, group: "Group", user: str) -> None:
+        """Called after ``user`` is added to ``group``."""
+
+
+class Group:
+    """A named group containing users and nested groups (list storage)."""
+
+    __slots__ = ("name", "groups", "users", "_observers")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.groups: Collection["Group"] = []
+        self.users: Collection[str] = []
+        self._observers: List[MembershipObserver] = []
+
+    def add_group(self, group: "Group") -> None:
+        """Nest ``group`` inside this group."""
+        self.groups.append(group)  # type: ignore[attr-defined]
+        for observer in list(self._observers):
+            observer.group_added(self, group)
+
+    def add_user(self, user: str) -> None:
+        """Add ``user`` directly to this group."""
+        self.users.append(user)  # type: ignore[attr-defined]
+        for observer in list(self._observers):
+            observer.user_added(self, user)
+
+    def get_groups(self) -> Collection["Group"]:
+        """Return the directly nested groups."""
+        return self.groups
+
+    def get_users(self) -> Collection[str]:
+        """Return the direct members."""
+        return self.users
+
+    def get_name(self) -> str:
+        """Return the group name."""
+        return self.name
+
+    def subscribe(self, observer: MembershipObserver) -> None:
+        """Register ``observer`` for add_user / add_group notifications."""
+        if observer not in self._observers:
+            self._observers.append(observer)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+
+class SetGroup(Group):
+    """
+    Group with set-backed storage.
+
+    Adding and looking up users is O(1) instead of a list scan, and adding
+    the same user or subgroup twice is a no-op (observers are notified only
+    for real insertions).
+    """
+
+    __slots__ = ()
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.groups = set()
+        self.users = set()
+
+    def add_group(self, group: Group) -> None:
+        """Nest ``group`` inside this group (ignored if already nested)."""
+        if group in self.groups:
+            return
+        self.groups.add(group)  # type: ignore[attr-defined]
+        for observer in list(self._observers):
+            observer.group_added(self, group)
+
+    def add_user(self, user: str) -> None:
+        """Add ``user`` directly to this group (ignored if present)."""
+        if user in self.users:
+            return
+        self.users.add(user)  # type: ignore[attr-defined]
+        for observer in list(self._observers):
+            observer.user_added(self, user)
+
+
+def is_user_in_group(user: str, group: Group) -> bool:
+    """
+    Return True if user is in the group or any group nested inside it.
+
+    Walks the hierarchy depth-first with an explicit stack and a visited
+    set, so arbitrarily deep nesting cannot overflow the call stack and
+    cyclic group graphs terminate.
+
+    Args:
+        user: User name/id
+        group: Group to check user membership against
+
+    Returns:
+        True if the user (or a nested group's name) is found
+    """
+    visited = {group}
+    stack = [group]
+    while stack:
+        current = stack.pop()
+        if user == current.get_name() or user in current.get_users():
+            return True
+        for child in current.get_groups():
+            if child not in visited:
+                visited.add(child)
+                stack.append(child)
+    return False
+
+
+def _components_children_first(
+    group: Group, done: Container[Group]
+) -> Iterator[List[Group]]:
+    """
+    Yield the strongly connected components reachable from ``group``.
+
+    Iterative Tarjan search that skips groups in ``done``. Components are
+    yielded children-first; the caller is expected to add each yielded
+    component to ``done`` before resuming the generator.
+
+    Args:
+        group: Group to start from
+        done: Groups whose results are already known
+
+    Yields:
+        Lists of groups forming one component (a cycle, or a single group)
+    """
+    index: Dict[Group, int] = {group: 0}
+    lowlink: Dict[Group, int] = {group: 0}
+    on_stack: Set[Group] = {group}
+    component_stack: List[Group] = [group]
+    work = [(group, iter(group.get_groups()))]
+
+    while work:
+        node, children = work[-1]
+        advanced = False
+        for child in children:
+            if child in done:
+                continue
+            if child not in index:
+                index[child] = lowlink[child] = len(index)
+                component_stack.append(child)
+                on_stack.add(child)
+                work.append((child, iter(child.get_groups())))
+                advanced = True
+                break
+            if child in on_stack:
+                lowlink[node] = min(lowlink[node], index[child])
+        if advanced:
+            continue
+
+        work.pop()
+        if work:
+            parent = work[-1][0]
+            lowlink[parent] = min(lowlink[parent], lowlink[node])
+        if lowlink[node] != index[node]:
+            continue
+
+        component: List[Group] = []
+        while True:
+            member_group = component_stack.pop()
+            on_stack.discard(member_group)
+            component.append(member_group)
+            if member_group is node:
+                break
+        yield component
+
+
+class MembershipIndex:
+    """
+    Precomputed transitive closure of user -> containing groups.
+
+    The index subscribes to every group reachable from its roots, so later
+    ``add_user`` / ``add_group`` calls update it incrementally and
+    ``is_member`` stays a single set lookup.
+    """
+
+    def __init__(self, *roots: Group) -> None:
+        """
+        Build the index for every group reachable from ``roots``.
+
+        Args:
+            roots: Top-level groups to index
+        """
+        # Groups that transitively contain each group (including itself)
+        self._containing: Dict[Group, Set[Group]] = {}
+        # Groups that transitively contain each user
+        self._user_groups: Dict[str, Set[Group]] = {}
+        for root in roots:
+            self._track(root)
+
+    def _descendants(self, group: Group) -> List[Group]:
+        """Groups reachable from ``group`` (inclusive), each listed once."""
+        seen = {group}
+        order = [group]
+        for current in order:
+            for child in current.get_groups():
+                if child not in seen:
+                    seen.add(child)
+                    order.append(child)
+        return order
+
+    def _track(self, group: Group) -> None:
+        """Subscribe to, and close over, every new group below ``group``."""
+        new_groups = [
+            descendant
+            for descendant in self._descendants(group)
+            if descendant not in self._containing
+        ]
+        for new_group in new_groups:
+            self._containing[new_group] = set()
+            new_group.subscribe(self)
+        for new_group in new_groups:
+            self._propagate(new_group, {new_group})
+
+    def _propagate(self, group: Group, ancestors: Set[Group]) -> None:
+        """Record that ``ancestors`` contain ``group`` and all it contains."""
+        for descendant in self._descendants(group):
+            self._containing[descendant] |= ancestors
+            closure = self._containing[descendant]
+            for member in descendant.get_users():
+                self._user_groups.setdefault(member, set()).update(closure)
+            name = descendant.get_name()
+            self._user_groups.setdefault(name, set()).update(closure)
+
+    def group_added(self, parent: Group, child: Group) -> None:
+        """Notification hook: ``child`` was nested inside ``parent``."""
+        self._track(child)
+        self._propagate(child, self._containing[parent])
+
+    def user_added(self, group: Group, user: str) -> None:
+        """Notification hook: ``user`` was added to ``group``."""
+        self._user_groups.setdefault(user, set()).update(self._containing[group])
+
+    def is_member(self, user: str, group: Group) -> bool:
+        """
+        Return True if ``user`` is transitively in ``group``.
+
+        Same answer as ``is_user_in_group`` for indexed groups, in O(1).
+        """
+        groups = self._user_groups.get(user)
+        return groups is not None and group in groups
+
+    def groups_of(self, user: str) -> FrozenSet[Group]:
+        """Return every indexed group that transitively contains ``user``."""
+        return frozenset(self._user_groups.get(user, ()))
+
+
+class MembershipResolver:
+    """
+    Bulk membership queries backed by memoized group expansions.
+
+    ``members_of`` expands a group in one traversal and caches the full
+    member set of every group it passes through, so later queries reuse
+    shared subgroups. Groups on a cycle share one expansion. Any
+    ``add_user`` / ``add_group`` drops the cached expansions of the changed
+    group and of every group that contains it.
+    """
+
+    def __init__(self, *roots: Group) -> None:
+        """
+        Subscribe to every group reachable from ``roots``.
+
+        Args:
+            roots: Top-level groups to resolve against
+        """
+        self._parents: Dict[Group, Set[Group]] = {}
+        self._expansions: Dict[Group, FrozenSet[str]] = {}
+        for root in roots:
+            self._track(root)
+
+    def _track(self, group: Group) -> None:
+        """Subscribe to new groups below ``group`` and record parent links."""
+        if group in self._parents:
+            return
+        self._parents[group] = set()
+        group.subscribe(self)
+        stack = [group]
+        while stack:
+            current = stack.pop()
+            for child in current.get_groups():
+                if child not in self._parents:
+                    self._parents[child] = set()
+                    child.subscribe(self)
+                    stack.append(child)
+                self._parents[child].add(current)
+
+    def _invalidate(self, group: Group) -> None:
+        """Drop cached expansions of ``group`` and all of its ancestors."""
+        stack = [group]
+        seen = {group}
+        while stack:
+            current = stack.pop()
+            self._expansions.pop(current, None)
+            for parent in self._parents.get(current, ()):
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+
+    def group_added(self, parent: Group, child: Group) -> None:
+        """Notification hook: ``child`` was nested inside ``parent``."""
+        self._track(child)
+        self._parents[child].add(parent)
+        self._invalidate(parent)
+
+    def user_added(self, group: Group, user: str) -> None:
+        """Notification hook: ``user`` was added to ``group``."""
+        self._invalidate(group)
+
+    def _expand(self, group: Group) -> FrozenSet[str]:
+        """
+        Return (and cache) every member of ``group``.
+
+        Components are completed children-first, so each component's
+        expansion is its own direct members plus the already-known
+        expansions of the groups it points to.
+        """
+        cached = self._expansions.get(group)
+        if cached is not None:
+            return cached
+
+        for component in _components_children_first(group, self._expansions):
+            members: Set[str] = set()
+            for member_group in component:
+                members.update(member_group.get_users())
+                members.add(member_group.get_name())
+                for child in member_group.get_groups():
+                    expansion = self._expansions.get(child)
+                    if expansion is not None:
+                        members |= expansion
+            frozen = frozenset(members)
+            for member_group in component:
+                self._expansions[member_group] = frozen
+
+        return self._expansions[group]
+
+    def members_of(
+        self, group: Group, users: Optional[Iterable[str]] = None
+    ) -> Set[str]:
+        """
+        Resolve the members of ``group`` in one traversal.
+
+        Args:
+            group: Group to expand
+            users: Candidate users to filter (default: return all members)
+
+        Returns:
+            All transitive members, or the candidates that are members
+        """
+        expansion = self._expand(group)
+        if users is None:
+            return set(expansion)
+        return {user for user in users if user in expansion}
+
+    def groups_of(
+        self, user: str, groups: Optional[Iterable[Group]] = None
+    ) -> Set[Group]:
+        """
+        Find the groups that transitively contain ``user``.
+
+        Args:
+            user: User name/id
+            groups: Candidate groups to test (default: every tracked group)
+
+        Returns:
+            The candidate groups containing ``user``
+        """
+        candidates = list(self._parents) if groups is None else groups
+        return {group for group in candidates if user in self._expand(group)}
+
+
+class BitsetDirectory:
+    """
+    Compressed transitive membership for very large directories.
+
+    Users (and group names) are interned to integers in depth-first order
+    of the hierarchy, so the members of one subtree get adjacent ids. Each
+    group's transitive membership is a ``RoaringBitmap``, built children-first
+    by OR-ing the bitmaps of its subgroups into its direct members. Dense
+    subtrees land in bitmap containers at 1 bit per member, which keeps the
+    whole closure well under 1 byte per (user, group) membership.
+
+    The directory subscribes to every reachable group and applies changes
+    in place: ``add_user`` interns the user and sets its bit in the group
+    and every ancestor, and ``add_group`` indexes any new subtree and ORs
+    the child's bitmap into the parent and its ancestors. Members interned
+    after the build get ids at the end, outside their subtree's id range.
+    """
+
+    def __init__(self, *roots: Group) -> None:
+        """
+        Build bitmaps for every group reachable from ``roots``.
+
+        Args:
+            roots: Top-level groups to index
+        """
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._bitmaps: Dict[Group, RoaringBitmap] = {}
+        # Indexed groups directly containing each indexed group
+        self._parents: Dict[Group, Set[Group]] = {}
+        for root in roots:
+            self._index(root)
+
+    def _intern(self, member: str) -> int:
+        """Return the integer id of ``member``, assigning the next one if new."""
+        member_id = self._ids.get(member)
+        if member_id is None:
+            member_id = self._ids[member] = len(self._names)
+            self._names.append(member)
+        return member_id
+
+    def _index(self, root: Group) -> None:
+        """Intern, subscribe to and build bitmaps for groups new below ``root``."""
+        if root in self._parents:
+            return
+        self._parents[root] = set()
+        new_groups = []
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            new_groups.append(current)
+            current.subscribe(self)
+            self._intern(current.get_name())
+            for user in current.get_users():
+                self._intern(user)
+            for child in reversed(list(current.get_groups())):
+                if child not in self._parents:
+                    self._parents[child] = set()
+                    stack.append(child)
+        for new_group in new_groups:
+            for child in new_group.get_groups():
+                self._parents[child].add(new_group)
+
+        ids = self._ids
+        for component in _components_children_first(root, self._bitmaps):
+            bitmap = RoaringBitmap(
+                ids[member]
+                for member_group in component
+                for member in (member_group.get_name(), *member_group.get_users())
+            )
+            for member_group in component:
+                for child in member_group.get_groups():
+                    child_bitmap = self._bitmaps.get(child)
+                    if child_bitmap is not None:
+                        bitmap |= child_bitmap
+            for member_group in component:
+                self._bitmaps[member_group] = bitmap
+
+    def _ancestor_bitmaps(self, group: Group) -> List[RoaringBitmap]:
+        """Distinct bitmaps of ``group`` and every group containing it."""
+        seen = {group}
+        order = [group]
+        for current in order:
+            for parent in self._parents[current]:
+                if parent not in seen:
+                    seen.add(parent)
+                    order.append(parent)
+        unique = {id(self._bitmaps[g]): self._bitmaps[g] for g in order}
+        return list(unique.values())
+
+    def group_added(self, parent: Group, child: Group) -> None:
+        """Notification hook: ``child`` was nested inside ``parent``."""
+        self._index(child)
+        self._parents[child].add(parent)
+        addition = self._bitmaps[child]
+        for bitmap in self._ancestor_bitmaps(parent):
+            if bitmap is not addition:
+                bitmap |= addition
+
+    def user_added(self, group: Group, user: str) -> None:
+        """Notification hook: ``user`` was added to ``group``."""
+        member_id = self._intern(user)
+        for bitmap in self._ancestor_bitmaps(group):
+            bitmap.add(member_id)
+
+    def is_member(self, user: str, group: Group) -> bool:
+        """
+        Return True if ``user`` is transitively in ``group``.
+
+        Same answer as ``is_user_in_group`` for indexed groups: one dict
+        lookup plus one container probe.
+        """
+        bitmap = self._bitmaps.get(group)
+        member_id = self._ids.get(user)
+        return bitmap is not None and member_id is not None and member_id in bitmap
+
+    def members_of(self, group: Group) -> Set[str]:
+        """Return every transitive member of ``group`` (empty if not indexed)."""
+        bitmap = self._bitmaps.get(group)
+        if bitmap is None:
+            return set()
+        names = self._names
+        return {names[member_id] for member_id in bitmap}
+
+    def membership_count(self) -> int:
+        """Number of (member, group) pairs in the transitive closure."""
+        return sum(len(bitmap) for bitmap in self._bitmaps.values())
+
+    def bitmap_bytes(self) -> int:
+        """Bytes held by the bitmap containers (shared bitmaps counted once)."""
+        unique = {id(bitmap): bitmap for bitmap in self._bitmaps.values()}
+        return sum(bitmap.memory_bytes() for bitmap in unique.values())
+
+    def intern_bytes(self) -> int:
+        """Bytes held by the id <-> name tables, including the name strings."""
+        names = sum(sys.getsizeof(name) for name in self._names)
+        return sys.getsizeof(self._ids) + sys.getsizeof(self._names) + names
+
+    def memory_bytes(self) -> int:
+        """Total of ``bitmap_bytes()`` and ``intern_bytes()``."""
+        return self.bitmap_bytes() + self.intern_bytes()
+
+
+def demonstrate_active_directory() -> None:
+    """Demonstrate membership checks with the original example."""
+    parent = Group("parent")
+    child = Group("child")
+    sub_child = Group("subchild")
+    sub_child.add_user("sub_child_user")
+    child.add_group(sub_child)
+    parent.add_group(child)
+
+    index = MembershipIndex(parent)
+    print(is_user_in_group("child", child), index.is_member("child", child))
+    print(is_user_in_group("", child), index.is_member("", child))
+    print(
+        is_user_in_group("sub_child_user", parent),
+        index.is_member("sub_child_user", parent),
+    )
+
+    # Incremental update after the index was built
+    sibling = Group("sibling")
+    sibling.add_user("late_user")
+    parent.add_group(sibling)
+    print(
+        index.is_member("late_user", parent),
+        sorted(g.get_name() for g in index.groups_of("sub_child_user")),
+    )
+
+
+def benchmark_storage(direct_users: int = 100_000, depth: int = 1000) -> None:
+    """
+    Compare list and set storage on wide and deep hierarchies.
+
+    Args:
+        direct_users: Users added directly to one group
+        depth: Nesting depth of the chain searched to the bottom
+    """
+    print(f"{direct_users} direct users, nesting depth {depth}:")
+    for group_type in (Group, SetGroup):
+        wide = group_type("wide")
+        start = time.perf_counter()
+        for i in range(direct_users):
+            wide.add_user(f"user_{i}")
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(0, direct_users, max(1, direct_users // 1000)):
+            is_user_in_group(f"user_{direct_users - 1 - i}", wide)
+        lookup_ms = (time.perf_counter() - start) * 1000
+
+        root = group_type("level_0")
+        current = root
+        for level in range(1, depth):
+            nested = group_type(f"level_{level}")
+            current.add_group(nested)
+            current = nested
+        current.add_user("deep_user")
+        start = time.perf_counter()
+        found = is_user_in_group("deep_user", root)
+        deep_ms = (time.perf_counter() - start) * 1000
+
+        print(
+            f"  {group_type.__name__:>8}: build {build_seconds:.3f}s | "
+            f"1000 lookups {lookup_ms:8.2f} ms | deep lookup {deep_ms:.2f} ms "
+            f"(found={found})"
+        )
+
+
+def benchmark_bitset_directory(
+    users: int = 1_000_000, departments: int = 10, teams: int = 10
+) -> None:
+    """
+    Measure memory and lookup speed of ``BitsetDirectory``.
+
+    Builds root -> departments -> teams with ``users`` spread evenly over
+    the teams, so every user is a transitive member of three groups.
+
+    Args:
+        users: Total number of users
+        departments: Departments under the root
+        teams: Teams per department
+    """
+    root = SetGroup("root")
+    all_teams = []
+    for d in range(departments):
+        department = SetGroup(f"dept_{d}")
+        root.add_group(department)
+        for t in range(teams):
+            team = SetGroup(f"team_{d}_{t}")
+            department.add_group(team)
+            all_teams.append(team)
+    for i in range(users):
+        all_teams[i * len(all_teams) // users].add_user(f"user_{i}")
+
+    start = time.perf_counter()
+    directory = BitsetDirectory(root)
+    build_seconds = time.perf_counter() - start
+    memberships = directory.membership_count()
+    bitmaps = directory.bitmap_bytes()
+    interned = directory.intern_bytes()
+
+    probes = [f"user_{i}" for i in range(0, users, max(1, users // 10_000))]
+    groups = [root, all_teams[0], all_teams[-1]]
+    start = time.perf_counter()
+    for user in probes:
+        for group in groups:
+            directory.is_member(user, group)
+    lookup_us = (time.perf_counter() - start) * 1e6 / (len(probes) * len(groups))
+
+    start = time.perf_counter()
+    for i in range(1000):
+        all_teams[i % len(all_teams)].add_user(f"late_user_{i}")
+    add_us = (time.perf_counter() - start) * 1e6 / 1000
+
+    print(
+        f"{users} users, {len(all_teams)} teams: build {build_seconds:.2f}s | "
+        f"{memberships} memberships in {bitmaps / 1024:.0f} KiB of bitmaps "
+        f"({bitmaps / max(memberships, 1):.3f} bytes each) + "
+        f"{interned / 1024:.0f} KiB of intern tables | "
+        f"is_member {lookup_us:.2f} us | add_user {add_us:.1f} us"
+    )
+
+
+if __name__ == "__main__":
+    demonstrate_active_directory()
+
+    print("\n" + "=" * 60)
+    print("STORAGE BENCHMARK")
+    print("=" * 60)
+    benchmark_storage()
+
+    print("\n" + "=" * 60)
+    print("BITSET DIRECTORY BENCHMARK")
+    print("=" * 60)
+    benchmark_bitset_directory()
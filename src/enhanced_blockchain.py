@@ -0,0 +1,535 @@
+"""
+Enhanced Blockchain Implementation
+==================================
+
+A hash-chained ledger for the block model from
+``02 Show Me The Data Structures/single/problem_5.py`` with:
+- Real chaining: each block hash covers the header (index, timestamp,
+  previous block digest, data digest, Merkle root), not just the data
+- ``previous_hash`` stores the previous block's digest, not the Block object
+- Append-only array storage: O(1) append and O(1) access by height
+- Incremental verification from a checkpoint, so re-verifying a long chain
+  only costs the blocks appended since the last check
+- Merkle-tree transaction bodies with O(log n) inclusion proofs
+- Proof-of-work fields: a block with difficulty d is only valid if its
+  hash has d leading zero bits (mined by ``pow_miner``)
+- Type hints and comprehensive documentation
+
+Header layout (big-endian)::
+
+    index (u64) | timestamp (f64) | previous hash (32) | data hash (32)
+    | Merkle root (32) | difficulty (u8) | nonce (u64)
+
+The Merkle root is all zeros for blocks without a transaction body.
+Leaves are ``sha256(0x00 | tx)`` and internal nodes
+``sha256(0x01 | left | right)``; an unpaired node is promoted unchanged.
+
+Time Complexity: O(1) append, O(k) to verify k new blocks, O(log t) proofs
+Space Complexity: O(n) blocks plus O(t) cached nodes per t-transaction body
+"""
+
+import hashlib
+import struct
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+HEADER = struct.Struct(">Qd32s32s32sBQ")
+NONCE = struct.Struct(">Q")
+DIGEST_SIZE = 32
+GENESIS_PREVIOUS_HASH = bytes(DIGEST_SIZE)
+NO_BODY_ROOT = bytes(DIGEST_SIZE)
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+Transaction = Union[str, bytes]
+# (sibling is on the left, sibling digest) pairs from leaf to root
+MerkleProof = List[Tuple[bool, bytes]]
+
+
+def hash_data(data: str) -> bytes:
+    """Return the SHA-256 digest of the block data (UTF-8 encoded)."""
+    return hashlib.sha256(data.encode("utf-8")).digest()
+
+
+def hash_header(
+    index: int,
+    timestamp: float,
+    previous_hash: bytes,
+    data_hash: bytes,
+    root: bytes = NO_BODY_ROOT,
+    difficulty: int = 0,
+    nonce: int = 0,
+) -> bytes:
+    """
+    Return the SHA-256 digest of a serialized block header.
+
+    Args:
+        index: Block height
+        timestamp: Creation time in epoch seconds
+        previous_hash: Digest of the previous block
+        data_hash: Digest of the block data
+        root: Merkle root of the transaction body
+        difficulty: Required leading zero bits of the block hash
+        nonce: Proof-of-work nonce
+
+    Returns:
+        32-byte block digest
+    """
+    return hashlib.sha256(
+        HEADER.pack(index, timestamp, previous_hash, data_hash, root, difficulty, nonce)
+    ).digest()
+
+
+def meets_difficulty(digest: bytes, difficulty: int) -> bool:
+    """Return True if ``digest`` starts with ``difficulty`` zero bits."""
+    return int.from_bytes(digest, "big") >> (8 * DIGEST_SIZE - difficulty) == 0
+
+
+def _leaf_hashes(transactions: Sequence[Transaction]) -> List[bytes]:
+    """Hash every transaction as a Merkle leaf."""
+    sha256 = hashlib.sha256
+    return [
+        sha256(
+            LEAF_PREFIX + (tx.encode("utf-8") if isinstance(tx, str) else tx)
+        ).digest()
+        for tx in transactions
+    ]
+
+
+def _parent_level(level: List[bytes]) -> List[bytes]:
+    """Hash one whole level of the tree into the level above it."""
+    sha256 = hashlib.sha256
+    parents = [
+        sha256(NODE_PREFIX + level[i] + level[i + 1]).digest()
+        for i in range(0, len(level) - 1, 2)
+    ]
+    if len(level) % 2:
+        parents.append(level[-1])
+    return parents
+
+
+def merkle_root(transactions: Sequence[Transaction]) -> bytes:
+    """
+    Compute the Merkle root of ``transactions`` without keeping the tree.
+
+    Args:
+        transactions: Transactions (str is UTF-8 encoded)
+
+    Returns:
+        32-byte root digest (``sha256(b"")`` for an empty body)
+    """
+    level = _leaf_hashes(transactions)
+    if not level:
+        return hashlib.sha256(b"").digest()
+    while len(level) > 1:
+        level = _parent_level(level)
+    return level[0]
+
+
+def verify_proof(transaction: Transaction, proof: MerkleProof, root: bytes) -> bool:
+    """
+    Check that ``transaction`` is included under ``root``.
+
+    Args:
+        transaction: Transaction to check
+        proof: Output of ``MerkleTree.proof`` for its index
+        root: Trusted Merkle root (e.g. a block's ``merkle_root``)
+
+    Returns:
+        True if hashing up the proof path reproduces ``root``
+    """
+    node = _leaf_hashes([transaction])[0]
+    for sibling_is_left, sibling in proof:
+        pair = sibling + node if sibling_is_left else node + sibling
+        node = hashlib.sha256(NODE_PREFIX + pair).digest()
+    return node == root
+
+
+class MerkleTree:
+    """
+    Merkle tree over a block's transactions with every level cached.
+
+    Levels are hashed one whole level at a time; ``proof`` then just reads
+    one sibling per level from the cache.
+    """
+
+    def __init__(self, transactions: Sequence[Transaction]) -> None:
+        """
+        Build the tree.
+
+        Args:
+            transactions: Transactions (str is UTF-8 encoded)
+        """
+        self.transactions: List[Transaction] = list(transactions)
+        self.levels: List[List[bytes]] = [_leaf_hashes(self.transactions)]
+        while len(self.levels[-1]) > 1:
+            self.levels.append(_parent_level(self.levels[-1]))
+
+    @property
+    def root(self) -> bytes:
+        """Root digest (``sha256(b"")`` for an empty body)."""
+        top = self.levels[-1]
+        return top[0] if top else hashlib.sha256(b"").digest()
+
+    def proof(self, tx_index: int) -> MerkleProof:
+        """
+        Build the inclusion proof for one transaction.
+
+        Args:
+            tx_index: Position of the transaction in the body
+
+        Returns:
+            At most ceil(log2 n) (sibling is on the left, sibling digest) pairs
+
+        Raises:
+            IndexError: If ``tx_index`` is out of range
+        """
+        if not 0 <= tx_index < len(self.transactions):
+            raise IndexError(f"Transaction index out of range: {tx_index}")
+        path: MerkleProof = []
+        position = tx_index
+        for level in self.levels[:-1]:
+            sibling = position ^ 1
+            if sibling < len(level):
+                path.append((sibling < position, level[sibling]))
+            position //= 2
+        return path
+
+    def __len__(self) -> int:
+        return len(self.transactions)
+
+
+@dataclass
+class Block:
+    """A block; ``hash`` covers every header field."""
+
+    index: int
+    timestamp: float
+    data: str
+    previous_hash: bytes
+    data_hash: bytes
+    hash: bytes
+    body: Optional[MerkleTree] = None
+    difficulty: int = 0
+    nonce: int = 0
+
+    @classmethod
+    def create(
+        cls,
+        index: int,
+        timestamp: float,
+        data: str,
+        previous_hash: bytes,
+        transactions: Optional[Sequence[Transaction]] = None,
+        difficulty: int = 0,
+        nonce: int = 0,
+    ) -> "Block":
+        """
+        Build a block, computing its data and header digests.
+
+        With ``transactions`` the block gets a Merkle body whose root is
+        part of the header, alongside the digest of ``data``. No nonce
+        search happens here; see ``pow_miner.mine_block``.
+        """
+        body = None if transactions is None else MerkleTree(transactions)
+        data_hash = hash_data(data)
+        root = NO_BODY_ROOT if body is None else body.root
+        return cls(
+            index,
+            timestamp,
+            data,
+            previous_hash,
+            data_hash,
+            hash_header(
+                index, timestamp, previous_hash, data_hash, root, difficulty, nonce
+            ),
+            body,
+            difficulty,
+            nonce,
+        )
+
+    def header_prefix(self) -> bytes:
+        """Serialized header without the trailing nonce bytes."""
+        return HEADER.pack(
+            self.index,
+            self.timestamp,
+            self.previous_hash,
+            self.data_hash,
+            self.merkle_root,
+            self.difficulty,
+            0,
+        )[: -NONCE.size]
+
+    @property
+    def merkle_root(self) -> bytes:
+        """Merkle root of the body (all zeros without a body)."""
+        return NO_BODY_ROOT if self.body is None else self.body.root
+
+    def is_consistent(self) -> bool:
+        """
+        Return True if the stored digests match the block contents.
+
+        The Merkle root is recomputed from the transactions rather than
+        trusted from the cached tree, and the hash must meet the block's
+        proof-of-work difficulty.
+        """
+        root = (
+            NO_BODY_ROOT if self.body is None else merkle_root(self.body.transactions)
+        )
+        expected = hash_header(
+            self.index,
+            self.timestamp,
+            self.previous_hash,
+            self.data_hash,
+            root,
+            self.difficulty,
+            self.nonce,
+        )
+        return (
+            self.data_hash == hash_data(self.data)
+            and self.hash == expected
+            and meets_difficulty(self.hash, self.difficulty)
+        )
+
+    def proof(self, tx_index: int) -> MerkleProof:
+        """
+        Return the inclusion proof for transaction ``tx_index``.
+
+        Raises:
+            ValueError: If the block has no transaction body
+        """
+        if self.body is None:
+            raise ValueError(f"Block {self.index} has no transaction body")
+        return self.body.proof(tx_index)
+
+    def __repr__(self) -> str:
+        return f"Block(index={self.index}, hash={self.hash.hex()[:16]}...)"
+
+
+class Blockchain:
+    """
+    Append-only ledger of hash-chained blocks.
+
+    Features:
+    - O(1) append and O(1) lookup by height
+    - ``verify`` re-checks only blocks appended since the last verified
+      checkpoint (pass ``from_index=0`` for a full audit)
+    """
+
+    def __init__(self) -> None:
+        self._blocks: List[Block] = []
+        self.verified_height = 0
+
+    def append(
+        self,
+        data: str,
+        timestamp: Optional[float] = None,
+        transactions: Optional[Sequence[Transaction]] = None,
+    ) -> Block:
+        """
+        Append a block holding ``data``.
+
+        Args:
+            data: Block payload (a label when ``transactions`` is given)
+            timestamp: Creation time (default: now)
+            transactions: Transactions for a Merkle body
+
+        Returns:
+            The new block
+        """
+        block = Block.create(
+            len(self._blocks),
+            time.time() if timestamp is None else timestamp,
+            data,
+            self.tip_hash,
+            transactions,
+        )
+        self._blocks.append(block)
+        return block
+
+    def add_block(self, block: Block) -> None:
+        """
+        Append an externally built block (e.g. a mined one).
+
+        Args:
+            block: Block extending the current tip
+
+        Raises:
+            ValueError: If the block does not extend the chain or is invalid
+        """
+        if block.index != len(self._blocks) or block.previous_hash != self.tip_hash:
+            raise ValueError(
+                f"Block {block.index} does not extend the chain at height "
+                f"{len(self._blocks)}"
+            )
+        if not block.is_consistent():
+            raise ValueError(f"Block {block.index} has inconsistent digests")
+        self._blocks.append(block)
+
+    @property
+    def tip_hash(self) -> bytes:
+        """Hash of the last block (the genesis sentinel when empty)."""
+        return self._blocks[-1].hash if self._blocks else GENESIS_PREVIOUS_HASH
+
+    def first_invalid(
+        self, start: int = 0, stop: Optional[int] = None
+    ) -> Optional[int]:
+        """
+        Find the first invalid block in ``[start, stop)``.
+
+        A block is valid when its index matches its height, its digests
+        match its contents and ``previous_hash`` matches the block before it.
+
+        Args:
+            start: First height to check
+            stop: Height to stop at (default: chain length)
+
+        Returns:
+            Height of the first invalid block, or None if all are valid
+        """
+        blocks = self._blocks
+        stop = len(blocks) if stop is None else min(stop, len(blocks))
+        for height in range(max(start, 0), stop):
+            block = blocks[height]
+            expected_previous = (
+                blocks[height - 1].hash if height else GENESIS_PREVIOUS_HASH
+            )
+            if (
+                block.index != height
+                or block.previous_hash != expected_previous
+                or not block.is_consistent()
+            ):
+                return height
+        return None
+
+    def verify(self, from_index: Optional[int] = None) -> bool:
+        """
+        Verify blocks from ``from_index`` (default: the checkpoint) onward.
+
+        Blocks past the checkpoint are always checked, so ``from_index``
+        can only move the start earlier. On success the checkpoint advances
+        to the chain length; on failure it stops at the first invalid block.
+
+        Args:
+            from_index: First height to re-check
+
+        Returns:
+            True if every checked block is valid
+        """
+        start = self.verified_height
+        if from_index is not None:
+            start = min(start, from_index)
+        invalid = self.first_invalid(start)
+        if invalid is None:
+            self.verified_height = len(self._blocks)
+            return True
+        self.verified_height = min(self.verified_height, invalid)
+        return False
+
+    @property
+    def last(self) -> Optional[Block]:
+        """Return the most recent block, or None for an empty chain."""
+        return self._blocks[-1] if self._blocks else None
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def __getitem__(self, height: int) -> Block:
+        return self._blocks[height]
+
+    def __iter__(self) -> Iterator[Block]:
+        return iter(self._blocks)
+
+
+def demonstrate_blockchain() -> None:
+    """Demonstrate chaining, verification and tamper detection."""
+    chain = Blockchain()
+    for data in ("Some Information", "Another Information", "Some more Information"):
+        chain.append(data)
+
+    for block in chain:
+        print(block, "prev", block.previous_hash.hex()[:16])
+    print("Chain valid:", chain.verify())
+
+    chain[1].data = "Tampered Information"
+    print("After tampering, full audit valid:", chain.verify(from_index=0))
+    print("First invalid block:", chain.first_invalid())
+
+    block = chain.append("batch", transactions=[f"tx {i}" for i in range(1000)])
+    proof = block.proof(123)
+    print(
+        f"Proof for tx 123 of 1000: {len(proof)} hashes, valid:",
+        verify_proof("tx 123", proof, block.merkle_root),
+    )
+
+
+def benchmark_verification(blocks: int = 200_000, appended: int = 1000) -> None:
+    """
+    Compare a full audit with incremental verification of new blocks.
+
+    Args:
+        blocks: Initial chain length
+        appended: Blocks appended after the first verification
+    """
+    chain = Blockchain()
+    start = time.perf_counter()
+    for i in range(blocks):
+        chain.append(f"transaction batch {i}", timestamp=float(i))
+    append_us = (time.perf_counter() - start) * 1e6 / blocks
+
+    start = time.perf_counter()
+    chain.verify(from_index=0)
+    full_seconds = time.perf_counter() - start
+
+    for i in range(appended):
+        chain.append(f"late batch {i}")
+    start = time.perf_counter()
+    chain.verify()
+    incremental_ms = (time.perf_counter() - start) * 1000
+
+    print(
+        f"{blocks} blocks: append {append_us:.2f} us/block | "
+        f"full verify {full_seconds:.2f}s | "
+        f"verify {appended} new blocks {incremental_ms:.2f} ms"
+    )
+
+
+def benchmark_merkle(sizes: Sequence[int] = (1_000, 10_000, 100_000)) -> None:
+    """
+    Measure Merkle tree build time, proof size and proof verification time.
+
+    Args:
+        sizes: Transaction counts per block
+    """
+    for size in sizes:
+        transactions = [f"transfer {i}: alice -> bob" for i in range(size)]
+        start = time.perf_counter()
+        tree = MerkleTree(transactions)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        probes = range(0, size, max(1, size // 1000))
+        start = time.perf_counter()
+        for index in probes:
+            assert verify_proof(transactions[index], tree.proof(index), tree.root)
+        verify_us = (time.perf_counter() - start) * 1e6 / len(probes)
+
+        print(
+            f"{size:>7} transactions: build {build_ms:8.2f} ms | "
+            f"proof {len(tree.proof(0))} hashes | "
+            f"prove + verify {verify_us:.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    demonstrate_blockchain()
+
+    print("\n" + "=" * 60)
+    print("VERIFICATION BENCHMARK")
+    print("=" * 60)
+    benchmark_verification()
+
+    print("\n" + "=" * 60)
+    print("MERKLE BENCHMARK")
+    print("=" * 60)
+    benchmark_merkle()
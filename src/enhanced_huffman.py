@@ -0,0 +1,781 @@
+"""
+Enhanced Huffman Coding Implementation
+======================================
+
+A byte-oriented rewrite of the Huffman codec from
+``02 Show Me The Data Structures/single/problem_3.py`` with:
+- Canonical Huffman codes built with a binary heap
+- Self-describing frames (code lengths + packed payload) per block
+- Independent blocks, so large inputs can be encoded and decoded in parallel
+- Shared memory / mmap transport so workers never receive pickled input
+- Optional NumPy path (bincount frequencies, vectorized bit packing)
+- Length-limited codes (package-merge) to bound decode table size
+- Type hints and a scaling benchmark
+
+Container layout (all integers big-endian)::
+
+    MAGIC (4 bytes) | block count (u32) | frame ...
+    frame = original length (u32) | bit length (u64) | payload length (u32)
+            | 256 code lengths (1 byte each) | payload
+
+Time Complexity: O(n) encode and decode, O(k log k) tree build per block
+Space Complexity: O(block size) per worker
+"""
+
+import heapq
+import mmap
+import os
+import struct
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is an optional speed-up
+    np = None
+
+BytesLike = Union[bytes, bytearray, memoryview]
+Source = Tuple[str, str]
+
+MAGIC = b"HUF1"
+ALPHABET_SIZE = 256
+DEFAULT_BLOCK_SIZE = 1 << 20
+# Largest code length decoded through a flat lookup table (2**bits entries)
+DECODE_TABLE_BITS = 16
+# Default limit for length-limited codes (as in DEFLATE)
+DEFAULT_MAX_CODE_LENGTH = 15
+# Symbols packed per vectorized step (bounds the temporary index arrays)
+NUMPY_CHUNK_SYMBOLS = 1 << 18
+HAS_NUMPY = np is not None
+
+CONTAINER_HEADER = struct.Struct(">4sI")
+FRAME_HEADER = struct.Struct(">IQI")
+FRAME_PREFIX_SIZE = FRAME_HEADER.size + ALPHABET_SIZE
+
+
+def _as_bytes(data: Union[str, BytesLike]) -> bytes:
+    """Normalize codec input to bytes (text is UTF-8 encoded)."""
+    if isinstance(data, str):
+        return data.encode("utf-8")
+    return bytes(data)
+
+
+def _use_numpy(requested: Optional[bool]) -> bool:
+    """Resolve a ``use_numpy`` argument (None means "if installed")."""
+    if requested and not HAS_NUMPY:
+        raise ImportError("NumPy is required for use_numpy=True")
+    return HAS_NUMPY if requested is None else requested
+
+
+def compute_frequencies(data: BytesLike, use_numpy: Optional[bool] = None) -> List[int]:
+    """
+    Count occurrences of every byte value.
+
+    Args:
+        data: Input bytes
+        use_numpy: Count with ``np.bincount`` (default: when NumPy is installed)
+
+    Returns:
+        List of 256 counts indexed by byte value
+    """
+    if _use_numpy(use_numpy):
+        symbols = np.frombuffer(data, dtype=np.uint8)
+        return np.bincount(symbols, minlength=ALPHABET_SIZE).tolist()
+
+    frequencies = [0] * ALPHABET_SIZE
+    for symbol, count in Counter(data).items():
+        frequencies[symbol] = count
+    return frequencies
+
+
+def build_code_lengths(frequencies: Sequence[int]) -> List[int]:
+    """
+    Compute Huffman code lengths from symbol frequencies.
+
+    Args:
+        frequencies: Count per symbol (zero means the symbol is unused)
+
+    Returns:
+        Code length per symbol (0 for unused symbols)
+    """
+    lengths = [0] * len(frequencies)
+    heap: List[Tuple[int, int, List[int]]] = [
+        (freq, symbol, [symbol]) for symbol, freq in enumerate(frequencies) if freq
+    ]
+    if not heap:
+        return lengths
+    if len(heap) == 1:
+        # A lone symbol still needs one bit per occurrence
+        lengths[heap[0][1]] = 1
+        return lengths
+
+    heapq.heapify(heap)
+    while len(heap) > 1:
+        freq_a, order_a, symbols_a = heapq.heappop(heap)
+        freq_b, order_b, symbols_b = heapq.heappop(heap)
+        for symbol in symbols_a:
+            lengths[symbol] += 1
+        for symbol in symbols_b:
+            lengths[symbol] += 1
+        heapq.heappush(
+            heap, (freq_a + freq_b, min(order_a, order_b), symbols_a + symbols_b)
+        )
+    return lengths
+
+
+def build_length_limited_code_lengths(
+    frequencies: Sequence[int], max_length: int = DEFAULT_MAX_CODE_LENGTH
+) -> List[int]:
+    """
+    Compute optimal code lengths no longer than ``max_length`` bits.
+
+    Uses the package-merge algorithm: each used symbol is a "coin" of its
+    frequency at every one of ``max_length`` denominations. Packaging the
+    cheapest pairs level by level and keeping the ``2n - 2`` cheapest items
+    yields lengths that are optimal under the limit, so skewed inputs can
+    no longer produce codes that overflow a ``2**max_length`` decode table.
+
+    Args:
+        frequencies: Count per symbol (zero means the symbol is unused)
+        max_length: Longest permitted code, in bits
+
+    Returns:
+        Code length per symbol (0 for unused symbols)
+
+    Raises:
+        ValueError: If ``max_length`` bits cannot encode every used symbol
+    """
+    lengths = [0] * len(frequencies)
+    coins = sorted((freq, [symbol]) for symbol, freq in enumerate(frequencies) if freq)
+    if len(coins) <= 1:
+        for _, symbols in coins:
+            lengths[symbols[0]] = 1
+        return lengths
+    if max_length < 1 or (1 << max_length) < len(coins):
+        raise ValueError(
+            f"{len(coins)} symbols cannot be coded in {max_length} bits or fewer"
+        )
+
+    items = coins
+    for _ in range(max_length - 1):
+        packages = [
+            (items[i][0] + items[i + 1][0], items[i][1] + items[i + 1][1])
+            for i in range(0, len(items) - 1, 2)
+        ]
+        items = list(heapq.merge(coins, packages, key=lambda item: item[0]))
+
+    for _, symbols in items[: 2 * len(coins) - 2]:
+        for symbol in symbols:
+            lengths[symbol] += 1
+    return lengths
+
+
+def _code_lengths(
+    frequencies: Sequence[int], max_code_length: Optional[int]
+) -> List[int]:
+    """Pick unrestricted or length-limited construction."""
+    if max_code_length is None:
+        return build_code_lengths(frequencies)
+    return build_length_limited_code_lengths(frequencies, max_code_length)
+
+
+def canonical_codes(lengths: Sequence[int]) -> List[int]:
+    """
+    Assign canonical Huffman codes from code lengths.
+
+    Symbols are ordered by (length, symbol) and receive consecutive codes,
+    so the lengths alone are enough to rebuild the code on decode.
+
+    Args:
+        lengths: Code length per symbol
+
+    Returns:
+        Integer code per symbol (meaningful only where length > 0)
+    """
+    codes = [0] * len(lengths)
+    code = 0
+    previous_length = 0
+    used = sorted(
+        (s for s in range(len(lengths)) if lengths[s]), key=lambda s: (lengths[s], s)
+    )
+    for symbol in used:
+        code <<= lengths[symbol] - previous_length
+        codes[symbol] = code
+        code += 1
+        previous_length = lengths[symbol]
+    return codes
+
+
+def _pack_bits(bits: str) -> bytes:
+    """Pack a string of '0'/'1' characters into bytes, zero padded."""
+    if not bits:
+        return b""
+    padded = bits + "0" * (-len(bits) % 8)
+    return int(padded, 2).to_bytes(len(padded) // 8, "big")
+
+
+def _unpack_bits(payload: BytesLike, bit_length: int) -> str:
+    """Inverse of ``_pack_bits``: return the first ``bit_length`` bits."""
+    if not bit_length:
+        return ""
+    bits = format(int.from_bytes(payload, "big"), "b").zfill(len(payload) * 8)
+    return bits[:bit_length]
+
+
+def _encode_payload_strings(
+    data: bytes, lengths: Sequence[int], codes: Sequence[int]
+) -> Tuple[bytes, int]:
+    """Pack codes by joining per-symbol bit strings (pure Python)."""
+    patterns = [
+        format(codes[s], f"0{lengths[s]}b") if lengths[s] else ""
+        for s in range(ALPHABET_SIZE)
+    ]
+    bits = "".join(map(patterns.__getitem__, data))
+    return _pack_bits(bits), len(bits)
+
+
+def _encode_payload_numpy(
+    data: bytes, lengths: Sequence[int], codes: Sequence[int]
+) -> Tuple[bytes, int]:
+    """
+    Pack codes with vectorized table lookups and a bit-offset scatter.
+
+    Every code's bits are laid out once in a flat pattern table. Per symbol,
+    the code length is gathered from a 256-entry table and a cumulative sum
+    gives its first output bit; ``np.repeat`` then maps each output bit back
+    to its position in the pattern table, so the bits are copied with one
+    fancy-indexing gather per chunk of symbols.
+    """
+    table_lengths = np.asarray(lengths, dtype=np.int64)
+    pattern_starts = np.cumsum(table_lengths) - table_lengths
+    patterns = "".join(
+        format(codes[s], f"0{lengths[s]}b") if lengths[s] else ""
+        for s in range(ALPHABET_SIZE)
+    )
+    pattern_bits = np.frombuffer(patterns.encode("ascii"), dtype=np.uint8) - 48
+
+    symbols = np.frombuffer(data, dtype=np.uint8)
+    symbol_lengths = table_lengths[symbols]
+    ends = np.cumsum(symbol_lengths)
+    starts = ends - symbol_lengths
+    bit_length = int(ends[-1])
+
+    bits = np.zeros(bit_length + (-bit_length % 8), dtype=np.uint8)
+    for first in range(0, len(symbols), NUMPY_CHUNK_SYMBOLS):
+        last = min(first + NUMPY_CHUNK_SYMBOLS, len(symbols))
+        low, high = int(starts[first]), int(ends[last - 1])
+        source = np.repeat(
+            pattern_starts[symbols[first:last]] - starts[first:last],
+            symbol_lengths[first:last],
+        )
+        bits[low:high] = pattern_bits[source + np.arange(low, high)]
+    return np.packbits(bits).tobytes(), bit_length
+
+
+def encode_block(
+    block: BytesLike,
+    lengths: Optional[Sequence[int]] = None,
+    use_numpy: Optional[bool] = None,
+    max_code_length: Optional[int] = None,
+) -> bytes:
+    """
+    Encode one independent block into a self-describing frame.
+
+    Args:
+        block: Bytes to encode
+        lengths: Precomputed code lengths (computed from ``block`` if omitted)
+        use_numpy: Use the vectorized path (default: when NumPy is installed)
+        max_code_length: Limit code lengths to this many bits (None: no limit)
+
+    Returns:
+        Frame bytes (header, code lengths and payload)
+
+    Raises:
+        ValueError: If ``lengths`` leaves a symbol of ``block`` without a code
+    """
+    data = bytes(block)
+    vectorized = _use_numpy(use_numpy)
+    if lengths is None:
+        frequencies = compute_frequencies(data, vectorized)
+        lengths = _code_lengths(frequencies, max_code_length)
+    else:
+        if len(lengths) != ALPHABET_SIZE:
+            raise ValueError(f"Expected {ALPHABET_SIZE} code lengths")
+        counts = compute_frequencies(data, vectorized)
+        missing = [s for s in range(ALPHABET_SIZE) if counts[s] and not lengths[s]]
+        if missing:
+            raise ValueError(f"No code length for byte value {missing[0]}")
+    codes = canonical_codes(lengths)
+    if vectorized and data:
+        payload, bit_length = _encode_payload_numpy(data, lengths, codes)
+    else:
+        payload, bit_length = _encode_payload_strings(data, lengths, codes)
+    header = FRAME_HEADER.pack(len(data), bit_length, len(payload))
+    return header + bytes(lengths) + payload
+
+
+def _read_frame_header(buffer: BytesLike, offset: int) -> Tuple[int, int, int]:
+    """Return (original length, bit length, payload length) of a frame."""
+    if offset + FRAME_PREFIX_SIZE > len(buffer):
+        raise ValueError("Truncated Huffman frame header")
+    return FRAME_HEADER.unpack_from(buffer, offset)
+
+
+def _check_code_lengths(lengths: Sequence[int]) -> None:
+    """
+    Reject code lengths that do not form a complete prefix code.
+
+    A lone symbol of length 1 is the only incomplete code an encoder emits.
+
+    Raises:
+        ValueError: If the Kraft sum of the lengths is not exactly 1
+    """
+    used = [length for length in lengths if length]
+    if not used:
+        raise ValueError("Huffman frame has no code lengths")
+    if used == [1]:
+        return
+    max_length = max(used)
+    if sum(1 << (max_length - length) for length in used) != 1 << max_length:
+        raise ValueError("Huffman frame code lengths are not a complete prefix code")
+
+
+def _decode_with_table(
+    bits: str, count: int, lengths: Sequence[int], codes: Sequence[int]
+) -> Tuple[bytes, int]:
+    """
+    Decode using a flat table indexed by the next ``max_length`` bits.
+
+    Returns:
+        Tuple of (decoded bytes, bits consumed)
+
+    Raises:
+        ValueError: If the bits select a table slot no code covers
+    """
+    max_length = max(lengths)
+    table_symbols = bytearray(1 << max_length)
+    table_lengths = bytearray(1 << max_length)
+    for symbol, length in enumerate(lengths):
+        if not length:
+            continue
+        first = codes[symbol] << (max_length - length)
+        span = 1 << (max_length - length)
+        table_symbols[first : first + span] = bytes([symbol]) * span
+        table_lengths[first : first + span] = bytes([length]) * span
+
+    bits += "0" * max_length
+    output = bytearray(count)
+    position = 0
+    for index in range(count):
+        window = int(bits[position : position + max_length], 2)
+        length = table_lengths[window]
+        if not length:
+            raise ValueError("Huffman frame payload holds an unassigned code")
+        output[index] = table_symbols[window]
+        position += length
+    return bytes(output), position
+
+
+def _decode_with_prefixes(
+    bits: str, count: int, lengths: Sequence[int], codes: Sequence[int]
+) -> Tuple[bytes, int]:
+    """
+    Decode bit by bit against a prefix dictionary (for very long codes).
+
+    Returns:
+        Tuple of (decoded bytes, bits consumed)
+    """
+    lookup: Dict[str, int] = {
+        format(codes[s], f"0{lengths[s]}b"): s
+        for s in range(len(lengths))
+        if lengths[s]
+    }
+    output = bytearray()
+    prefix = ""
+    position = 0
+    for bit in bits:
+        position += 1
+        prefix += bit
+        symbol = lookup.get(prefix)
+        if symbol is not None:
+            output.append(symbol)
+            prefix = ""
+            if len(output) == count:
+                break
+    return bytes(output), position
+
+
+def decode_frame(buffer: BytesLike, offset: int = 0) -> Tuple[bytes, int]:
+    """
+    Decode the frame starting at ``offset``.
+
+    Args:
+        buffer: Buffer containing one or more frames
+        offset: Start of the frame to decode
+
+    Returns:
+        Tuple of (decoded bytes, offset just past the frame)
+
+    Raises:
+        ValueError: If the frame is truncated or malformed
+    """
+    count, bit_length, payload_length = _read_frame_header(buffer, offset)
+    lengths_start = offset + FRAME_HEADER.size
+    payload_start = lengths_start + ALPHABET_SIZE
+    end = payload_start + payload_length
+    if end > len(buffer) or bit_length > payload_length * 8:
+        raise ValueError("Truncated Huffman frame payload")
+
+    lengths = list(bytes(buffer[lengths_start:payload_start]))
+    if count == 0:
+        return b"", end
+    _check_code_lengths(lengths)
+
+    codes = canonical_codes(lengths)
+    bits = _unpack_bits(buffer[payload_start:end], bit_length)
+    if max(lengths) <= DECODE_TABLE_BITS:
+        decoded, consumed = _decode_with_table(bits, count, lengths, codes)
+    else:
+        decoded, consumed = _decode_with_prefixes(bits, count, lengths, codes)
+    if len(decoded) != count:
+        raise ValueError("Huffman frame decoded to the wrong length")
+    if consumed != bit_length:
+        raise ValueError("Huffman frame payload does not end at its bit length")
+    return decoded, end
+
+
+def frame_spans(encoded: BytesLike) -> List[Tuple[int, int]]:
+    """
+    Locate every frame in an encoded container without decoding it.
+
+    Args:
+        encoded: Container produced by ``huffman_encoding``
+
+    Returns:
+        List of (start, end) byte offsets, one per block
+
+    Raises:
+        ValueError: If the container header is invalid
+    """
+    if len(encoded) < CONTAINER_HEADER.size:
+        raise ValueError("Truncated Huffman container header")
+    magic, block_count = CONTAINER_HEADER.unpack_from(encoded, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a Huffman container (bad magic)")
+
+    spans = []
+    offset = CONTAINER_HEADER.size
+    for _ in range(block_count):
+        payload_length = _read_frame_header(encoded, offset)[2]
+        end = offset + FRAME_PREFIX_SIZE + payload_length
+        spans.append((offset, end))
+        offset = end
+    return spans
+
+
+def _join_frames(frames: Sequence[bytes]) -> bytes:
+    """Prefix the frames with the container header."""
+    return CONTAINER_HEADER.pack(MAGIC, len(frames)) + b"".join(frames)
+
+
+def _block_ranges(size: int, block_size: int) -> List[Tuple[int, int]]:
+    """Split ``size`` bytes into consecutive (start, stop) ranges."""
+    if block_size <= 0:
+        raise ValueError("Block size must be positive")
+    return [
+        (start, min(start + block_size, size)) for start in range(0, size, block_size)
+    ]
+
+
+def huffman_encoding(
+    data: Union[str, BytesLike],
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    max_code_length: Optional[int] = None,
+) -> bytes:
+    """
+    Encode data into a Huffman container on the current core.
+
+    Args:
+        data: Text (UTF-8 encoded) or bytes to compress
+        block_size: Bytes per independently coded block
+        max_code_length: Limit code lengths to this many bits (None: no limit)
+
+    Returns:
+        Encoded container bytes
+    """
+    view = memoryview(_as_bytes(data))
+    frames = [
+        encode_block(view[start:stop], max_code_length=max_code_length)
+        for start, stop in _block_ranges(len(view), block_size)
+    ]
+    return _join_frames(frames)
+
+
+def huffman_decoding(encoded: BytesLike) -> bytes:
+    """
+    Decode a Huffman container on the current core.
+
+    Args:
+        encoded: Container produced by any of the encoders in this module
+
+    Returns:
+        Original bytes
+    """
+    return b"".join(
+        decode_frame(encoded, start)[0] for start, _ in frame_spans(encoded)
+    )
+
+
+def _read_source(source: Source, start: int, stop: int) -> bytes:
+    """Copy ``[start, stop)`` out of a shared memory segment or a file."""
+    kind, name = source
+    if kind == "shm":
+        segment = shared_memory.SharedMemory(name=name)
+        try:
+            return bytes(segment.buf[start:stop])
+        finally:
+            segment.close()
+    with open(name, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        return mapped[start:stop]
+
+
+def _encode_range(
+    source: Source, start: int, stop: int, max_code_length: Optional[int] = None
+) -> bytes:
+    """Worker: encode one block of the shared input."""
+    block = _read_source(source, start, stop)
+    return encode_block(block, max_code_length=max_code_length)
+
+
+def _decode_range(source: Source, start: int, stop: int) -> bytes:
+    """Worker: decode one frame of the shared container."""
+    return decode_frame(_read_source(source, start, stop))[0]
+
+
+def _map_ranges(
+    worker: object,
+    source: Source,
+    ranges: Sequence[Tuple[int, int]],
+    workers: Optional[int],
+    *extra: object,
+) -> List[bytes]:
+    """Run ``worker`` over ``ranges`` in a process pool, preserving order."""
+    if not ranges:
+        return []
+    starts = [start for start, _ in ranges]
+    stops = [stop for _, stop in ranges]
+    constants = [repeat(value) for value in extra]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(
+            pool.map(worker, repeat(source), starts, stops, *constants)  # type: ignore
+        )
+
+
+def _run_shared(
+    data: bytes,
+    worker: object,
+    ranges: Sequence[Tuple[int, int]],
+    workers: Optional[int],
+    *extra: object,
+) -> List[bytes]:
+    """Publish ``data`` in shared memory and fan ``ranges`` out to workers."""
+    if not data:
+        return []
+    segment = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        segment.buf[: len(data)] = data
+        source = ("shm", segment.name)
+        return _map_ranges(worker, source, ranges, workers, *extra)
+    finally:
+        segment.close()
+        segment.unlink()
+
+
+def parallel_huffman_encoding(
+    data: Union[str, BytesLike],
+    workers: Optional[int] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    max_code_length: Optional[int] = None,
+) -> bytes:
+    """
+    Encode data across a process pool, one block per task.
+
+    The input is copied once into shared memory; workers read their block
+    from there and return its frame. Frames are joined in input order, so
+    the output is byte-identical to ``huffman_encoding``.
+
+    Args:
+        data: Text (UTF-8 encoded) or bytes to compress
+        workers: Process count (defaults to ``os.cpu_count()``)
+        block_size: Bytes per independently coded block
+        max_code_length: Limit code lengths to this many bits (None: no limit)
+
+    Returns:
+        Encoded container bytes
+    """
+    raw = _as_bytes(data)
+    ranges = _block_ranges(len(raw), block_size)
+    frames = _run_shared(raw, _encode_range, ranges, workers, max_code_length)
+    return _join_frames(frames)
+
+
+def parallel_huffman_decoding(
+    encoded: BytesLike, workers: Optional[int] = None
+) -> bytes:
+    """
+    Decode a Huffman container across a process pool, one frame per task.
+
+    Args:
+        encoded: Container produced by any of the encoders in this module
+        workers: Process count (defaults to ``os.cpu_count()``)
+
+    Returns:
+        Original bytes
+    """
+    raw = bytes(encoded)
+    return b"".join(_run_shared(raw, _decode_range, frame_spans(raw), workers))
+
+
+def compress_file(
+    source_path: str,
+    target_path: str,
+    workers: Optional[int] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    max_code_length: Optional[int] = None,
+) -> int:
+    """
+    Compress a file in parallel; workers mmap the source themselves.
+
+    Args:
+        source_path: File to compress
+        target_path: Destination for the container
+        workers: Process count (defaults to ``os.cpu_count()``)
+        block_size: Bytes per independently coded block
+        max_code_length: Limit code lengths to this many bits (None: no limit)
+
+    Returns:
+        Size of the written container in bytes
+    """
+    size = os.path.getsize(source_path)
+    ranges = _block_ranges(size, block_size)
+    source = ("file", source_path)
+    frames = (
+        _map_ranges(_encode_range, source, ranges, workers, max_code_length)
+        if size
+        else []
+    )
+    with open(target_path, "wb") as f:
+        f.write(CONTAINER_HEADER.pack(MAGIC, len(frames)))
+        for frame in frames:
+            f.write(frame)
+    return CONTAINER_HEADER.size + sum(len(frame) for frame in frames)
+
+
+def decompress_file(
+    source_path: str, target_path: str, workers: Optional[int] = None
+) -> int:
+    """
+    Decompress a container file in parallel; workers mmap it themselves.
+
+    Args:
+        source_path: Container file produced by ``compress_file``
+        target_path: Destination for the decoded bytes
+        workers: Process count (defaults to ``os.cpu_count()``)
+
+    Returns:
+        Number of decoded bytes written
+    """
+    with open(source_path, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        spans = frame_spans(mapped)
+    blocks = _map_ranges(_decode_range, ("file", source_path), spans, workers)
+    with open(target_path, "wb") as f:
+        for block in blocks:
+            f.write(block)
+    return sum(len(block) for block in blocks)
+
+
+def benchmark_parallel_scaling(
+    data: BytesLike,
+    max_workers: Optional[int] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> List[Dict[str, float]]:
+    """
+    Measure encode/decode throughput for 1..max_workers processes.
+
+    Args:
+        data: Sample input
+        max_workers: Largest pool size to try (defaults to ``os.cpu_count()``)
+        block_size: Bytes per block
+
+    Returns:
+        One row per worker count with MB/s figures and speedup over 1 worker
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    megabytes = len(data) / 1e6
+    rows: List[Dict[str, float]] = []
+    for workers in range(1, max_workers + 1):
+        start = time.perf_counter()
+        encoded = parallel_huffman_encoding(data, workers, block_size)
+        encode_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        decoded = parallel_huffman_decoding(encoded, workers)
+        decode_seconds = time.perf_counter() - start
+        if decoded != bytes(data):
+            raise RuntimeError(f"Round trip failed with {workers} workers")
+
+        encode_mb_s = megabytes / encode_seconds
+        decode_mb_s = megabytes / decode_seconds
+        baseline = (
+            rows[0]
+            if rows
+            else {"encode_mb_s": encode_mb_s, "decode_mb_s": decode_mb_s}
+        )
+        rows.append(
+            {
+                "workers": workers,
+                "encode_mb_s": encode_mb_s,
+                "decode_mb_s": decode_mb_s,
+                "encode_speedup": encode_mb_s / baseline["encode_mb_s"],
+                "decode_speedup": decode_mb_s / baseline["decode_mb_s"],
+                "ratio": len(data) / len(encoded),
+            }
+        )
+    return rows
+
+
+def demonstrate_huffman() -> None:
+    """Demonstrate the codec with the examples from the original problem."""
+    print("=== Huffman Coding Demonstration ===\n")
+    for sentence in ["The bird is the word", "AAAAAAAAA", ""]:
+        encoded = huffman_encoding(sentence)
+        decoded = huffman_decoding(encoded).decode("utf-8")
+        print(f"Input:   {sentence!r} ({len(sentence.encode('utf-8'))} bytes)")
+        print(f"Encoded: {len(encoded)} bytes (including frame headers)")
+        print(f"Decoded: {decoded!r}\n")
+
+
+if __name__ == "__main__":
+    demonstrate_huffman()
+
+    print("=" * 60)
+    print("PARALLEL SCALING BENCHMARK")
+    print("=" * 60)
+    sample = b"".join(
+        f"{i:08d},{(i * 7919) % 100000:05d},01-09-2016 06:03:22,{i % 3600}\n".encode()
+        for i in range(200_000)
+    )
+    for row in benchmark_parallel_scaling(sample, block_size=256 * 1024):
+        print(
+            f"workers={row['workers']:2.0f} | encode {row['encode_mb_s']:6.2f} MB/s "
+            f"(x{row['encode_speedup']:.2f}) | decode {row['decode_mb_s']:6.2f} MB/s "
+            f"(x{row['decode_speedup']:.2f}) | ratio {row['ratio']:.2f}"
+        )
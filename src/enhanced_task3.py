@@ -12,10 +12,11 @@ Improvements:
 - Comprehensive test cases
 """
 
-import csv
 import re
 from pathlib import Path
-from typing import List, Optional, Set, Tuple
+from typing import Iterator, List, Optional, Sequence, Set, Tuple
+
+from telecom_records import CallRecord, iter_rows
 
 
 class PhoneNumberAnalyzer:
@@ -89,6 +90,10 @@ class PhoneNumberAnalyzer:
             if receiver_code == self.BANGALORE_PREFIX:
                 self.bangalore_to_bangalore_count += 1
 
+    def on_call(self, record: CallRecord) -> None:
+        """Pipeline hook: process one streamed call record."""
+        self.process_call_record(record.caller, record.receiver)
+
     def get_called_codes_sorted(self) -> List[str]:
         """Get sorted list of all area codes called from Bangalore."""
         return sorted(self.called_codes)
@@ -100,20 +105,21 @@ class PhoneNumberAnalyzer:
         return (self.bangalore_to_bangalore_count * 100.0) / self.total_bangalore_calls
 
 
-def read_csv_data(filepath: Path) -> List[List[str]]:
+def read_csv_data(
+    filepath: Path, columns: Optional[Sequence[str]] = None
+) -> List[List[str]]:
     """
     Read CSV file safely with proper error handling.
 
     Args:
-        filepath: Path to the CSV file
+        filepath: Path to the CSV file or call log archive
+        columns: Archive columns to decode (default: all); ignored for CSV
 
     Returns:
-        List of rows from the CSV file
+        List of rows from the CSV file, header row dropped
     """
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            reader = csv.reader(f)
-            return list(reader)
+        return list(iter_rows(filepath, columns))
     except FileNotFoundError:
         raise FileNotFoundError(f"CSV file not found: {filepath}")
     except Exception as e:
@@ -139,11 +145,11 @@ def analyze_bangalore_calls(
         Path("..") / "sample_data" / calls_filepath,
     ]
 
-    calls_data = None
+    calls_data: Optional[Iterator[List[str]]] = None
 
     for path in possible_paths:
         try:
-            calls_data = read_csv_data(path)
+            calls_data = iter_rows(path, ("caller", "receiver"))
             print(f"Successfully loaded calls data from: {path}")
             break
         except FileNotFoundError:
@@ -152,20 +158,11 @@ def analyze_bangalore_calls(
     if calls_data is None:
         raise FileNotFoundError(f"CSV file not found: {calls_filepath}")
 
-    if not calls_data:
-        return [], 0.0
     # Initialize analyzer
     analyzer = PhoneNumberAnalyzer()
 
-    # Skip header row if present
-    data_rows = (
-        calls_data[1:]
-        if calls_data and "calling number" in str(calls_data[0])
-        else calls_data
-    )
-
-    # Process each call record
-    for record in data_rows:
+    # Process each call record as it is read
+    for record in calls_data:
         if len(record) >= 2:  # Need at least caller and receiver
             caller, receiver = record[0], record[1]
             analyzer.process_call_record(caller, receiver)
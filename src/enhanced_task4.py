@@ -16,11 +16,27 @@ Improvements:
 - Modular design with clear separation of concerns
 - Comprehensive error handling
 - Performance analysis and testing
+- With a ``cache_dir``, repeat runs work on a memory-mapped binary cache
+  (``columnar_cache``) of number ids instead of parsing the CSV
+- ``StreamingTelemarketerDetector`` keeps the answer current over a live
+  feed, optionally forgetting activity older than a time window
 """
 
-import csv
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Set, Tuple, Optional
+from typing import List, Optional, Sequence, Set, Tuple, Union
+
+from call_log_archive import parse_timestamp
+from columnar_cache import CachedLog, try_open_cache
+from telecom_records import CallRecord, TextRecord, iter_calls, iter_rows, iter_texts
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - only the cached path needs NumPy
+    np = None
+
+PathLike = Union[str, Path]
 
 
 class TelemarketerDetector:
@@ -54,6 +70,14 @@ class TelemarketerDetector:
         self.text_senders.add(sender)
         self.text_receivers.add(receiver)
 
+    def on_call(self, record: CallRecord) -> None:
+        """Pipeline hook: process one streamed call record."""
+        self.process_call_record(record.caller, record.receiver)
+
+    def on_text(self, record: TextRecord) -> None:
+        """Pipeline hook: process one streamed text record."""
+        self.process_text_record(record.sender, record.receiver)
+
     def get_legitimate_numbers(self) -> Set[str]:
         """
         Get all numbers that show legitimate user behavior.
@@ -80,46 +104,256 @@ class TelemarketerDetector:
         Returns:
             Dictionary with various statistics
         """
-        legitimate = self.get_legitimate_numbers()
-        potential_telemarketers = self.get_potential_telemarketers()
-
-        return {
-            "total_outgoing_callers": len(self.outgoing_callers),
-            "total_incoming_receivers": len(self.incoming_receivers),
-            "total_text_senders": len(self.text_senders),
-            "total_text_receivers": len(self.text_receivers),
-            "total_legitimate_numbers": len(legitimate),
-            "potential_telemarketers": len(potential_telemarketers),
-            "telemarketer_percentage": (
-                len(potential_telemarketers) * 100.0 / len(self.outgoing_callers)
-                if self.outgoing_callers
-                else 0.0
-            ),
-        }
-
-
-def read_csv_file(filepath: Path) -> List[List[str]]:
+        return _statistics(
+            len(self.outgoing_callers),
+            len(self.incoming_receivers),
+            len(self.text_senders),
+            len(self.text_receivers),
+            len(self.get_legitimate_numbers()),
+            len(self.get_potential_telemarketers()),
+        )
+
+
+def _statistics(
+    callers: int,
+    receivers: int,
+    senders: int,
+    text_receivers: int,
+    legitimate: int,
+    telemarketers: int,
+) -> dict:
+    """Assemble the ``get_statistics`` dictionary from set sizes."""
+    return {
+        "total_outgoing_callers": callers,
+        "total_incoming_receivers": receivers,
+        "total_text_senders": senders,
+        "total_text_receivers": text_receivers,
+        "total_legitimate_numbers": legitimate,
+        "potential_telemarketers": telemarketers,
+        "telemarketer_percentage": (
+            telemarketers * 100.0 / callers if callers else 0.0
+        ),
+    }
+
+
+class StreamingTelemarketerDetector:
+    """
+    Incremental telemarketer detector for unbounded, time-ordered feeds.
+
+    The candidate set is updated as each record arrives instead of being
+    recomputed from unions at the end: a caller joins it on its first call
+    and leaves it the moment it receives a call or sends or receives a text.
+
+    With a ``window`` only activity from the last ``window`` seconds (of
+    record time) counts. A number's last outgoing call and last legitimate
+    activity are kept in two dicts ordered by recency, and each new record
+    expires entries from their old ends, so memory is bounded by the
+    numbers active within the window. Once legitimate activity ages out, a
+    number that is still calling becomes a candidate again; once its calls
+    age out it stops being one.
+
+    Records are expected in timestamp order; a late record is treated as
+    current, which only delays its expiry. Without a window timestamps are
+    not needed and the answer equals ``TelemarketerDetector``'s.
+    """
+
+    def __init__(self, window: Optional[int] = None) -> None:
+        """
+        Create a detector.
+
+        Args:
+            window: Seconds of activity to remember (None: remember all)
+
+        Raises:
+            ValueError: If window is not positive
+        """
+        if window is not None and window <= 0:
+            raise ValueError("Window must be positive")
+        self.window = window
+        self.clock: Optional[int] = None
+        # number -> time of its latest outgoing call / legitimate activity
+        self._last_call: "OrderedDict[str, int]" = OrderedDict()
+        self._last_active: "OrderedDict[str, int]" = OrderedDict()
+        self._candidates: Set[str] = set()
+
+    def _advance(self, timestamp: Optional[int]) -> int:
+        """Move the clock to ``timestamp``; expire activity outside the window."""
+        clock = self.clock
+        if timestamp is not None and (clock is None or timestamp > clock):
+            self.clock = clock = timestamp
+        if clock is None:
+            return 0
+        if self.window is not None:
+            cutoff = clock - self.window
+            last_call, last_active = self._last_call, self._last_active
+            while last_call and next(iter(last_call.values())) <= cutoff:
+                number, _ = last_call.popitem(last=False)
+                self._candidates.discard(number)
+            while last_active and next(iter(last_active.values())) <= cutoff:
+                number, _ = last_active.popitem(last=False)
+                if number in last_call:
+                    self._candidates.add(number)
+        return clock
+
+    def process_call_record(
+        self, caller: str, receiver: str, timestamp: Optional[int] = None
+    ) -> None:
+        """
+        Process one call.
+
+        Args:
+            caller: Phone number making the call
+            receiver: Phone number receiving the call
+            timestamp: Epoch seconds of the call (None: the current clock)
+        """
+        now = self._advance(timestamp)
+        last_call, last_active = self._last_call, self._last_active
+        last_active[receiver] = now
+        last_call[caller] = now
+        if self.window is not None:
+            # Keep both dicts in recency order for expiry
+            last_active.move_to_end(receiver)
+            last_call.move_to_end(caller)
+        self._candidates.discard(receiver)
+        if caller not in last_active:
+            self._candidates.add(caller)
+
+    def process_text_record(
+        self, sender: str, receiver: str, timestamp: Optional[int] = None
+    ) -> None:
+        """
+        Process one text.
+
+        Args:
+            sender: Phone number sending the text
+            receiver: Phone number receiving the text
+            timestamp: Epoch seconds of the text (None: the current clock)
+        """
+        now = self._advance(timestamp)
+        last_active = self._last_active
+        last_active[sender] = now
+        last_active[receiver] = now
+        if self.window is not None:
+            last_active.move_to_end(sender)
+            last_active.move_to_end(receiver)
+        self._candidates.discard(sender)
+        self._candidates.discard(receiver)
+
+    def on_call(self, record: CallRecord) -> None:
+        """Pipeline hook: process one streamed call record."""
+        self.process_call_record(
+            record.caller,
+            record.receiver,
+            parse_timestamp(record.timestamp) if self.window is not None else None,
+        )
+
+    def on_text(self, record: TextRecord) -> None:
+        """Pipeline hook: process one streamed text record."""
+        self.process_text_record(
+            record.sender,
+            record.receiver,
+            parse_timestamp(record.timestamp) if self.window is not None else None,
+        )
+
+    def advance_to(self, timestamp: int) -> None:
+        """Expire activity as of ``timestamp`` without a new record."""
+        self._advance(timestamp)
+
+    def is_candidate(self, number: str) -> bool:
+        """Check whether ``number`` is currently a suspected telemarketer."""
+        return number in self._candidates
+
+    def get_potential_telemarketers(self) -> Set[str]:
+        """Current suspected telemarketers (a copy, O(k) for k candidates)."""
+        return set(self._candidates)
+
+    def tracked_numbers(self) -> int:
+        """Number of entries held in memory (bounded by the window)."""
+        return len(self._last_call) + len(self._last_active)
+
+
+def read_csv_file(
+    filepath: Path, columns: Optional[Sequence[str]] = None
+) -> List[List[str]]:
     """
     Read CSV file safely with proper error handling.
 
     Args:
-        filepath: Path to the CSV file
+        filepath: Path to the CSV file or call log archive
+        columns: Archive columns to decode (default: all); ignored for CSV
 
     Returns:
-        List of rows from the CSV file
+        List of rows from the CSV file, header row dropped
     """
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            reader = csv.reader(f)
-            return list(reader)
+        return list(iter_rows(filepath, columns))
     except FileNotFoundError:
         raise FileNotFoundError(f"CSV file not found: {filepath}")
     except Exception as e:
         raise Exception(f"Error reading CSV file {filepath}: {e}")
 
 
+def _detect_cached(
+    calls_path: Optional[Path], texts_path: Optional[Path], cache_dir: PathLike
+) -> Optional[Tuple[List[str], dict]]:
+    """
+    ``detect_telemarketers`` on ``columnar_cache`` number ids.
+
+    The caller/receiver sets are boolean masks over each cache's number
+    table, built a chunk of ids at a time; only the telemarketers are
+    turned back into strings.
+
+    Returns:
+        ``(sorted telemarketers, statistics)``, or None if a log can't be
+        cached (the caller then parses the CSV)
+    """
+    logs: List[Optional[CachedLog]] = []
+    try:
+        for path in (calls_path, texts_path):
+            log = None if path is None else try_open_cache(path, cache_dir)
+            if path is not None and log is None:
+                return None
+            logs.append(log)
+        calls, texts = logs
+
+        numbers = calls.numbers if calls is not None else []
+        empty = np.zeros(len(numbers), dtype=bool)
+        callers = calls.id_mask("caller") if calls is not None else empty
+        legitimate = calls.id_mask("receiver") if calls is not None else empty
+        receivers = int(np.count_nonzero(legitimate))
+        senders = text_receivers = outside = 0
+        if texts is not None:
+            sent, received = texts.id_mask("sender"), texts.id_mask("receiver")
+            senders = int(np.count_nonzero(sent))
+            text_receivers = int(np.count_nonzero(received))
+            # Map the texts' number table onto the calls' ids (-1: not called)
+            index = {number: i for i, number in enumerate(numbers)}
+            texting = np.array(
+                [index.get(number, -1) for number in texts.numbers], dtype=np.int64
+            )[sent | received]
+            legitimate = legitimate.copy()
+            legitimate[texting[texting >= 0]] = True
+            outside = int(np.count_nonzero(texting < 0))
+        suspects = np.flatnonzero(callers & ~legitimate).tolist()
+        statistics = _statistics(
+            int(np.count_nonzero(callers)),
+            receivers,
+            senders,
+            text_receivers,
+            int(np.count_nonzero(legitimate)) + outside,
+            len(suspects),
+        )
+        return sorted(numbers[i] for i in suspects), statistics
+    finally:
+        for log in logs:
+            if log is not None:
+                log.close()
+
+
 def detect_telemarketers(
-    calls_filepath: str = "calls.csv", texts_filepath: str = "texts.csv"
+    calls_filepath: str = "calls.csv",
+    texts_filepath: str = "texts.csv",
+    cache_dir: Optional[PathLike] = None,
 ) -> Tuple[List[str], dict]:
     """
     Main function to detect potential telemarketers.
@@ -127,15 +361,16 @@ def detect_telemarketers(
     Args:
         calls_filepath: Path to the calls CSV file
         texts_filepath: Path to the texts CSV file
+        cache_dir: Directory for ``columnar_cache`` files (default: none).
+            With it, each log is converted once and later runs work on the
+            memory-mapped number ids instead of parsing the CSV
 
     Returns:
         Tuple of (sorted_telemarketer_list, statistics)
     """
-    # Initialize detector
-    detector = TelemarketerDetector()
 
     # Try multiple possible locations for CSV files
-    def try_load_csv(filename: str) -> Optional[List[List[str]]]:
+    def find_csv(filename: str) -> Optional[Path]:
         possible_paths = [
             Path("sample_data") / filename,
             Path(filename),
@@ -143,51 +378,45 @@ def detect_telemarketers(
         ]
 
         for path in possible_paths:
-            try:
-                data = read_csv_file(path)
+            if path.is_file():
                 print(f"Successfully loaded {filename} from: {path}")
-                return data
-            except FileNotFoundError:
-                continue
+                return path
         return None
 
-    # Read and process call data
-    calls_data = try_load_csv(calls_filepath)
-
-    if calls_data:
-        # Skip header row if present
-        data_rows = (
-            calls_data[1:]
-            if calls_data and "calling number" in str(calls_data[0])
-            else calls_data
-        )
-        for record in data_rows:
-            if len(record) >= 2:  # Need at least caller and receiver
-                caller, receiver = record[0], record[1]
-                detector.process_call_record(caller, receiver)
-    else:
+    calls_path = find_csv(calls_filepath)
+    if calls_path is None:
         print(
             f"Warning: Could not process calls data: "
             f"CSV file not found: {calls_filepath}"
         )
+    texts_path = find_csv(texts_filepath)
+    if texts_path is None:
+        print(
+            f"Warning: Could not process texts data: "
+            f"CSV file not found: {texts_filepath}"
+        )
+
+    if cache_dir is not None:
+        cached = _detect_cached(calls_path, texts_path, cache_dir)
+        if cached is not None:
+            return cached
+
+    # Initialize detector
+    detector = TelemarketerDetector()
+
+    # Read and process call data
+    if calls_path is not None:
+        for record in iter_rows(calls_path, ("caller", "receiver")):
+            if len(record) >= 2:  # Need at least caller and receiver
+                caller, receiver = record[0], record[1]
+                detector.process_call_record(caller, receiver)
 
     # Read and process text data
-    texts_data = try_load_csv(texts_filepath)
-    if texts_data:        # Skip header row if present
-        data_rows = (
-            texts_data[1:]
-            if texts_data and "sending number" in str(texts_data[0])
-            else texts_data
-        )
-        for record in data_rows:
+    if texts_path is not None:
+        for record in iter_rows(texts_path, ("sender", "receiver")):
             if len(record) >= 2:  # Need at least sender and receiver
                 sender, receiver = record[0], record[1]
                 detector.process_text_record(sender, receiver)
-    else:
-        print(
-            f"Warning: Could not process texts data: "
-            f"CSV file not found: {texts_filepath}"
-        )
 
     # Get results
     potential_telemarketers = detector.get_potential_telemarketers()
@@ -233,6 +462,43 @@ def get_algorithm_complexity() -> str:
     """
 
 
+def benchmark_streaming_detection(
+    calls_path: Path, texts_path: Path, queries: int = 100
+) -> None:
+    """
+    Compare asking for the current telemarketers during a feed.
+
+    The batch detector recomputes its unions for every query; the streaming
+    detector keeps the answer up to date.
+
+    Args:
+        calls_path: Calls CSV or archive
+        texts_path: Texts CSV or archive
+        queries: How many times to ask during the calls feed
+    """
+    calls = list(iter_calls(calls_path))
+    texts = list(iter_texts(texts_path))
+    every = max(1, len(calls) // queries)
+    results = []
+    for detector in (TelemarketerDetector(), StreamingTelemarketerDetector()):
+        start = time.perf_counter()
+        for index, record in enumerate(calls, 1):
+            detector.on_call(record)
+            if index % every == 0:
+                detector.get_potential_telemarketers()
+        for record in texts:
+            detector.on_text(record)
+        suspects = detector.get_potential_telemarketers()
+        results.append((time.perf_counter() - start, suspects))
+    (batch_seconds, batch), (stream_seconds, stream) = results
+    assert batch == stream
+    print(
+        f"{len(calls)} calls, {len(texts)} texts, {len(calls) // every} queries | "
+        f"batch {batch_seconds * 1000:.1f} ms | "
+        f"streaming {stream_seconds * 1000:.1f} ms"
+    )
+
+
 def run_comprehensive_test() -> None:
     """Run comprehensive tests with sample data."""
     print("Testing TelemarketerDetector with sample data:")
@@ -284,5 +550,13 @@ if __name__ == "__main__":
         print("=" * 60)
         run_comprehensive_test()
 
+        print("\n" + "=" * 60)
+        print("STREAMING DETECTION BENCHMARK")
+        print("=" * 60)
+        sample_data = Path(__file__).resolve().parent.parent / "sample_data"
+        benchmark_streaming_detection(
+            sample_data / "calls.csv", sample_data / "texts.csv"
+        )
+
     except Exception as e:
         print(f"Error: {e}")
@@ -0,0 +1,554 @@
+"""
+Enhanced Union and Intersection of Linked Lists
+===============================================
+
+Set operations for the linked lists from
+``02 Show Me The Data Structures/single/problem_6.py`` with:
+- A tail pointer, so ``append`` is O(1) instead of a walk from ``head``
+  (building a result was O(n^2) in the original)
+- A cached length, so ``size()`` is O(1)
+- A sortedness flag maintained on append, so sorted inputs are detected
+  without a scan
+- ``union`` / ``intersection`` that pick a strategy per call:
+  - sorted merge when both lists are sorted (no hashing, sorted output)
+  - hashing otherwise; intersection hashes only the smaller list and
+    streams the larger one past it, which is also chosen for sorted lists
+    when one is ``HASH_SIZE_RATIO`` times smaller than the other
+  - ``auto`` falls back to hashing when the two lists are each sorted but
+    cannot be compared with each other (e.g. ints and strings)
+  - both also accept ``unrolled_linked_list.UnrolledLinkedList``
+- k-way multiset (count) ``multiset_union`` / ``multiset_intersection`` /
+  ``multiset_difference`` over any iterables, consumed lazily
+- Type hints and comprehensive documentation
+
+``union`` / ``intersection`` hold each distinct value once, as in the
+original. The multiset operations keep counts: union takes the maximum
+count, intersection the minimum and difference subtracts.
+
+Time Complexity: O(n + m) for both operations; O(total consumed) for k-way
+Space Complexity: O(n + m) for union, O(min(n, m)) extra for intersection
+(k-way intersection: O(distinct values of the smallest input))
+"""
+
+import random
+import time
+from collections import Counter
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Set,
+    Sized,
+    TypeVar,
+)
+
+from telecom_records import iter_rows
+
+STRATEGIES = ("auto", "hash", "merge")
+HASH_SIZE_RATIO = 16
+_MISSING = object()
+
+
+class SetOperand(Protocol):
+    """
+    What ``union`` / ``intersection`` need from a list type.
+
+    Implemented by ``LinkedList`` and ``unrolled_linked_list.UnrolledLinkedList``.
+    """
+
+    def __len__(self) -> int: ...
+
+    def __iter__(self) -> Iterator[Any]: ...
+
+    def is_sorted(self) -> bool: ...
+
+    def _link(self, values: Iterable[Any], keeps_sorted: bool) -> Any: ...
+
+    def _empty_like(self, other: Any) -> Any: ...
+
+
+ListT = TypeVar("ListT", bound=SetOperand)
+
+
+class Node:
+    """Singly linked list node."""
+
+    __slots__ = ("value", "next")
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+        self.next: Optional["Node"] = None
+
+    def __repr__(self) -> str:
+        return str(self.value)
+
+
+class LinkedList:
+    """Singly linked list with a tail pointer and cached length."""
+
+    def __init__(self, values: Iterable[Any] = ()) -> None:
+        """
+        Create a list, optionally filled from ``values``.
+
+        Args:
+            values: Initial values, appended in order
+        """
+        self.head: Optional[Node] = None
+        self.tail: Optional[Node] = None
+        self._length = 0
+        self._sorted = True
+        for value in values:
+            self.append(value)
+
+    def append(self, value: Any) -> None:
+        """Append ``value`` in O(1)."""
+        node = Node(value)
+        if self.tail is None:
+            self.head = node
+        else:
+            if self._sorted:
+                try:
+                    self._sorted = not value < self.tail.value
+                except TypeError:
+                    self._sorted = False
+            self.tail.next = node
+        self.tail = node
+        self._length += 1
+
+    def _link(self, values: Iterable[Any], keeps_sorted: bool) -> "LinkedList":
+        """
+        Append ``values`` without per-element comparisons.
+
+        Args:
+            values: Values to append
+            keeps_sorted: Whether the caller guarantees sorted order
+
+        Returns:
+            This list
+        """
+        tail = self.tail
+        count = 0
+        for value in values:
+            node = Node(value)
+            if tail is None:
+                self.head = node
+            else:
+                tail.next = node
+            tail = node
+            count += 1
+        self.tail = tail
+        self._length += count
+        self._sorted = self._sorted and keeps_sorted
+        return self
+
+    def _empty_like(self, other: Any) -> "LinkedList":
+        """Return an empty list to hold a set operation's result."""
+        return LinkedList()
+
+    def size(self) -> int:
+        """Return the number of elements in O(1)."""
+        return self._length
+
+    def is_sorted(self) -> bool:
+        """
+        Return True if the values are known to be in non-decreasing order.
+
+        Tracked on every ``append``; results of hash-based set operations
+        are conservatively marked unsorted.
+        """
+        return self._sorted
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Any]:
+        node = self.head
+        while node is not None:
+            yield node.value
+            node = node.next
+
+    def __str__(self) -> str:
+        return "".join(f"{value} -> " for value in self)
+
+
+def _resolve_strategy(
+    strategy: str, llist_1: ListT, llist_2: ListT, size_ratio: Optional[int] = None
+) -> str:
+    """
+    Pick ``merge`` for sorted inputs and ``hash`` otherwise.
+
+    With ``size_ratio``, ``auto`` also hashes when one list is at least
+    that many times smaller than the other.
+    """
+    lists = (llist_1, llist_2)
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy!r}; expected one of {STRATEGIES}")
+    if strategy == "auto":
+        if not all(lst.is_sorted() for lst in lists):
+            return "hash"
+        smaller, larger = sorted(map(len, lists))
+        if size_ratio is not None and smaller * size_ratio <= larger:
+            return "hash"
+        return "merge"
+    if strategy == "merge" and not all(lst.is_sorted() for lst in lists):
+        raise ValueError("The merge strategy requires sorted lists")
+    return strategy
+
+
+def _merge_union(llist_1: ListT, llist_2: ListT) -> Iterator[Any]:
+    """Yield the distinct values of two sorted lists in one merge pass."""
+    lefts, rights = iter(llist_1), iter(llist_2)
+    left, right = next(lefts, _MISSING), next(rights, _MISSING)
+    previous: Any = _MISSING
+    while left is not _MISSING or right is not _MISSING:
+        if right is _MISSING or (left is not _MISSING and left <= right):
+            value, left = left, next(lefts, _MISSING)
+        else:
+            value, right = right, next(rights, _MISSING)
+        if previous is _MISSING or value != previous:
+            previous = value
+            yield value
+
+
+def _merge_intersection(llist_1: ListT, llist_2: ListT) -> Iterator[Any]:
+    """Yield the distinct common values of two sorted lists in one pass."""
+    lefts, rights = iter(llist_1), iter(llist_2)
+    left, right = next(lefts, _MISSING), next(rights, _MISSING)
+    previous: Any = _MISSING
+    while left is not _MISSING and right is not _MISSING:
+        if left < right:
+            left = next(lefts, _MISSING)
+        elif right < left:
+            right = next(rights, _MISSING)
+        else:
+            if previous is _MISSING or left != previous:
+                previous = left
+                yield previous
+            left, right = next(lefts, _MISSING), next(rights, _MISSING)
+
+
+def _hash_union(llist_1: ListT, llist_2: ListT) -> Iterator[Any]:
+    """Yield the distinct values of both lists in first-seen order."""
+    seen: Set[Any] = set()
+    for source in (llist_1, llist_2):
+        for value in source:
+            if value not in seen:
+                seen.add(value)
+                yield value
+
+
+def _hash_intersection(llist_1: ListT, llist_2: ListT) -> Iterator[Any]:
+    """Hash the smaller list and stream the larger one past it."""
+    smaller, larger = sorted((llist_1, llist_2), key=len)
+    pending = set(smaller)
+    for value in larger:
+        if not pending:
+            return
+        if value in pending:
+            pending.discard(value)
+            yield value
+
+
+def union(llist_1: ListT, llist_2: ListT, strategy: str = "auto") -> ListT:
+    """
+    Return the distinct values found in either list.
+
+    Args:
+        llist_1: First list (``LinkedList`` or ``UnrolledLinkedList``)
+        llist_2: Second list
+        strategy: ``"auto"``, ``"hash"`` or ``"merge"`` (sorted inputs only)
+
+    Returns:
+        New list shaped like the first list; sorted for the merge strategy,
+        first-seen order otherwise
+
+    Raises:
+        ValueError: For an unknown strategy, or ``"merge"`` on unsorted input
+        TypeError: For ``"merge"`` on lists whose values cannot be compared
+    """
+    if _resolve_strategy(strategy, llist_1, llist_2) == "merge":
+        try:
+            return llist_1._empty_like(llist_2)._link(
+                _merge_union(llist_1, llist_2), keeps_sorted=True
+            )
+        except TypeError:
+            if strategy == "merge":
+                raise
+    return llist_1._empty_like(llist_2)._link(
+        _hash_union(llist_1, llist_2), keeps_sorted=False
+    )
+
+
+def intersection(llist_1: ListT, llist_2: ListT, strategy: str = "auto") -> ListT:
+    """
+    Return the distinct values found in both lists.
+
+    Args:
+        llist_1: First list (``LinkedList`` or ``UnrolledLinkedList``)
+        llist_2: Second list
+        strategy: ``"auto"``, ``"hash"`` or ``"merge"`` (sorted inputs only)
+
+    Returns:
+        New list shaped like the first list; sorted for the merge strategy,
+        otherwise in the order the values appear in the larger list (so
+        sorted too when the larger list is)
+
+    Raises:
+        ValueError: For an unknown strategy, or ``"merge"`` on unsorted input
+        TypeError: For ``"merge"`` on lists whose values cannot be compared
+    """
+    if _resolve_strategy(strategy, llist_1, llist_2, HASH_SIZE_RATIO) == "merge":
+        try:
+            return llist_1._empty_like(llist_2)._link(
+                _merge_intersection(llist_1, llist_2), keeps_sorted=True
+            )
+        except TypeError:
+            if strategy == "merge":
+                raise
+    larger = sorted((llist_1, llist_2), key=len)[1]
+    return llist_1._empty_like(llist_2)._link(
+        _hash_intersection(llist_1, llist_2), keeps_sorted=larger.is_sorted()
+    )
+
+
+def _smallest_first(iterables: Iterable[Iterable[Any]]) -> List[Iterable[Any]]:
+    """Order inputs by known length; inputs without ``len`` go last, in order."""
+    sized = [it for it in iterables if isinstance(it, Sized)]
+    unsized = [it for it in iterables if not isinstance(it, Sized)]
+    return sorted(sized, key=len) + unsized  # type: ignore[arg-type]
+
+
+def _count_capped(values: Iterable[Any], caps: Dict[Any, int]) -> Counter:
+    """
+    Count values of ``values`` that appear in ``caps``, up to each cap.
+
+    Stops consuming ``values`` as soon as every cap is reached.
+    """
+    counts: Counter = Counter()
+    unsaturated = len(caps)
+    for value in values:
+        cap = caps.get(value)
+        if cap is None or counts[value] >= cap:
+            continue
+        counts[value] += 1
+        if counts[value] == cap:
+            unsaturated -= 1
+            if not unsaturated:
+                break
+    return counts
+
+
+def multiset_union(*iterables: Iterable[Any]) -> Counter:
+    """
+    Multiset union: each value with its largest count in any input.
+
+    Args:
+        iterables: Inputs (consumed once, lazily)
+
+    Returns:
+        Counter of value -> count
+    """
+    result: Counter = Counter()
+    for values in iterables:
+        result |= Counter(values)
+    return result
+
+
+def multiset_intersection(*iterables: Iterable[Any]) -> Counter:
+    """
+    Multiset intersection: each value with its smallest count in all inputs.
+
+    Inputs with a known length are processed smallest-first; only the first
+    is counted in full, later ones are streamed against the partial result
+    and abandoned once every value's count is matched. As soon as the
+    partial result is empty the remaining inputs are not read at all.
+
+    Inputs should be finite. An endless input stops being read only once
+    it has yielded every value of the partial result as many times as its
+    count there; if it never does, the call never returns.
+
+    Args:
+        iterables: Inputs (consumed lazily; possibly not at all)
+
+    Returns:
+        Counter of value -> count (empty if there are no inputs)
+    """
+    ordered = _smallest_first(iterables)
+    if not ordered:
+        return Counter()
+    result = Counter(ordered[0])
+    for values in ordered[1:]:
+        if not result:
+            break
+        result &= _count_capped(values, result)
+    return result
+
+
+def multiset_difference(first: Iterable[Any], *others: Iterable[Any]) -> Counter:
+    """
+    Multiset difference: counts of ``first`` minus the counts in ``others``.
+
+    Args:
+        first: Input to subtract from (counted in full)
+        others: Finite inputs to subtract (streamed; skipped once nothing is
+            left)
+
+    Returns:
+        Counter of value -> remaining positive count
+    """
+    result = Counter(first)
+    for values in others:
+        if not result:
+            break
+        result -= _count_capped(values, result)
+    return result
+
+
+def calls_column(calls_csv: Path, column: int) -> Iterator[str]:
+    """
+    Lazily stream one column of a calls CSV or archive, skipping the header.
+
+    Args:
+        calls_csv: Path to a calls CSV (or call log archive)
+        column: 0 for calling numbers, 1 for receiving numbers
+
+    Yields:
+        Phone numbers, one per call (repeated numbers repeat)
+    """
+    for row in iter_rows(calls_csv):
+        # Truncated rows (no timestamp field) are skipped
+        if len(row) > max(column, 2):
+            yield row[column]
+
+
+def demonstrate_union_intersection() -> None:
+    """Demonstrate the set operations with the original test cases."""
+    cases = [
+        ([3, 2, 4, 35, 6, 65, 6, 4, 3, 21], [6, 32, 4, 9, 6, 1, 11, 21, 1]),
+        ([3, 2, 4, 35, 6, 65, 6, 4, 3, 23], [1, 7, 8, 9, 11, 21, 1]),
+        ([], []),
+        ([1, 2, 3, 4], [1, 2, 3, 4]),
+        ([17], [17]),
+    ]
+    for number, (values_1, values_2) in enumerate(cases, 1):
+        llist_1, llist_2 = LinkedList(values_1), LinkedList(values_2)
+        print(f"Test case {number}:")
+        print(f"  union:        {union(llist_1, llist_2)}")
+        print(f"  intersection: {intersection(llist_1, llist_2)}")
+
+    print("\nMultiset operations:")
+    print("  union:       ", dict(multiset_union("aab", "abbc")))
+    print("  intersection:", dict(multiset_intersection("aab", "abbc", "bbb")))
+    print("  difference:  ", dict(multiset_difference("aabbc", "ab")))
+
+    calls_csv = Path(__file__).resolve().parent.parent / "sample_data" / "calls.csv"
+    if calls_csv.exists():
+        only_calling = multiset_difference(
+            calls_column(calls_csv, 0), calls_column(calls_csv, 1)
+        )
+        both = multiset_intersection(
+            calls_column(calls_csv, 0), calls_column(calls_csv, 1)
+        )
+        print(
+            f"  calls.csv: {len(only_calling)} numbers only call, "
+            f"{len(both)} both call and receive"
+        )
+
+
+def _append_by_walking(llist: LinkedList, value: Any) -> None:
+    """Append like the original: walk from ``head`` to the last node."""
+    node = Node(value)
+    if llist.head is None:
+        llist.head = node
+        return
+    current = llist.head
+    while current.next is not None:
+        current = current.next
+    current.next = node
+
+
+def benchmark_set_operations(size: int = 1_000_000, walking_size: int = 3000) -> None:
+    """
+    Time the hash and merge strategies, and the original walking append.
+
+    Args:
+        size: Elements per input list
+        walking_size: Result size for the O(n^2) walking-append baseline
+    """
+    values = list(range(0, 2 * size, 2))
+    others = list(range(0, 3 * size, 3))
+    sorted_1, sorted_2 = LinkedList(values), LinkedList(others)
+    random.shuffle(values)
+    random.shuffle(others)
+    shuffled_1, shuffled_2 = LinkedList(values), LinkedList(others)
+
+    print(f"{size} elements per list:")
+    for label, (llist_1, llist_2) in (
+        ("merge (sorted)", (sorted_1, sorted_2)),
+        ("hash (shuffled)", (shuffled_1, shuffled_2)),
+    ):
+        for operation in (union, intersection):
+            start = time.perf_counter()
+            result = operation(llist_1, llist_2)
+            seconds = time.perf_counter() - start
+            print(
+                f"  {label:>16} {operation.__name__:>12}: {seconds:6.3f}s "
+                f"({len(result)} results)"
+            )
+
+    start = time.perf_counter()
+    walked = LinkedList()
+    for value in range(walking_size):
+        _append_by_walking(walked, value)
+    walking_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    LinkedList(range(walking_size))
+    tail_seconds = time.perf_counter() - start
+    print(
+        f"  building {walking_size} results: walking append {walking_seconds:.3f}s "
+        f"vs tail append {tail_seconds:.4f}s"
+    )
+
+
+def benchmark_k_way(streams: int = 8, size: int = 200_000) -> None:
+    """
+    Time k-way intersection with and without an early empty result.
+
+    Args:
+        streams: Number of input streams
+        size: Values per stream
+    """
+
+    def stream(seed: int) -> Iterator[int]:
+        rng = random.Random(seed)
+        return (rng.randrange(size // 4) for _ in range(size))
+
+    start = time.perf_counter()
+    common = multiset_intersection(*(stream(seed) for seed in range(streams)))
+    full_seconds = time.perf_counter() - start
+
+    disjoint = [range(size, 2 * size)] + [stream(seed) for seed in range(streams)]
+    small = [range(10)] + disjoint
+    start = time.perf_counter()
+    empty = multiset_intersection(*small)
+    early_seconds = time.perf_counter() - start
+    print(
+        f"{streams} streams x {size} values: intersection {full_seconds:.2f}s "
+        f"({sum(common.values())} values) | with a 10-value disjoint input "
+        f"{early_seconds * 1000:.1f} ms ({len(empty)} values)"
+    )
+
+
+if __name__ == "__main__":
+    demonstrate_union_intersection()
+
+    print("\n" + "=" * 60)
+    print("SET OPERATION BENCHMARK")
+    print("=" * 60)
+    benchmark_set_operations()
+    benchmark_k_way()
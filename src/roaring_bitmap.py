@@ -0,0 +1,180 @@
+"""
+Roaring Bitmap Implementation
+=============================
+
+A compressed set of non-negative 32-bit integers in the style of Roaring
+bitmaps. Values are split by their high 16 bits into containers that each
+hold up to 65536 low-16-bit values:
+- Sparse containers (at most 4096 values) are sorted ``array('H')``,
+  2 bytes per value
+- Dense containers are a 65536-bit Python ``int`` (8 KiB), so a full
+  container costs 1 bit per value
+
+Unions combine containers pairwise with merges or bitwise OR.
+
+Time Complexity: O(log c) membership, O(c) union for c values per container
+Space Complexity: min(2 bytes per value, 8 KiB per container) per container
+"""
+
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, Union
+
+Container = Union["array[int]", int]
+
+ARRAY_LIMIT = 4096
+CONTAINER_BITS = 1 << 16
+
+
+def _popcount(value: int) -> int:
+    """Number of set bits in ``value``."""
+    return bin(value).count("1")
+
+
+def _array_to_bitmap(values: Iterable[int]) -> int:
+    """Pack low-16-bit values into a 65536-bit integer."""
+    buffer = bytearray(CONTAINER_BITS // 8)
+    for value in values:
+        buffer[value >> 3] |= 1 << (value & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _bitmap_to_array(bitmap: int) -> "array[int]":
+    """Unpack a 65536-bit integer into a sorted ``array('H')``."""
+    values = array("H")
+    data = bitmap.to_bytes(CONTAINER_BITS // 8, "little")
+    for byte_index, byte in enumerate(data):
+        while byte:
+            lowest = byte & -byte
+            values.append(byte_index * 8 + lowest.bit_length() - 1)
+            byte ^= lowest
+    return values
+
+
+class RoaringBitmap:
+    """Compressed bitmap over non-negative 32-bit integers."""
+
+    __slots__ = ("_containers", "_counts")
+
+    def __init__(self, values: Iterable[int] = ()) -> None:
+        """
+        Create a bitmap, optionally from an iterable of values.
+
+        Args:
+            values: Initial values (need not be sorted or unique)
+        """
+        self._containers: Dict[int, Container] = {}
+        self._counts: Dict[int, int] = {}
+        buckets: Dict[int, set] = {}
+        for value in values:
+            if value < 0 or value >> 32:
+                raise ValueError(f"Value out of range for a 32-bit bitmap: {value}")
+            buckets.setdefault(value >> 16, set()).add(value & 0xFFFF)
+        for high, lows in buckets.items():
+            self._store(high, lows)
+
+    def _store(self, high: int, lows: Iterable[int]) -> None:
+        """Store a container, choosing the array or bitmap representation."""
+        ordered = sorted(lows)
+        if not ordered:
+            self._containers.pop(high, None)
+            self._counts.pop(high, None)
+            return
+        if len(ordered) > ARRAY_LIMIT:
+            self._containers[high] = _array_to_bitmap(ordered)
+        else:
+            self._containers[high] = array("H", ordered)
+        self._counts[high] = len(ordered)
+
+    def add(self, value: int) -> None:
+        """Insert ``value``."""
+        if value < 0 or value >> 32:
+            raise ValueError(f"Value out of range for a 32-bit bitmap: {value}")
+        high, low = value >> 16, value & 0xFFFF
+        container = self._containers.get(high)
+        if container is None:
+            self._containers[high] = array("H", [low])
+            self._counts[high] = 1
+        elif isinstance(container, int):
+            if not (container >> low) & 1:
+                self._containers[high] = container | (1 << low)
+                self._counts[high] += 1
+        else:
+            position = bisect_left(container, low)
+            if position < len(container) and container[position] == low:
+                return
+            container.insert(position, low)
+            self._counts[high] += 1
+            if len(container) > ARRAY_LIMIT:
+                self._containers[high] = _array_to_bitmap(container)
+
+    def __contains__(self, value: object) -> bool:
+        if not isinstance(value, int) or value < 0:
+            return False
+        container = self._containers.get(value >> 16)
+        if container is None:
+            return False
+        low = value & 0xFFFF
+        if isinstance(container, int):
+            return bool((container >> low) & 1)
+        position = bisect_left(container, low)
+        return position < len(container) and container[position] == low
+
+    def __ior__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        for high, theirs in other._containers.items():
+            mine = self._containers.get(high)
+            if mine is None:
+                self._containers[high] = (
+                    theirs if isinstance(theirs, int) else array("H", theirs)
+                )
+                self._counts[high] = other._counts[high]
+            elif isinstance(mine, int) or isinstance(theirs, int):
+                left = mine if isinstance(mine, int) else _array_to_bitmap(mine)
+                right = theirs if isinstance(theirs, int) else _array_to_bitmap(theirs)
+                merged = left | right
+                self._containers[high] = merged
+                self._counts[high] = _popcount(merged)
+            else:
+                self._store(high, set(mine).union(theirs))
+        return self
+
+    def __or__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        result = self.copy()
+        result |= other
+        return result
+
+    def copy(self) -> "RoaringBitmap":
+        """Return an independent copy."""
+        clone = RoaringBitmap()
+        for high, container in self._containers.items():
+            clone._containers[high] = (
+                container if isinstance(container, int) else array("H", container)
+            )
+        clone._counts = dict(self._counts)
+        return clone
+
+    def __len__(self) -> int:
+        return sum(self._counts.values())
+
+    def __iter__(self) -> Iterator[int]:
+        for high in sorted(self._containers):
+            container = self._containers[high]
+            lows = (
+                _bitmap_to_array(container) if isinstance(container, int) else container
+            )
+            base = high << 16
+            for low in lows:
+                yield base + low
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RoaringBitmap):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the container objects (``sys.getsizeof``)."""
+        return sum(sys.getsizeof(c) for c in self._containers.values())
+
+    def __repr__(self) -> str:
+        return f"RoaringBitmap({len(self)} values, {len(self._containers)} containers)"
@@ -0,0 +1,286 @@
+"""
+Single-Pass Telecom Analysis Pipeline
+=====================================
+
+Runs every Task 0-4 analysis over one scan of ``calls.csv`` and
+``texts.csv`` instead of re-reading and re-parsing them once per task:
+- Analyzers register as consumers; a consumer with an ``on_call`` hook
+  receives every ``CallRecord`` and one with ``on_text`` every
+  ``TextRecord`` (``telecom_records`` types)
+- ``PhoneNumberAnalyzer`` (Task 3), ``TelemarketerDetector`` (Task 4) and
+  ``CallDurationAggregator`` (Task 2) plug in directly; the Task 0/1
+  answers come from ``FirstLastRecords`` and ``UniqueNumberCounter``
+- ``full_report`` wires all five and returns their answers
+
+Time Complexity: O(c + t) for c calls and t texts, times the number of
+consumers, with each file read and parsed once
+Space Complexity: whatever the registered consumers keep
+"""
+
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Set,
+    TypeVar,
+    Union,
+)
+
+from enhanced_task2 import CallDurationAggregator
+from enhanced_task3 import PhoneNumberAnalyzer
+from enhanced_task4 import TelemarketerDetector
+from telecom_records import CallRecord, TextRecord, iter_calls, iter_texts
+
+PathLike = Union[str, Path]
+
+
+class CallConsumer(Protocol):
+    """Pipeline consumer of call records."""
+
+    def on_call(self, record: CallRecord) -> None:
+        """Called once per call record, in file order."""
+
+
+class TextConsumer(Protocol):
+    """Pipeline consumer of text records."""
+
+    def on_text(self, record: TextRecord) -> None:
+        """Called once per text record, in file order."""
+
+
+Consumer = Union[CallConsumer, TextConsumer]
+ConsumerT = TypeVar("ConsumerT", bound=Consumer)
+
+
+class UniqueNumberCounter:
+    """Distinct telephone numbers across calls and texts (Task 1)."""
+
+    def __init__(self) -> None:
+        self.numbers: Set[str] = set()
+
+    def on_call(self, record: CallRecord) -> None:
+        """Record both parties of a call."""
+        self.numbers.add(record.caller)
+        self.numbers.add(record.receiver)
+
+    def on_text(self, record: TextRecord) -> None:
+        """Record both parties of a text."""
+        self.numbers.add(record.sender)
+        self.numbers.add(record.receiver)
+
+    def count(self) -> int:
+        """Number of distinct telephone numbers seen."""
+        return len(self.numbers)
+
+
+class FirstLastRecords:
+    """First and last call and text records (Task 0), in O(1) memory."""
+
+    def __init__(self) -> None:
+        self.first_call: Optional[CallRecord] = None
+        self.last_call: Optional[CallRecord] = None
+        self.first_text: Optional[TextRecord] = None
+        self.last_text: Optional[TextRecord] = None
+
+    def on_call(self, record: CallRecord) -> None:
+        """Keep the call if it is the first; always as the latest."""
+        if self.first_call is None:
+            self.first_call = record
+        self.last_call = record
+
+    def on_text(self, record: TextRecord) -> None:
+        """Keep the text if it is the first; always as the latest."""
+        if self.first_text is None:
+            self.first_text = record
+        self.last_text = record
+
+
+class RecordPipeline:
+    """Fan streamed call and text records out to registered consumers."""
+
+    def __init__(self, *consumers: Consumer) -> None:
+        """
+        Create a pipeline.
+
+        Args:
+            consumers: Objects with an ``on_call`` and/or ``on_text`` hook
+        """
+        self._call_hooks: List[Callable[[CallRecord], None]] = []
+        self._text_hooks: List[Callable[[TextRecord], None]] = []
+        for consumer in consumers:
+            self.register(consumer)
+
+    def register(self, consumer: ConsumerT) -> ConsumerT:
+        """
+        Add a consumer; returns it, so it can be created inline.
+
+        Raises:
+            TypeError: If ``consumer`` has neither hook
+        """
+        on_call = getattr(consumer, "on_call", None)
+        on_text = getattr(consumer, "on_text", None)
+        if on_call is None and on_text is None:
+            raise TypeError(f"{consumer!r} has no on_call or on_text hook")
+        if on_call is not None:
+            self._call_hooks.append(on_call)
+        if on_text is not None:
+            self._text_hooks.append(on_text)
+        return consumer
+
+    def feed(
+        self,
+        calls: Iterable[CallRecord] = (),
+        texts: Iterable[TextRecord] = (),
+    ) -> None:
+        """
+        Pass every record to the consumers, calls first, then texts.
+
+        Args:
+            calls: Call records (consumed once)
+            texts: Text records (consumed once)
+        """
+        call_hooks = self._call_hooks
+        for call in calls if call_hooks else ():
+            for hook in call_hooks:
+                hook(call)
+        text_hooks = self._text_hooks
+        for text in texts if text_hooks else ():
+            for hook in text_hooks:
+                hook(text)
+
+    def run(
+        self,
+        calls_path: Optional[PathLike] = None,
+        texts_path: Optional[PathLike] = None,
+    ) -> None:
+        """
+        Stream the given files through the consumers, each file read once.
+
+        Args:
+            calls_path: Calls CSV or archive (skipped if None)
+            texts_path: Texts CSV or archive (skipped if None)
+        """
+        self.feed(
+            iter_calls(calls_path) if calls_path is not None else (),
+            iter_texts(texts_path) if texts_path is not None else (),
+        )
+
+
+def full_report(
+    calls_path: PathLike, texts_path: PathLike, year: int = 2016, month: int = 9
+) -> Dict[str, Any]:
+    """
+    Answer Tasks 0-4 with one pass over each file.
+
+    Args:
+        calls_path: Calls CSV or archive
+        texts_path: Texts CSV or archive
+        year: Year for the Task 2 duration totals
+        month: Month for the Task 2 duration totals
+
+    Returns:
+        ``first_text``, ``last_call``, ``unique_numbers``,
+        ``period``, ``longest_caller``, ``bangalore_codes``,
+        ``bangalore_percentage`` and ``telemarketers``
+    """
+    first_last = FirstLastRecords()
+    unique = UniqueNumberCounter()
+    durations = CallDurationAggregator(year, month)
+    bangalore = PhoneNumberAnalyzer()
+    telemarketers = TelemarketerDetector()
+    RecordPipeline(first_last, unique, durations, bangalore, telemarketers).run(
+        calls_path, texts_path
+    )
+    return {
+        "first_text": first_last.first_text,
+        "last_call": first_last.last_call,
+        "unique_numbers": unique.count(),
+        "period": datetime(year, month, 1).strftime("%B %Y"),
+        "longest_caller": durations.longest_caller(),
+        "bangalore_codes": bangalore.get_called_codes_sorted(),
+        "bangalore_percentage": bangalore.get_bangalore_call_percentage(),
+        "telemarketers": sorted(telemarketers.get_potential_telemarketers()),
+    }
+
+
+def print_full_report(report: Dict[str, Any]) -> None:
+    """Print a ``full_report`` result in the Task 0-4 message formats."""
+    text, call = report["first_text"], report["last_call"]
+    if text is not None:
+        print(
+            f"First record of texts, {text.sender} texts {text.receiver} "
+            f"at time {text.timestamp}"
+        )
+    if call is not None:
+        print(
+            f"Last record of calls, {call.caller} calls {call.receiver} at time "
+            f"{call.timestamp}, lasting {call.duration} seconds"
+        )
+    print(
+        f"There are {report['unique_numbers']} different telephone numbers "
+        f"in the records."
+    )
+    if report["longest_caller"] is not None:
+        number, seconds = report["longest_caller"]
+        print(
+            f"{number} spent the longest time, {seconds} seconds, on the phone "
+            f"during {report['period']}."
+        )
+    print("The numbers called by people in Bangalore have codes:")
+    for code in report["bangalore_codes"]:
+        print(code)
+    print(
+        f"{report['bangalore_percentage']:.2f} percent of calls from fixed lines "
+        f"in Bangalore are calls to other fixed lines in Bangalore."
+    )
+    print("These numbers could be telemarketers: ")
+    for number in report["telemarketers"]:
+        print(number)
+
+
+def benchmark_pipeline(calls_path: PathLike, texts_path: PathLike) -> None:
+    """
+    Compare one shared scan with one scan per analysis.
+
+    Args:
+        calls_path: Calls CSV or archive
+        texts_path: Texts CSV or archive
+    """
+    factories = [
+        FirstLastRecords,
+        UniqueNumberCounter,
+        CallDurationAggregator,
+        PhoneNumberAnalyzer,
+        TelemarketerDetector,
+    ]
+    start = time.perf_counter()
+    for factory in factories:
+        RecordPipeline(factory()).run(calls_path, texts_path)
+    separate_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    RecordPipeline(*(factory() for factory in factories)).run(calls_path, texts_path)
+    shared_seconds = time.perf_counter() - start
+    print(
+        f"{len(factories)} analyses: separate scans {separate_seconds:.2f}s | "
+        f"one shared scan {shared_seconds:.2f}s "
+        f"({separate_seconds / shared_seconds:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    sample_data = Path(__file__).resolve().parent.parent / "sample_data"
+    calls_csv, texts_csv = sample_data / "calls.csv", sample_data / "texts.csv"
+    print_full_report(full_report(calls_csv, texts_csv))
+
+    print("\n" + "=" * 60)
+    print("PIPELINE BENCHMARK")
+    print("=" * 60)
+    benchmark_pipeline(calls_csv, texts_csv)
@@ -0,0 +1,144 @@
+"""
+Streaming Telecom Record Reader
+===============================
+
+One reader for the ``calls.csv`` / ``texts.csv`` datasets, shared by the
+Task 0-4 scripts and the ``enhanced_task2``-``4`` analyses:
+- Rows are streamed from the file one at a time, so memory stays constant
+  however large the log is (``list(csv.reader(f))`` held all of it)
+- A header row is detected once, on the first row only
+- ``iter_calls`` / ``iter_texts`` yield typed ``CallRecord`` /
+  ``TextRecord`` tuples (durations as ``int``)
+- Call log archives (``call_log_archive``) are read transparently; the
+  archive module builds on this one (it converts CSV read here), so it is
+  imported by ``iter_rows`` rather than at import time
+- Files are opened when a reader is created, so a missing file raises
+  ``FileNotFoundError`` immediately rather than on first iteration
+
+Time Complexity: O(n) for n records, in a single pass
+Space Complexity: O(1) for CSV input (archives decode whole columns)
+"""
+
+import csv
+from pathlib import Path
+from typing import IO, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+PathLike = Union[str, Path]
+
+# First field of a calls/texts header row
+HEADER_MARKERS = ("calling number", "sending number")
+
+
+class CallRecord(NamedTuple):
+    """One row of ``calls.csv``."""
+
+    caller: str
+    receiver: str
+    timestamp: str
+    duration: int
+
+
+class TextRecord(NamedTuple):
+    """One row of ``texts.csv``."""
+
+    sender: str
+    receiver: str
+    timestamp: str
+
+
+def is_header(row: Sequence[str]) -> bool:
+    """Return True if ``row`` is a calls/texts header row."""
+    return bool(row) and row[0] in HEADER_MARKERS
+
+
+def skip_header(rows: Iterable[Sequence[str]]) -> Iterator[Sequence[str]]:
+    """
+    Yield ``rows`` without a leading header row.
+
+    Only the first row is inspected; later rows are passed through as is.
+    """
+    iterator = iter(rows)
+    for row in iterator:
+        if not is_header(row):
+            yield row
+        break
+    yield from iterator
+
+
+def _stream_csv(f: IO[str]) -> Iterator[List[str]]:
+    """Yield the rows of an open CSV file, closing it when done."""
+    with f:
+        yield from skip_header(csv.reader(f))  # type: ignore[misc]
+
+
+def iter_rows(
+    path: PathLike, columns: Optional[Sequence[str]] = None
+) -> Iterator[List[str]]:
+    """
+    Stream the records of a calls/texts CSV or archive as lists of strings.
+
+    Args:
+        path: CSV file (header row optional) or call log archive
+        columns: Archive columns to decode (default: all); ignored for CSV
+
+    Returns:
+        Iterator over the records, header excluded
+
+    Raises:
+        FileNotFoundError: If ``path`` does not exist
+    """
+    from call_log_archive import CallLogArchive, is_archive
+
+    if is_archive(path):
+        return CallLogArchive(path).iter_rows(columns)
+    return _stream_csv(open(path, "r", encoding="utf-8", newline=""))
+
+
+def _typed(
+    rows: Iterator[List[str]], path: PathLike, width: int
+) -> Iterator[List[str]]:
+    """Check that every row has ``width`` fields."""
+    for number, row in enumerate(rows, 1):
+        if len(row) != width:
+            raise ValueError(
+                f"{path}: record {number} has {len(row)} fields, expected {width}"
+            )
+        yield row
+
+
+def iter_calls(path: PathLike) -> Iterator[CallRecord]:
+    """
+    Stream the records of a calls CSV or archive.
+
+    Args:
+        path: Calls file
+
+    Returns:
+        Iterator of ``CallRecord`` (a malformed row raises ``ValueError``
+        when it is reached)
+
+    Raises:
+        FileNotFoundError: If ``path`` does not exist
+    """
+    rows = _typed(iter_rows(path), path, 4)
+    return (
+        CallRecord(caller, receiver, timestamp, int(duration))
+        for caller, receiver, timestamp, duration in rows
+    )
+
+
+def iter_texts(path: PathLike) -> Iterator[TextRecord]:
+    """
+    Stream the records of a texts CSV or archive.
+
+    Args:
+        path: Texts file
+
+    Returns:
+        Iterator of ``TextRecord`` (a malformed row raises ``ValueError``
+        when it is reached)
+
+    Raises:
+        FileNotFoundError: If ``path`` does not exist
+    """
+    return (TextRecord(*row) for row in _typed(iter_rows(path), path, 3))
@@ -0,0 +1,320 @@
+"""
+Unrolled Linked List
+====================
+
+A drop-in alternative to the one-node-per-element ``LinkedList`` of
+``enhanced_union_intersection``:
+- Each node holds a fixed-capacity chunk of values (a ``list``, or an
+  ``array`` when a typecode is given), so a million elements need a few
+  thousand nodes instead of a million
+- Iteration chains the chunks at C level (``itertools.chain``) instead of
+  chasing a pointer per element
+- O(1) ``append`` through a tail pointer and cached length; bulk ``extend``
+  fills whole chunks at a time
+- Sortedness is tracked as in ``LinkedList``, so ``union`` and
+  ``intersection`` pick the merge strategy for sorted lists
+
+Time Complexity: O(1) append, O(n) iteration
+Space Complexity: O(n / capacity) nodes plus the chunk storage
+"""
+
+import sys
+import time
+import tracemalloc
+from array import array
+from itertools import chain, islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from enhanced_union_intersection import LinkedList, intersection, union
+
+CHUNK_CAPACITY = 256
+_MISSING = object()
+
+
+class Chunk:
+    """Unrolled list node: up to ``capacity`` values and a next pointer."""
+
+    __slots__ = ("values", "next")
+
+    def __init__(self, values: Any) -> None:
+        self.values = values
+        self.next: Optional["Chunk"] = None
+
+
+class UnrolledLinkedList:
+    """Singly linked list of fixed-capacity chunks."""
+
+    def __init__(
+        self,
+        values: Iterable[Any] = (),
+        capacity: int = CHUNK_CAPACITY,
+        typecode: Optional[str] = None,
+    ) -> None:
+        """
+        Create a list, optionally filled from ``values``.
+
+        Args:
+            values: Initial values, appended in order
+            capacity: Values per chunk
+            typecode: ``array`` typecode for compact numeric chunks; None
+                stores any objects in ``list`` chunks
+
+        Raises:
+            ValueError: If ``capacity`` is not positive
+        """
+        if capacity < 1:
+            raise ValueError(f"Chunk capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self.typecode = typecode
+        self.head: Optional[Chunk] = None
+        self.tail: Optional[Chunk] = None
+        self._length = 0
+        self._sorted = True
+        self.extend(values)
+
+    def _new_chunk(self) -> Chunk:
+        """Link a new, empty tail chunk."""
+        chunk = Chunk([] if self.typecode is None else array(self.typecode))
+        if self.tail is None:
+            self.head = chunk
+        else:
+            self.tail.next = chunk
+        self.tail = chunk
+        return chunk
+
+    def append(self, value: Any) -> None:
+        """Append ``value`` in O(1)."""
+        tail = self.tail
+        if tail is not None and self._sorted:
+            self._sorted = self._in_order(tail.values[-1], value)
+        if tail is None or len(tail.values) >= self.capacity:
+            tail = self._new_chunk()
+        tail.values.append(value)
+        self._length += 1
+
+    @staticmethod
+    def _in_order(previous: Any, value: Any) -> bool:
+        """Return True if ``value`` may follow ``previous`` in sorted order."""
+        try:
+            return not value < previous
+        except TypeError:
+            return False
+
+    def extend(
+        self, values: Iterable[Any], keeps_sorted: Optional[bool] = None
+    ) -> None:
+        """
+        Append ``values`` a chunk at a time.
+
+        Args:
+            values: Values to append
+            keeps_sorted: Whether the caller guarantees sorted order; None
+                checks each chunk (one C-level ``sorted`` per chunk)
+        """
+        iterator = iter(values)
+        tail = self.tail
+        previous: Any = _MISSING
+        if tail is not None:
+            previous = tail.values[-1]
+            room = self.capacity - len(tail.values)
+            if room:
+                self._fill(tail, list(islice(iterator, room)), previous, keeps_sorted)
+                previous = tail.values[-1]
+        while True:
+            block = list(islice(iterator, self.capacity))
+            if not block:
+                break
+            chunk = self._new_chunk()
+            self._fill(chunk, block, previous, keeps_sorted)
+            previous = block[-1]
+
+    def _fill(
+        self,
+        chunk: Chunk,
+        block: List[Any],
+        previous: Any,
+        keeps_sorted: Optional[bool],
+    ) -> None:
+        """Copy ``block`` into ``chunk`` and update length and sortedness."""
+        if not block:
+            return
+        chunk.values.extend(block)
+        self._length += len(block)
+        if not self._sorted:
+            return
+        if keeps_sorted is not None:
+            self._sorted = keeps_sorted
+            return
+        try:
+            in_order = sorted(block) == block
+        except TypeError:
+            in_order = False
+        if in_order and previous is not _MISSING:
+            in_order = self._in_order(previous, block[0])
+        self._sorted = in_order
+
+    def _link(self, values: Iterable[Any], keeps_sorted: bool) -> "UnrolledLinkedList":
+        """
+        Append ``values`` without per-element comparisons.
+
+        Args:
+            values: Values to append
+            keeps_sorted: Whether the caller guarantees sorted order
+
+        Returns:
+            This list
+        """
+        self.extend(values, keeps_sorted=self._sorted and keeps_sorted)
+        return self
+
+    def _empty_like(self, other: Any) -> "UnrolledLinkedList":
+        """
+        Return an empty list to hold a set operation's result.
+
+        Keeps this list's capacity, and its typecode when ``other`` uses the
+        same one (mixed inputs fall back to ``list`` chunks).
+        """
+        typecode = self.typecode
+        if getattr(other, "typecode", None) != typecode:
+            typecode = None
+        return UnrolledLinkedList(capacity=self.capacity, typecode=typecode)
+
+    def size(self) -> int:
+        """Return the number of elements in O(1)."""
+        return self._length
+
+    def is_sorted(self) -> bool:
+        """
+        Return True if the values are known to be in non-decreasing order.
+
+        Tracked on every ``append``; results of hash-based set operations
+        are conservatively marked unsorted.
+        """
+        return self._sorted
+
+    def chunk_count(self) -> int:
+        """Return the number of chunks (nodes) in the list."""
+        return sum(1 for _ in self.chunks())
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the chunks and their containers (``sys.getsizeof``)."""
+        node_size = sys.getsizeof(Chunk(None))
+        return sum(node_size + sys.getsizeof(values) for values in self.chunks())
+
+    def __len__(self) -> int:
+        return self._length
+
+    def chunks(self) -> Iterator[Any]:
+        """Yield each chunk's value container in order."""
+        chunk = self.head
+        while chunk is not None:
+            yield chunk.values
+            chunk = chunk.next
+
+    def __iter__(self) -> Iterator[Any]:
+        return chain.from_iterable(self.chunks())
+
+    def __str__(self) -> str:
+        return "".join(f"{value} -> " for value in self)
+
+
+def _traced_build(build: Callable[[], Any]) -> Tuple[Any, int]:
+    """Build a structure and return it with the bytes allocated while building."""
+    tracemalloc.start()
+    try:
+        built = build()
+        return built, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_unrolled_list(
+    sizes: Sequence[int] = (10**5, 10**6, 10**7),
+) -> List[Dict[str, float]]:
+    """
+    Compare the ``Node`` chain with unrolled list and array chunks.
+
+    Memory is everything allocated while building (nodes, containers and
+    the int objects they reference), measured with ``tracemalloc``.
+
+    Args:
+        sizes: Element counts to build
+
+    Returns:
+        One row per (size, structure) with build/iterate/str seconds
+        and bytes per element
+    """
+    structures: Dict[str, Callable[[range], Any]] = {
+        "Node chain": LinkedList,
+        "list chunks": UnrolledLinkedList,
+        "array chunks": lambda values: UnrolledLinkedList(values, typecode="q"),
+    }
+    rows: List[Dict[str, Any]] = []
+    for size in sizes:
+        values = range(size)
+        for name, factory in structures.items():
+            start = time.perf_counter()
+            factory(values)
+            build_seconds = time.perf_counter() - start
+            built, allocated = _traced_build(lambda: factory(values))
+            start = time.perf_counter()
+            for _ in built:
+                pass
+            iterate_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            str(built)
+            str_seconds = time.perf_counter() - start
+            rows.append(
+                {
+                    "size": size,
+                    "structure": name,
+                    "build_seconds": build_seconds,
+                    "iterate_seconds": iterate_seconds,
+                    "str_seconds": str_seconds,
+                    "bytes_per_element": allocated / size,
+                }
+            )
+            del built
+    return rows
+
+
+def demonstrate_unrolled_list() -> None:
+    """Run the original union/intersection cases on unrolled lists."""
+    llist_1 = UnrolledLinkedList([3, 2, 4, 35, 6, 65, 6, 4, 3, 21], capacity=4)
+    llist_2 = UnrolledLinkedList([6, 32, 4, 9, 6, 1, 11, 21, 1], capacity=4)
+    print(f"list 1 ({llist_1.chunk_count()} chunks): {llist_1}")
+    print(f"list 2 ({llist_2.chunk_count()} chunks): {llist_2}")
+    print(f"union:        {union(llist_1, llist_2)}")
+    print(f"intersection: {intersection(llist_1, llist_2)}")
+    evens = UnrolledLinkedList(range(0, 40, 2), typecode="q")
+    thirds = UnrolledLinkedList(range(0, 40, 3), typecode="q")
+    print(f"sorted merge: {intersection(evens, thirds, 'merge')}")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("UNROLLED LINKED LIST")
+    print("=" * 60)
+    demonstrate_unrolled_list()
+
+    print("\n" + "=" * 60)
+    print("NODE CHAIN VS UNROLLED CHUNKS")
+    print("=" * 60)
+    for row in benchmark_unrolled_list():
+        print(
+            f"{row['size']:>9} {row['structure']:>12} | "
+            f"build {row['build_seconds']:6.3f}s | "
+            f"iterate {row['iterate_seconds']:6.3f}s | "
+            f"str {row['str_seconds']:6.3f}s | "
+            f"{row['bytes_per_element']:5.1f} B/element"
+        )
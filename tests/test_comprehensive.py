@@ -9,10 +9,17 @@ Test cases covering:
 - Edge cases and error conditions
 """
 
+import calendar
+import csv
+import itertools
+import json
 import os
+import random
 import shutil
 import sys
 import tempfile
+import time
+from collections import Counter
 from pathlib import Path
 
 import pytest
@@ -20,8 +27,61 @@ import pytest
 # Add src directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
+import call_log_archive
+import columnar_cache
+import telecom_pipeline
+
 # Import all modules after path setup
+from block_store import BlockStore, read_blocks
+from call_log_archive import (
+    CallLogArchive,
+    convert_csv,
+    format_timestamp,
+    pack_column,
+    parse_timestamp,
+    unpack_column,
+)
+from cardinality_sketch import BottomKSketch, HyperLogLog, estimate_telemarketers
+from chain_verifier import parallel_first_invalid, parallel_verify
+from columnar_cache import CachedLog, cache_path, cached_rows, open_cache
+from columnar_calls import CallColumns, ColumnarDataset
+from compression_benchmark import run_benchmark
+from enhanced_active_directory import (
+    BitsetDirectory,
+    Group,
+    MembershipIndex,
+    MembershipResolver,
+    SetGroup,
+    is_user_in_group,
+)
+from enhanced_adaptive_huffman import (
+    AdaptiveHuffmanDecoder,
+    AdaptiveHuffmanEncoder,
+    adaptive_huffman_decoding,
+    adaptive_huffman_encoding,
+)
+from enhanced_blockchain import (
+    GENESIS_PREVIOUS_HASH,
+    Block,
+    Blockchain,
+    MerkleTree,
+    merkle_root,
+    verify_proof,
+)
 from enhanced_file_finder import FileSearcher
+from enhanced_huffman import (
+    CONTAINER_HEADER,
+    FRAME_HEADER,
+    build_code_lengths,
+    build_length_limited_code_lengths,
+    compute_frequencies,
+    decode_frame,
+    encode_block,
+    huffman_decoding,
+    huffman_encoding,
+    parallel_huffman_decoding,
+    parallel_huffman_encoding,
+)
 from enhanced_lru_cache import LRUCache
 from enhanced_problem3 import rearrange_digits, validate_solution
 from enhanced_problem4 import (
@@ -29,9 +89,43 @@ from enhanced_problem4 import (
     sort_012_functional,
     sort_012_inplace,
 )
-from enhanced_task2 import find_longest_caller, parse_call_duration
-from enhanced_task3 import PhoneNumberAnalyzer
-from enhanced_task4 import TelemarketerDetector
+from enhanced_task2 import (
+    bucket_month,
+    find_longest_caller,
+    line_aligned_ranges,
+    month_bucket,
+    parallel_call_durations,
+    parse_call_duration,
+    read_csv_file,
+    top_callers,
+)
+from enhanced_task3 import PhoneNumberAnalyzer, analyze_bangalore_calls
+from enhanced_task4 import (
+    StreamingTelemarketerDetector,
+    TelemarketerDetector,
+    detect_telemarketers,
+)
+from enhanced_union_intersection import (
+    LinkedList,
+    calls_column,
+    intersection,
+    multiset_difference,
+    multiset_intersection,
+    multiset_union,
+    union,
+)
+from pow_miner import mine_block, search_nonces
+from roaring_bitmap import RoaringBitmap
+from telecom_pipeline import RecordPipeline, UniqueNumberCounter, full_report
+from telecom_records import (
+    CallRecord,
+    TextRecord,
+    iter_calls,
+    iter_rows,
+    iter_texts,
+    skip_header,
+)
+from unrolled_linked_list import UnrolledLinkedList
 
 
 class TestLRUCache:
@@ -373,6 +467,77 @@ class TestUnscrambleCSProblems:
         assert durations["67890"] == 420  # 120 + 300 (caller + receiver)
         assert "11111" not in durations  # Wrong month
 
+    def test_month_bucket(self):
+        """Test positional month keys against strptime and bad layouts."""
+        for text in (
+            "01-09-2016 10:00:00",
+            "31-12-1999 23:59:59",
+            "29-02-2016 00:00:00",
+        ):
+            parsed = time.strptime(text, "%d-%m-%Y %H:%M:%S")
+            bucket = month_bucket(text)
+            assert bucket_month(bucket) == (parsed.tm_year, parsed.tm_mon)
+        assert (
+            month_bucket("01-10-2016 00:00:00")
+            == month_bucket("30-09-2016 23:59:59") + 1
+        )
+        for bad in ("2016-09-01 10:00:00", "01-13-2016 10:00:00", "01-09-2016", ""):
+            with pytest.raises(ValueError):
+                month_bucket(bad)
+
+    def test_call_duration_skips_malformed_timestamps(self, capsys):
+        """Test that bad timestamps are reported and skipped, not fatal."""
+        calls_data = [
+            ["a", "b", "01-09-2016 10:00:00", "5"],
+            ["a", "c", "01/09/2016 10:00:00", "7"],
+        ]
+        assert parse_call_duration(calls_data) == {"a": 5, "b": 5}
+        assert "Skipping invalid record" in capsys.readouterr().out
+
+    def test_line_aligned_ranges(self, tmp_path):
+        """Test that byte ranges cover the file and never split a line."""
+        path = tmp_path / "calls.csv"
+        lines = [f"{i},{i * 7},01-09-2016 10:00:00,{i}\n" for i in range(200)]
+        path.write_text("".join(lines))
+        for parts in (1, 3, 16, 1000):
+            ranges = line_aligned_ranges(path, parts)
+            assert ranges[0][0] == 0 and ranges[-1][1] == path.stat().st_size
+            assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+            data = path.read_bytes()
+            chunks = [data[start:stop].decode() for start, stop in ranges]
+            assert all(chunk.endswith("\n") for chunk in chunks)
+            assert "".join(chunks).splitlines(keepends=True) == lines
+
+    def test_parallel_call_durations(self, tmp_path):
+        """Test that sharded totals match the serial parser."""
+        rng = random.Random(5)
+        path = tmp_path / "calls.csv"
+        rows = [["calling number", "receiving number", "timestamp", "duration"]]
+        for _ in range(500):
+            month = rng.choice((8, 9))
+            rows.append(
+                [
+                    f"n{rng.randrange(40)}",
+                    f"n{rng.randrange(40)}",
+                    f"{rng.randrange(1, 29):02d}-{month:02d}-2016 10:00:00",
+                    str(rng.randrange(1, 500)),
+                ]
+            )
+        with open(path, "w", newline="") as f:
+            csv.writer(f).writerows(rows)
+        serial = parse_call_duration(rows)
+        sharded = parallel_call_durations(path, workers=2, ranges_per_worker=3)
+        assert sharded == serial
+
+    def test_top_callers(self):
+        """Test heap-based top-k against a stable sort."""
+        durations = {"a": 5, "b": 9, "c": 5, "d": 1, "e": 9}
+        assert top_callers(durations, 3) == [("b", 9), ("e", 9), ("a", 5)]
+        assert top_callers(durations, 10) == sorted(
+            durations.items(), key=lambda x: x[1], reverse=True
+        )
+        assert find_longest_caller(durations) == top_callers(durations, 1)[0]
+
     def test_find_longest_caller(self):
         """Test finding caller with longest duration."""
         durations = {"12345": 100, "67890": 300, "11111": 50}
@@ -486,6 +651,1348 @@ class TestProblemsVsAlgorithms:
             sort_012_inplace([0, 1, 2, -1])  # Invalid element
 
 
+class TestHuffmanCodec:
+    """Tests for the block-framed Huffman codec."""
+
+    @pytest.mark.parametrize(
+        "data",
+        [b"", b"A", b"AAAAAAAAA", b"The bird is the word", bytes(range(256)) * 3],
+    )
+    def test_round_trip(self, data):
+        """Test that decoding restores the original bytes."""
+        encoded = huffman_encoding(data, block_size=100)
+        assert huffman_decoding(encoded) == data
+
+    def test_text_input(self):
+        """Test that text input is UTF-8 encoded before compression."""
+        encoded = huffman_encoding("Huffman coding is a data compression algorithm.")
+        decoded = huffman_decoding(encoded).decode("utf-8")
+        assert decoded == "Huffman coding is a data compression algorithm."
+
+    def test_compresses_skewed_input(self):
+        """Test that a skewed distribution is actually compressed."""
+        data = b"a" * 5000 + b"b" * 500 + b"c" * 50
+        assert len(huffman_encoding(data)) < len(data) // 4
+
+    def test_parallel_matches_serial(self):
+        """Test that the process pool produces identical framed output."""
+        data = b"calling number,receiving number,timestamp,duration\n" * 400
+        serial = huffman_encoding(data, block_size=4096)
+        parallel = parallel_huffman_encoding(data, workers=2, block_size=4096)
+
+        assert parallel == serial
+        assert parallel_huffman_decoding(parallel, workers=2) == data
+
+    def test_numpy_path_matches_pure_python(self):
+        """Test that the vectorized encoder emits identical frames."""
+        pytest.importorskip("numpy")
+        data = b"(080)33251027,1412;12534;51,01-09-2016 06:03:22,143\n" * 300
+        skewed = b"".join(bytes([i]) * (2**i) for i in range(14))
+
+        for sample in (data, skewed, bytes(range(256))):
+            assert compute_frequencies(sample, use_numpy=True) == compute_frequencies(
+                sample, use_numpy=False
+            )
+            assert encode_block(sample, use_numpy=True) == encode_block(
+                sample, use_numpy=False
+            )
+
+    def test_encode_block_checks_supplied_lengths(self):
+        """Test that shared code lengths must cover every symbol in the block."""
+        shared = build_code_lengths(compute_frequencies(b"abcabc"))
+        frame = encode_block(b"cab", lengths=shared)
+        assert decode_frame(frame)[0] == b"cab"
+        with pytest.raises(ValueError):
+            encode_block(b"abd", lengths=shared)
+        with pytest.raises(ValueError):
+            encode_block(b"ab", lengths=shared[:10])
+
+    def test_length_limited_codes(self):
+        """Test package-merge lengths respect the limit and stay decodable."""
+        skewed = b"".join(bytes([i]) * (2**i) for i in range(20))
+        frequencies = compute_frequencies(skewed)
+
+        assert max(build_code_lengths(frequencies)) == 19
+        limited = build_length_limited_code_lengths(frequencies, 12)
+        assert max(limited) == 12
+        assert sum(2.0**-length for length in limited if length) <= 1.0
+
+        encoded = huffman_encoding(skewed, block_size=1 << 21, max_code_length=12)
+        assert huffman_decoding(encoded) == skewed
+
+    def test_length_limit_is_optimal_when_loose(self):
+        """Test that a non-binding limit reproduces the Huffman cost."""
+        frequencies = compute_frequencies(b"abracadabra alakazam")
+        unrestricted = build_code_lengths(frequencies)
+        limited = build_length_limited_code_lengths(frequencies, 15)
+
+        def cost(lengths):
+            return sum(f * n for f, n in zip(frequencies, lengths))
+
+        assert cost(limited) == cost(unrestricted)
+
+    def test_length_limit_too_small(self):
+        """Test that an impossible limit is rejected."""
+        with pytest.raises(ValueError):
+            build_length_limited_code_lengths(compute_frequencies(bytes(range(9))), 3)
+
+    @pytest.mark.parametrize(
+        "data", [b"", b"A", b"AAAAAAAAA", b"The bird is the word", bytes(range(256))]
+    )
+    def test_adaptive_round_trip(self, data):
+        """Test one-pass adaptive coding round trips."""
+        assert adaptive_huffman_decoding(adaptive_huffman_encoding(data)) == data
+
+    def test_adaptive_streaming_chunks(self):
+        """Test that tree state carries across streamed chunks."""
+        encoder = AdaptiveHuffmanEncoder()
+        decoder = AdaptiveHuffmanDecoder()
+        chunks = [b"to be or not", b" to be", b"", b" that is the question"]
+
+        encoded = [encoder.encode(chunk) for chunk in chunks]
+        assert [decoder.decode(chunk) for chunk in encoded] == chunks
+        # Repeated text costs less once the model has adapted
+        assert len(encoded[1]) < len(encoded[0])
+
+    def test_invalid_container(self):
+        """Test that corrupt input is rejected."""
+        with pytest.raises(ValueError):
+            huffman_decoding(b"nope")
+
+        encoded = huffman_encoding(b"some data to truncate")
+        with pytest.raises(ValueError):
+            huffman_decoding(encoded[:-3])
+
+    def test_corrupt_code_lengths(self):
+        """Test that lengths forming no complete prefix code are rejected."""
+        data = b"corrupt code lengths must not decode to garbage" * 20
+        encoded = bytearray(huffman_encoding(data))
+        lengths_start = CONTAINER_HEADER.size + FRAME_HEADER.size
+        symbol = data[0]
+        for delta in (1, -1):
+            corrupt = bytearray(encoded)
+            corrupt[lengths_start + symbol] += delta
+            with pytest.raises(ValueError):
+                huffman_decoding(bytes(corrupt))
+        unused = lengths_start + ord("~")
+        corrupt = bytearray(encoded)
+        corrupt[unused] = 1
+        with pytest.raises(ValueError):
+            huffman_decoding(bytes(corrupt))
+
+    def test_payload_must_end_at_bit_length(self):
+        """Test that decoding has to consume exactly the recorded bits."""
+        encoded = bytearray(huffman_encoding(b"abracadabra"))
+        bit_length_at = CONTAINER_HEADER.size + 4
+        bit_length = int.from_bytes(encoded[bit_length_at : bit_length_at + 8], "big")
+        encoded[bit_length_at : bit_length_at + 8] = (bit_length + 1).to_bytes(8, "big")
+        with pytest.raises(ValueError):
+            huffman_decoding(bytes(encoded))
+        lone = bytearray(huffman_encoding(b"AAAA"))
+        lone[-1] |= 0x80  # a '1' bit is no code when only '0' is assigned
+        with pytest.raises(ValueError):
+            huffman_decoding(bytes(lone))
+
+
+class TestCompressionBenchmark:
+    """Tests for the compression benchmark harness."""
+
+    def test_report_rows(self):
+        """Test that every (corpus, codec) pair yields a JSON-ready row."""
+        corpus = {"log": b"(080)33251027,1412;12534;51,01-09-2016 06:03:22,143\n" * 50}
+        report = run_benchmark(corpus, ["huffman", "adaptive", "zlib"], repeat=1)
+
+        rows = report["results"]
+        assert [row["codec"] for row in rows] == ["huffman", "adaptive", "zlib"]
+        for row in rows:
+            assert row["original_bytes"] == len(corpus["log"])
+            assert row["ratio"] > 1.0
+            assert row["encode_mb_s"] > 0 and row["decode_mb_s"] > 0
+            assert row["peak_memory_bytes"] > 0
+        json.dumps(report)
+
+    def test_unknown_codec(self):
+        """Test that unknown codec names are rejected."""
+        with pytest.raises(ValueError):
+            run_benchmark({"x": b"abc"}, ["snappy"])
+
+
+class TestCallLogArchive:
+    """Tests for the columnar call/text archive."""
+
+    SAMPLE_DATA = Path(__file__).resolve().parent.parent / "sample_data"
+
+    def _csv_rows(self, filename):
+        with open(self.SAMPLE_DATA / filename, newline="") as f:
+            return list(csv.reader(f))[1:]
+
+    @pytest.mark.parametrize("filename", ["calls.csv", "texts.csv"])
+    def test_round_trip(self, filename, tmp_path):
+        """Test that every column decodes back to the CSV contents."""
+        archive_path = tmp_path / "log.cla"
+        size = convert_csv(self.SAMPLE_DATA / filename, archive_path)
+
+        archive = CallLogArchive(archive_path)
+        assert list(archive.iter_rows()) == self._csv_rows(filename)
+        assert size < (self.SAMPLE_DATA / filename).stat().st_size
+
+    def test_column_projection(self, tmp_path):
+        """Test that analyses can run on just the columns they need."""
+        archive_path = tmp_path / "calls.cla"
+        convert_csv(self.SAMPLE_DATA / "calls.csv", archive_path)
+        archive = CallLogArchive(archive_path)
+        rows = self._csv_rows("calls.csv")
+
+        assert parse_call_duration(list(archive.iter_rows())) == parse_call_duration(
+            rows
+        )
+        assert list(archive.iter_rows(["caller", "receiver"])) == [r[:2] for r in rows]
+        with pytest.raises(KeyError):
+            archive.column("sender")
+
+    def test_not_an_archive(self, tmp_path):
+        """Test that foreign files are rejected."""
+        bogus = tmp_path / "bogus.cla"
+        bogus.write_bytes(b"calling number,receiving number")
+        with pytest.raises(ValueError):
+            CallLogArchive(bogus)
+
+    def test_truncated_archive(self, tmp_path):
+        """Test that an archive cut short anywhere in its directory is rejected."""
+        archive_path = tmp_path / "calls.cla"
+        convert_csv(self.SAMPLE_DATA / "calls.csv", archive_path)
+        data = archive_path.read_bytes()
+        directory_end = (
+            call_log_archive.HEADER.size
+            + 5 * (1 + call_log_archive.DIRECTORY_ENTRY.size)
+            + len("numbers")
+            + len("callerreceivertimestampduration")
+        )
+        for size in range(call_log_archive.HEADER.size, directory_end):
+            archive_path.write_bytes(data[:size])
+            with pytest.raises(ValueError):
+                CallLogArchive(archive_path)
+
+    @pytest.mark.parametrize("vectorized", [True, False])
+    def test_bit_packing(self, vectorized, monkeypatch):
+        """Test frame-of-reference bit packing with and without NumPy."""
+        if not vectorized:
+            monkeypatch.setattr(call_log_archive, "np", None)
+        for values in ([], [7, 7, 7], [-5, 0, 3, 1000, -5], list(range(1001))):
+            assert unpack_column(pack_column(values), len(values)) == values
+        wide = [0, 2**62 + 1, 12345]
+        assert unpack_column(pack_column(wide), 3) == wide
+
+    def test_timestamps(self):
+        """Test positional timestamp parsing against strptime."""
+        for text in (
+            "01-09-2016 06:03:22",
+            "29-02-2016 23:59:59",
+            "31-12-1999 00:00:00",
+        ):
+            assert parse_timestamp(text) == calendar.timegm(
+                time.strptime(text, "%d-%m-%Y %H:%M:%S")
+            )
+            assert format_timestamp(parse_timestamp(text)) == text
+        with pytest.raises(ValueError):
+            parse_timestamp("2016-09-01 06:03:22")
+
+    def test_task_readers(self, tmp_path, monkeypatch):
+        """Test that the Task 2-4 analyses accept archives in place of CSV."""
+        calls, texts = tmp_path / "calls.cla", tmp_path / "texts.cla"
+        convert_csv(self.SAMPLE_DATA / "calls.csv", calls)
+        convert_csv(self.SAMPLE_DATA / "texts.csv", texts)
+        assert parse_call_duration(read_csv_file(calls)) == parse_call_duration(
+            read_csv_file(self.SAMPLE_DATA / "calls.csv")
+        )
+        monkeypatch.chdir(self.SAMPLE_DATA.parent)
+        assert analyze_bangalore_calls(str(calls)) == analyze_bangalore_calls()
+        assert detect_telemarketers(str(calls), str(texts)) == detect_telemarketers()
+
+
+class TestTelecomRecords:
+    """Tests for the shared streaming calls/texts reader."""
+
+    SAMPLE_DATA = Path(__file__).resolve().parent.parent / "sample_data"
+
+    def test_typed_records_with_and_without_header(self, tmp_path):
+        """Test that a header row is skipped and fields are typed."""
+        headerless = tmp_path / "calls.csv"
+        with open(self.SAMPLE_DATA / "calls.csv") as f:
+            headerless.write_text("".join(f.readlines()[1:]))
+        with_header = list(iter_calls(self.SAMPLE_DATA / "calls.csv"))
+        assert with_header == list(iter_calls(headerless))
+        first = with_header[0]
+        assert isinstance(first, CallRecord) and isinstance(first.duration, int)
+        assert first.caller == "(080)33251027" and first.duration == 143
+
+        texts = list(iter_texts(self.SAMPLE_DATA / "texts.csv"))
+        assert isinstance(texts[0], TextRecord) and len(texts) == 15
+
+    def test_streams_lazily(self, tmp_path):
+        """Test that a missing file fails at once and bad rows when reached."""
+        with pytest.raises(FileNotFoundError):
+            iter_rows(tmp_path / "missing.csv")
+
+        broken = tmp_path / "calls.csv"
+        broken.write_text("a,b,01-09-2016 06:03:22,5\na,b\n")
+        records = iter_calls(broken)
+        assert next(records).duration == 5
+        with pytest.raises(ValueError, match="record 2"):
+            next(records)
+
+    def test_header_checked_once(self):
+        """Test that only the first row can be a header."""
+        header = ["calling number", "receiving number", "timestamp", "duration"]
+        rows = [header, ["a", "b"], header]
+        assert list(skip_header(rows)) == [["a", "b"], header]
+        assert list(skip_header([])) == []
+
+    def test_archives(self, tmp_path):
+        """Test that archives stream the same records as their CSV."""
+        archive = tmp_path / "texts.cla"
+        convert_csv(self.SAMPLE_DATA / "texts.csv", archive)
+        assert list(iter_texts(archive)) == list(
+            iter_texts(self.SAMPLE_DATA / "texts.csv")
+        )
+
+
+class TestTelecomPipeline:
+    """Tests for the single-pass Task 0-4 pipeline."""
+
+    SAMPLE_DATA = Path(__file__).resolve().parent.parent / "sample_data"
+
+    def test_full_report_matches_tasks(self, monkeypatch):
+        """Test that one scan gives the same answers as the per-task code."""
+        calls, texts = self.SAMPLE_DATA / "calls.csv", self.SAMPLE_DATA / "texts.csv"
+        report = full_report(calls, texts)
+
+        monkeypatch.chdir(self.SAMPLE_DATA.parent)
+        codes, percentage = analyze_bangalore_calls()
+        assert (report["bangalore_codes"], report["bangalore_percentage"]) == (
+            codes,
+            percentage,
+        )
+        assert report["telemarketers"] == detect_telemarketers()[0]
+        assert report["longest_caller"] == find_longest_caller(
+            parse_call_duration(read_csv_file(calls))
+        )
+        all_texts, all_calls = list(iter_texts(texts)), list(iter_calls(calls))
+        assert report["first_text"] == all_texts[0]
+        assert report["last_call"] == all_calls[-1]
+        numbers = {n for record in all_calls + all_texts for n in record[:2]}
+        assert report["unique_numbers"] == len(numbers)
+        assert report["period"] == "September 2016"
+
+    def test_each_file_read_once(self, monkeypatch):
+        """Test that all consumers share a single scan of each file."""
+        opened = Counter()
+
+        def counting(reader):
+            def wrapper(path):
+                opened[reader.__name__] += 1
+                return reader(path)
+
+            return wrapper
+
+        monkeypatch.setattr(telecom_pipeline, "iter_calls", counting(iter_calls))
+        monkeypatch.setattr(telecom_pipeline, "iter_texts", counting(iter_texts))
+        full_report(self.SAMPLE_DATA / "calls.csv", self.SAMPLE_DATA / "texts.csv")
+        assert opened == {"iter_calls": 1, "iter_texts": 1}
+
+    def test_register(self):
+        """Test hook discovery and in-memory feeding."""
+        counter = UniqueNumberCounter()
+        pipeline = RecordPipeline()
+        assert pipeline.register(counter) is counter
+        with pytest.raises(TypeError):
+            pipeline.register(object())
+        pipeline.feed(
+            [CallRecord("a", "b", "01-09-2016 06:03:22", 5)],
+            [TextRecord("b", "c", "01-09-2016 06:03:22")],
+        )
+        assert counter.count() == 3
+
+
+class TestColumnarCalls:
+    """Tests for the NumPy columnar backend."""
+
+    SAMPLE_DATA = Path(__file__).resolve().parent.parent / "sample_data"
+
+    def test_matches_row_analyses(self, monkeypatch):
+        """Test that the vectorized answers equal the Task 2-4 code."""
+        calls, texts = self.SAMPLE_DATA / "calls.csv", self.SAMPLE_DATA / "texts.csv"
+        dataset = ColumnarDataset(calls, texts)
+        durations = parse_call_duration(read_csv_file(calls))
+        assert dataset.call_durations() == durations
+        assert dataset.top_callers(3) == top_callers(durations, 3)
+        assert dataset.top_callers(1)[0] == find_longest_caller(durations)
+        assert dataset.call_durations(2016, 8) == {}
+
+        monkeypatch.chdir(self.SAMPLE_DATA.parent)
+        assert dataset.bangalore_codes() == analyze_bangalore_calls()
+        assert dataset.telemarketers() == detect_telemarketers()[0]
+
+    def test_call_durations_is_drop_in(self, tmp_path):
+        """Test zero-second calls, key order and exact int64 totals."""
+        np = pytest.importorskip("numpy")
+        rows = [
+            ["(080)111", "(080)222", "01-09-2016 06:03:22", "0"],
+            ["(080)333", "(080)111", "02-09-2016 06:03:22", "0"],
+            ["(080)444", "(080)333", "03-09-2016 06:03:22", "5"],
+            ["(080)555", "(080)666", "03-10-2016 06:03:22", "9"],
+        ]
+        calls_csv = tmp_path / "calls.csv"
+        with open(calls_csv, "w", newline="") as f:
+            csv.writer(f).writerows(rows)
+        dataset = ColumnarDataset(calls_csv)
+        expected = parse_call_duration(rows)
+        assert dataset.call_durations() == expected
+        assert list(dataset.call_durations()) == list(expected)
+        assert dataset.top_callers(10) == top_callers(expected, 10)
+        assert dataset.top_callers(0) == []
+
+        count = 4_300_000  # past 2**53 seconds, where float64 sums round
+        dataset.calls = CallColumns(
+            np.zeros(count, np.int32),
+            np.ones(count, np.int32),
+            np.full(count, dataset.calls.timestamp[0], np.int64),
+            np.full(count, 2**31 - 1, np.int32),
+        )
+        assert dataset.duration_totals()[:2].tolist() == [(2**31 - 1) * count] * 2
+
+    def test_archives_share_number_ids(self, tmp_path):
+        """Test that archive columns are remapped onto one number table."""
+        rows = [
+            ["(080)111", "(080)222", "01-09-2016 06:03:22", "60"],
+            ["1400000", "(044)333", "30-09-2016 23:59:59", "7"],
+            ["(080)111", "98765 43210", "01-10-2016 00:00:00", "9"],
+        ]
+        calls_csv, texts_csv = tmp_path / "calls.csv", tmp_path / "texts.csv"
+        with open(calls_csv, "w", newline="") as f:
+            csv.writer(f).writerows(rows)
+        with open(texts_csv, "w", newline="") as f:
+            csv.writer(f).writerow(["(044)333", "(080)111", "01-09-2016 06:03:22"])
+        convert_csv(calls_csv, tmp_path / "calls.cla")
+        convert_csv(texts_csv, tmp_path / "texts.cla")
+
+        for calls, texts in [
+            (calls_csv, texts_csv),
+            (tmp_path / "calls.cla", tmp_path / "texts.cla"),
+        ]:
+            dataset = ColumnarDataset(calls, texts)
+            assert dataset.telemarketers() == ["1400000"]
+            assert dataset.call_durations() == {
+                "(080)111": 60,
+                "(080)222": 60,
+                "1400000": 7,
+                "(044)333": 7,
+            }
+            assert dataset.bangalore_codes() == (["(080)", "9876"], 50.0)
+            assert dataset.calls.timestamp.dtype.itemsize == 8
+            assert dataset.calls.duration.dtype.itemsize == 4
+
+
+class TestColumnarCache:
+    """Tests for the convert-once binary dataset cache."""
+
+    SAMPLE_DATA = Path(__file__).resolve().parent.parent / "sample_data"
+
+    @pytest.fixture
+    def logs(self, tmp_path):
+        """Copies of the sample logs in a scratch directory."""
+        logs = tmp_path / "logs"
+        logs.mkdir()
+        for filename in ("calls.csv", "texts.csv"):
+            shutil.copy(self.SAMPLE_DATA / filename, logs / filename)
+        return logs
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """An empty cache directory."""
+        cache = tmp_path / "cache"
+        cache.mkdir()
+        return cache
+
+    @pytest.fixture
+    def builds(self, monkeypatch):
+        """Counter of cache builds."""
+        built = Counter()
+        build = columnar_cache.build_cache
+
+        def counting(source, cache):
+            built[Path(source).name] += 1
+            return build(source, cache)
+
+        monkeypatch.setattr(columnar_cache, "build_cache", counting)
+        return built
+
+    def test_round_trip(self, logs, cache, monkeypatch):
+        """Test that cached rows and columns match the parsed source."""
+        monkeypatch.setattr(columnar_cache, "ROWS_PER_CHUNK", 7)
+        for filename in ("calls.csv", "texts.csv"):
+            source = logs / filename
+            with open_cache(source, cache) as log:
+                assert cache_path(source, cache).parent == cache
+                assert list(log.iter_rows()) == list(iter_rows(source))
+                timestamps = log.raw_column("timestamp")
+                assert timestamps.dtype.itemsize == 8
+                assert not timestamps.flags.owndata  # a view into the mapping
+                del timestamps
+            assert list(cached_rows(source, ["receiver"], cache)) == [
+                [row[1]] for row in iter_rows(source)
+            ]
+        with CachedLog(cache_path(logs / "calls.csv", cache)) as log:
+            assert log.kind == "calls"
+        other = logs / "other"
+        other.mkdir()
+        shutil.copy(logs / "calls.csv", other / "calls.csv")
+        assert cache_path(other / "calls.csv", cache) != cache_path(
+            logs / "calls.csv", cache
+        )
+
+    def test_cache_is_opt_in(self, logs, monkeypatch):
+        """Test that nothing is written unless a cache directory is given."""
+        monkeypatch.chdir(logs)
+        before = sorted(logs.iterdir())
+        assert list(cached_rows(logs / "calls.csv")) == list(
+            iter_rows(logs / "calls.csv")
+        )
+        detect_telemarketers()
+        ColumnarDataset(logs / "calls.csv", logs / "texts.csv")
+        assert sorted(logs.iterdir()) == before
+
+    def test_mapping_closed(self, logs, cache, monkeypatch):
+        """Test that cached_rows closes its mapping when done or abandoned."""
+        closed = Counter()
+        close = CachedLog.close
+
+        def counting(log):
+            closed["close"] += 1
+            close(log)
+
+        monkeypatch.setattr(CachedLog, "close", counting)
+        monkeypatch.setattr(columnar_cache, "ROWS_PER_CHUNK", 4)
+        list(cached_rows(logs / "calls.csv", cache_dir=cache))
+        assert closed["close"] == 1
+        rows = cached_rows(logs / "calls.csv", cache_dir=cache)
+        next(rows)
+        rows.close()
+        assert closed["close"] == 2
+
+    def test_keyed_by_size_mtime_and_hash(self, logs, cache, builds):
+        """Test that only a real content change rebuilds the cache."""
+        source = logs / "calls.csv"
+        open_cache(source, cache).close()
+        open_cache(source, cache).close()
+        assert builds["calls.csv"] == 1
+
+        def stamp():
+            with CachedLog(cache_path(source, cache)) as log:
+                return log.source_mtime_ns
+
+        os.utime(source, ns=(0, 10**9))  # same bytes, new mtime: re-stamp
+        assert stamp() != 10**9
+        open_cache(source, cache).close()
+        assert builds["calls.csv"] == 1
+        assert stamp() == 10**9
+
+        data = source.read_bytes()
+        source.write_bytes(data.replace(b"(080)", b"(081)", 1))
+        os.utime(source, ns=(0, 10**9))  # same size and mtime, new bytes
+        open_cache(source, cache).close()
+        assert builds["calls.csv"] == 1  # trusted on size and mtime
+        os.utime(source, ns=(0, 2 * 10**9))
+        with open_cache(source, cache) as log:
+            assert list(log.iter_rows()) == list(iter_rows(source))
+        assert builds["calls.csv"] == 2
+
+        cache_path(source, cache).write_bytes(b"NPC1")  # damaged cache
+        open_cache(source, cache).close()
+        assert builds["calls.csv"] == 3
+
+    def test_detect_telemarketers_on_cached_ids(self, logs, cache, builds, monkeypatch):
+        """Test that cached Task 4 runs never decode rows to strings."""
+        rows = [
+            ["1400000", "(080)111", "01-09-2016 06:03:22", "60"],
+            ["(080)222", "(080)333", "01-09-2016 06:03:23", "7"],
+            ["1401111", "(080)222", "01-09-2016 06:03:24", "7"],
+            ["(080)444", "(080)555", "01-09-2016 06:03:25", "7"],
+        ]
+        with open(logs / "calls.csv", "w", newline="") as f:
+            csv.writer(f).writerows(rows)
+        with open(logs / "texts.csv", "w", newline="") as f:
+            csv.writer(f).writerows(
+                [
+                    ["(080)444", "98765 43210", "01-09-2016 06:03:22"],
+                    ["9000 000000", "9111 111111", "01-09-2016 06:03:22"],
+                ]
+            )
+        monkeypatch.chdir(logs)
+        expected = detect_telemarketers()
+        assert expected[0] == ["1400000", "1401111"]
+
+        def no_strings(*args):
+            raise AssertionError("rows decoded to strings")
+
+        monkeypatch.setattr(CachedLog, "_decode", no_strings)
+        assert detect_telemarketers(cache_dir=cache) == expected
+        assert detect_telemarketers(cache_dir=cache) == expected
+        assert builds == {"calls.csv": 1, "texts.csv": 1}
+        monkeypatch.undo()
+
+        plain = ColumnarDataset(logs / "calls.csv", logs / "texts.csv")
+        cached = ColumnarDataset(logs / "calls.csv", logs / "texts.csv", cache)
+        assert cached.numbers == plain.numbers
+        assert cached.call_durations() == plain.call_durations()
+        assert cached.telemarketers() == plain.telemarketers() == expected[0]
+
+    def test_falls_back_without_cache(self, logs, tmp_path):
+        """Test that an unwritable cache location still yields the rows."""
+        source = logs / "texts.csv"
+        missing = tmp_path / "missing-dir"
+        assert list(cached_rows(source, cache_dir=missing)) == list(iter_rows(source))
+        assert detect_telemarketers(
+            logs / "calls.csv", logs / "texts.csv", cache_dir=missing
+        ) == detect_telemarketers(logs / "calls.csv", logs / "texts.csv")
+        with pytest.raises(FileNotFoundError):
+            cached_rows(logs / "absent.csv", cache_dir=missing)
+
+
+class TestStreamingTelemarketers:
+    """Tests for incremental, windowed telemarketer detection."""
+
+    SAMPLE_DATA = Path(__file__).resolve().parent.parent / "sample_data"
+
+    def test_unbounded_matches_batch(self):
+        """Test that without a window the answer equals the batch detector."""
+        batch, stream = TelemarketerDetector(), StreamingTelemarketerDetector()
+        rows = [("140", "a"), ("b", "c"), ("a", "d"), ("e", "e"), ("c", "f")]
+        for detector in (batch, stream):
+            for caller, receiver in rows:
+                detector.process_call_record(caller, receiver)
+            detector.process_text_record("b", "x")
+        assert stream.get_potential_telemarketers() == {"140"}
+        assert stream.get_potential_telemarketers() == (
+            batch.get_potential_telemarketers()
+        )
+
+        batch, stream = TelemarketerDetector(), StreamingTelemarketerDetector()
+        RecordPipeline(batch, stream).run(
+            self.SAMPLE_DATA / "calls.csv", self.SAMPLE_DATA / "texts.csv"
+        )
+        assert stream.get_potential_telemarketers() == (
+            batch.get_potential_telemarketers()
+        )
+
+    def test_leaves_set_on_contact(self):
+        """Test that a receiving call or any text clears a candidate at once."""
+        detector = StreamingTelemarketerDetector()
+        detector.process_call_record("a", "b")
+        detector.process_call_record("c", "d")
+        assert detector.get_potential_telemarketers() == {"a", "c"}
+        detector.process_call_record("x", "a")
+        assert not detector.is_candidate("a")
+        detector.process_text_record("c", "y")
+        assert detector.get_potential_telemarketers() == {"x"}
+        detector.process_call_record("a", "b")  # still legitimate
+        assert not detector.is_candidate("a")
+
+    def test_window_expiry(self):
+        """Test that activity ages out and memory stays bounded."""
+        with pytest.raises(ValueError):
+            StreamingTelemarketerDetector(window=0)
+        detector = StreamingTelemarketerDetector(window=100)
+        start = parse_timestamp("01-09-2016 00:00:00")
+        detector.on_call(CallRecord("a", "b", "01-09-2016 00:00:00", 5))
+        detector.on_text(TextRecord("c", "a", "01-09-2016 00:00:30"))
+        assert detector.get_potential_telemarketers() == set()
+
+        detector.process_call_record("a", "z", start + 120)  # text still counts
+        assert not detector.is_candidate("a")
+        detector.advance_to(start + 130)  # text aged out; "a" is still calling
+        assert detector.get_potential_telemarketers() == {"a"}
+        detector.advance_to(start + 220)  # and now its calls have aged out too
+        assert detector.get_potential_telemarketers() == set()
+        assert detector.tracked_numbers() == 0
+
+        for second in range(300, 10_300):
+            detector.process_call_record(f"caller{second}", "hub", start + second)
+        assert detector.tracked_numbers() == 101
+        assert len(detector.get_potential_telemarketers()) == 100
+
+
+class TestActiveDirectory:
+    """Tests for nested group membership."""
+
+    @pytest.fixture
+    def hierarchy(self):
+        """Build the parent -> child -> subchild example."""
+        parent = Group("parent")
+        child = Group("child")
+        sub_child = Group("subchild")
+        sub_child.add_user("sub_child_user")
+        child.add_group(sub_child)
+        parent.add_group(child)
+        return parent, child, sub_child
+
+    def test_is_user_in_group(self, hierarchy):
+        """Test the original example answers."""
+        parent, child, _ = hierarchy
+        assert is_user_in_group("child", child) is True
+        assert is_user_in_group("", child) is False
+        assert is_user_in_group("sub_child_user", parent) is True
+
+    def test_checks_every_subgroup(self, hierarchy):
+        """Test that users in later subgroups are found."""
+        parent, _, _ = hierarchy
+        second = Group("second")
+        second.add_user("second_user")
+        parent.add_group(second)
+        assert is_user_in_group("second_user", parent) is True
+
+    def test_index_matches_traversal(self, hierarchy):
+        """Test that indexed lookups agree with the recursive search."""
+        parent, child, sub_child = hierarchy
+        index = MembershipIndex(parent)
+
+        for group in hierarchy:
+            for user in ["sub_child_user", "child", "parent", "", "nobody"]:
+                assert index.is_member(user, group) == is_user_in_group(user, group)
+        assert index.groups_of("sub_child_user") == {parent, child, sub_child}
+
+    def test_index_incremental_updates(self, hierarchy):
+        """Test that add_user / add_group after indexing are reflected."""
+        parent, child, sub_child = hierarchy
+        index = MembershipIndex(parent)
+
+        sub_child.add_user("new_user")
+        assert index.is_member("new_user", parent)
+
+        other = Group("other")
+        nested = Group("nested")
+        nested.add_user("nested_user")
+        other.add_group(nested)
+        child.add_group(other)
+        assert index.is_member("nested_user", parent)
+        assert index.is_member("nested_user", other)
+        assert not index.is_member("nested_user", sub_child)
+
+        nested.add_user("late_user")
+        assert index.groups_of("late_user") == {parent, child, other, nested}
+
+    def test_set_group_ignores_duplicates(self):
+        """Test that set storage deduplicates users and subgroups."""
+        group = SetGroup("team")
+        sub = SetGroup("sub")
+        for _ in range(3):
+            group.add_user("alice")
+            group.add_group(sub)
+        assert len(group.get_users()) == 1
+        assert len(group.get_groups()) == 1
+        assert not hasattr(group, "__dict__")
+
+    @pytest.mark.parametrize("group_type", [Group, SetGroup])
+    def test_cycle_terminates(self, group_type):
+        """Test that cyclic hierarchies do not recurse forever."""
+        a, b, c = group_type("a"), group_type("b"), group_type("c")
+        a.add_group(b)
+        b.add_group(c)
+        c.add_group(a)
+        c.add_user("carol")
+
+        assert is_user_in_group("carol", a) is True
+        assert is_user_in_group("mallory", a) is False
+        assert MembershipIndex(a).groups_of("carol") == {a, b, c}
+
+    def test_resolver_bulk_queries(self, hierarchy):
+        """Test batch member and group resolution."""
+        parent, child, sub_child = hierarchy
+        resolver = MembershipResolver(parent)
+
+        candidates = ["sub_child_user", "nobody", "child"]
+        assert resolver.members_of(parent, candidates) == {"sub_child_user", "child"}
+        assert resolver.members_of(sub_child) == {"sub_child_user", "subchild"}
+        assert resolver.groups_of("sub_child_user", [child, sub_child]) == {
+            child,
+            sub_child,
+        }
+        assert resolver.groups_of("sub_child_user") == {parent, child, sub_child}
+
+    def test_resolver_invalidation(self, hierarchy):
+        """Test that cached expansions are refreshed after changes."""
+        parent, child, sub_child = hierarchy
+        resolver = MembershipResolver(parent)
+        assert "late_user" not in resolver.members_of(parent)
+
+        sub_child.add_user("late_user")
+        assert "late_user" in resolver.members_of(parent)
+
+        extra = Group("extra")
+        extra.add_user("extra_user")
+        child.add_group(extra)
+        assert resolver.groups_of("extra_user") == {parent, child, extra}
+        assert "extra_user" not in resolver.members_of(sub_child)
+
+    def test_resolver_cycle(self):
+        """Test that every group on a cycle shares one expansion."""
+        a, b, c = SetGroup("a"), SetGroup("b"), SetGroup("c")
+        a.add_group(b)
+        b.add_group(c)
+        c.add_group(a)
+        b.add_user("bob")
+
+        resolver = MembershipResolver(a)
+        expected = {"a", "b", "c", "bob"}
+        assert all(resolver.members_of(g) == expected for g in (a, b, c))
+
+    def test_deep_nesting(self):
+        """Test nesting deeper than the interpreter recursion limit."""
+        root = current = SetGroup("level_0")
+        for level in range(1, 5000):
+            nested = SetGroup(f"level_{level}")
+            current.add_group(nested)
+            current = nested
+        current.add_user("deep_user")
+
+        assert is_user_in_group("deep_user", root) is True
+        assert is_user_in_group("nobody", root) is False
+        assert "deep_user" in MembershipResolver(root).members_of(root)
+
+    def test_roaring_bitmap(self):
+        """Test array/bitmap containers, membership and union."""
+        sparse = RoaringBitmap([5, 70_000, 5])
+        dense = RoaringBitmap(range(0, 20_000, 2))
+        assert len(sparse) == 2 and 70_000 in sparse and 6 not in sparse
+        assert 19_998 in dense and 19_999 not in dense
+
+        union = sparse | dense
+        assert list(union) == sorted({5, 70_000} | set(range(0, 20_000, 2)))
+        assert len(sparse) == 2
+        assert dense.memory_bytes() < len(dense)
+        with pytest.raises(ValueError):
+            sparse.add(-1)
+
+    def test_bitset_directory(self, hierarchy):
+        """Test bitmap lookups agree with traversal and follow changes."""
+        parent, child, sub_child = hierarchy
+        directory = BitsetDirectory(parent)
+        for group in hierarchy:
+            for user in ["sub_child_user", "child", "parent", "", "nobody"]:
+                assert directory.is_member(user, group) == is_user_in_group(user, group)
+        assert directory.members_of(child) == {"child", "subchild", "sub_child_user"}
+        assert directory.membership_count() == 3 + 2 + 1 + 3
+
+        extra = Group("extra")
+        extra.add_user("extra_user")
+        child.add_group(extra)
+        assert directory.is_member("extra_user", parent)
+        assert not directory.is_member("extra_user", sub_child)
+
+    def test_bitset_directory_incremental(self):
+        """Test that changes update bitmaps in place and match traversal."""
+        root, left, right = SetGroup("root"), SetGroup("left"), SetGroup("right")
+        root.add_group(left)
+        root.add_group(right)
+        left.add_user("ann")
+        directory = BitsetDirectory(root)
+        root_bitmap = directory._bitmaps[root]
+
+        right.add_user("bob")
+        shared = SetGroup("shared")
+        shared.add_user("sam")
+        nested = SetGroup("nested")
+        nested.add_group(shared)
+        left.add_group(nested)
+        right.add_group(shared)
+        shared.add_user("late")
+        shared.add_group(root)  # closes a cycle through every group
+
+        assert directory._bitmaps[root] is root_bitmap
+        groups = (root, left, right, shared, nested)
+        for group in groups:
+            for user in ["ann", "bob", "sam", "late", "nested", "nobody"]:
+                assert directory.is_member(user, group) == is_user_in_group(user, group)
+        assert directory.members_of(right) == directory.members_of(root)
+
+    def test_bitset_directory_memory(self, hierarchy):
+        """Test that memory_bytes reports bitmaps plus intern tables."""
+        directory = BitsetDirectory(hierarchy[0])
+        assert directory.bitmap_bytes() > 0 and directory.intern_bytes() > 0
+        assert directory.memory_bytes() == (
+            directory.bitmap_bytes() + directory.intern_bytes()
+        )
+
+    def test_bitset_directory_cycle(self):
+        """Test that groups on a cycle share one bitmap."""
+        a, b, c = SetGroup("a"), SetGroup("b"), SetGroup("c")
+        a.add_group(b)
+        b.add_group(c)
+        c.add_group(a)
+        b.add_user("bob")
+
+        directory = BitsetDirectory(a)
+        assert all(directory.members_of(g) == {"a", "b", "c", "bob"} for g in (a, b, c))
+
+
+class TestBlockchain:
+    """Tests for the hash-chained ledger."""
+
+    @pytest.fixture
+    def chain(self):
+        """Build a five-block chain with fixed timestamps."""
+        chain = Blockchain()
+        for i in range(5):
+            chain.append(f"data {i}", timestamp=float(i))
+        return chain
+
+    def test_hash_chaining(self, chain):
+        """Test that each block links to its predecessor's digest."""
+        assert chain[0].previous_hash == GENESIS_PREVIOUS_HASH
+        for height in range(1, len(chain)):
+            assert chain[height].previous_hash == chain[height - 1].hash
+            assert chain[height].index == height
+        assert chain.last is chain[4]
+        assert chain.verify() is True
+
+    def test_hash_covers_header(self):
+        """Test that timestamp and previous hash change the block hash."""
+        a, b = Blockchain(), Blockchain()
+        a.append("same", timestamp=1.0)
+        b.append("same", timestamp=2.0)
+        assert a[0].hash != b[0].hash
+
+    def test_tampering_detected(self, chain):
+        """Test that modified data and broken links are found."""
+        assert chain.verify() is True
+        chain[2].data = "forged"
+        assert chain.first_invalid() == 2
+        assert chain.verify(from_index=0) is False
+        assert chain.verified_height == 2
+
+    def test_incremental_verify(self, chain):
+        """Test that verify only re-checks blocks past the checkpoint."""
+        assert chain.verify() is True
+        assert chain.verified_height == 5
+        chain[1].data = "forged below the checkpoint"
+        chain.append("new", timestamp=5.0)
+        assert chain.verify() is True
+        assert chain.verified_height == 6
+        assert chain.verify(from_index=0) is False
+
+    def test_merkle_proofs(self):
+        """Test inclusion proofs for every leaf of odd and even trees."""
+        for size in (1, 2, 7, 64):
+            transactions = [f"tx {i}" for i in range(size)]
+            tree = MerkleTree(transactions)
+            assert tree.root == merkle_root(transactions)
+            for index, tx in enumerate(transactions):
+                proof = tree.proof(index)
+                assert len(proof) <= (size - 1).bit_length()
+                assert verify_proof(tx, proof, tree.root)
+                assert not verify_proof("forged", proof, tree.root)
+        with pytest.raises(IndexError):
+            tree.proof(size)
+
+    def test_transaction_block(self, chain):
+        """Test that the header commits to the Merkle body and the label."""
+        block = chain.append("batch", timestamp=5.0, transactions=["a", "b", "c"])
+        assert block.merkle_root == block.body.root
+        assert verify_proof("b", block.proof(1), block.merkle_root)
+        assert chain.verify() is True
+
+        block.data = "relabelled"
+        assert chain.verify(from_index=0) is False
+        block.data = "batch"
+        block.body.transactions[2] = "forged"
+        assert chain.verify(from_index=0) is False
+        with pytest.raises(ValueError):
+            chain[0].proof(0)
+
+
+class TestBlockStore:
+    """Tests for the persistent block store."""
+
+    @pytest.fixture
+    def chain(self):
+        """Build a chain mixing plain and transaction blocks."""
+        chain = Blockchain()
+        for i in range(200):
+            if i % 10 == 0:
+                chain.append(f"batch {i}", float(i), [f"tx {i}.{j}" for j in range(5)])
+            else:
+                chain.append(f"data {i}", timestamp=float(i))
+        return chain
+
+    def test_roundtrip_and_reopen(self, chain, tmp_path):
+        """Test that blocks survive a reopen and segments roll over."""
+        with BlockStore(tmp_path, segment_size=2048) as store:
+            for block in chain:
+                store.append(block)
+        assert len(list(tmp_path.glob("segment_*.dat"))) > 1
+
+        with BlockStore(tmp_path, segment_size=2048) as store:
+            assert len(store) == len(chain)
+            assert store.tip_hash == chain.last.hash
+            for height in (0, 10, 117, 199):
+                block = store[height]
+                assert block.hash == chain[height].hash
+                assert block.data == chain[height].data
+                assert block.is_consistent()
+            assert store[10].body.transactions == chain[10].body.transactions
+
+    def test_open_segment_handles_bounded(self, chain, tmp_path):
+        """Test that reads across many segments keep few files open."""
+        with pytest.raises(ValueError):
+            BlockStore(tmp_path, max_open_segments=0)
+        with BlockStore(tmp_path, segment_size=512, max_open_segments=2) as store:
+            for block in chain:
+                store.append(block)
+            assert len(list(tmp_path.glob("segment_*.dat"))) > 10
+            for height in list(range(len(chain))) + [0, 199, 5, 199]:
+                assert store[height].hash == chain[height].hash
+                assert len(store._readers) <= 2
+        assert [b.hash for b in read_blocks(tmp_path)] == [b.hash for b in chain]
+
+    def test_lookup_by_hash(self, chain, tmp_path):
+        """Test hash -> height lookups, including after a table resize."""
+        with BlockStore(tmp_path) as store:
+            for block in chain:
+                store.append(block)
+            for height in range(len(chain)):
+                assert store.height_of(chain[height].hash) == height
+            assert store.get_by_hash(chain[42].hash).data == "data 42"
+            assert store.get_by_hash(bytes(32)) is None
+
+    def test_rejects_unlinked_blocks(self, chain, tmp_path):
+        """Test that only the next linked block can be appended."""
+        with BlockStore(tmp_path) as store:
+            store.append(chain[0])
+            with pytest.raises(ValueError):
+                store.append(chain[2])
+            with pytest.raises(IndexError):
+                store.get(1)
+
+    def test_recovers_from_torn_write(self, chain, tmp_path):
+        """Test that a partial index record is dropped on reopen."""
+        with BlockStore(tmp_path) as store:
+            for block in list(chain)[:50]:
+                store.append(block)
+        with open(tmp_path / "index.dat", "ab") as f:
+            f.write(b"partial")
+        (tmp_path / "hashes.dat").unlink()
+
+        with BlockStore(tmp_path) as store:
+            assert len(store) == 50
+            assert store.height_of(chain[49].hash) == 49
+            store.append(chain[50])
+            assert store[50].hash == chain[50].hash
+
+    def test_append_does_not_remap_index(self, chain, tmp_path):
+        """Test that appends keep the tip in memory and leave the mapping alone."""
+        with BlockStore(tmp_path) as store:
+            for block in list(chain)[:10]:
+                store.append(block)
+            assert store[5].hash == chain[5].hash
+            mapping = store._index_map
+            for block in list(chain)[10:]:
+                store.append(block)
+                assert store.tip_hash == block.hash
+            assert store._index_map is mapping
+            assert store[150].hash == chain[150].hash
+            assert store._index_map is not mapping
+
+    def test_read_blocks(self, chain, tmp_path):
+        """Test read-only range reads of a store."""
+        with BlockStore(tmp_path, segment_size=2048) as store:
+            for block in chain:
+                store.append(block)
+        blocks = list(read_blocks(tmp_path, 95, 105))
+        assert [block.index for block in blocks] == list(range(95, 105))
+        assert list(read_blocks(tmp_path, 150, 999))[-1].hash == chain.last.hash
+
+    def test_parallel_verifier(self, chain, tmp_path):
+        """Test process-pool verification of stored and in-memory chains."""
+        with BlockStore(tmp_path, segment_size=2048) as store:
+            for block in chain:
+                store.append(block)
+        assert parallel_verify(tmp_path, workers=2) is True
+        assert parallel_first_invalid(chain, workers=2) is None
+
+        chain[130].data = "forged"
+        assert parallel_first_invalid(chain, workers=2) == 130
+
+    def test_parallel_verifier_boundary_link(self, chain):
+        """Test that a broken link at a range boundary is reported."""
+        forged = Block.create(100, 100.0, "forged", bytes(32))
+        chain._blocks[100] = forged
+        assert parallel_first_invalid(chain, workers=2, ranges_per_worker=1) == 100
+
+
+class TestProofOfWork:
+    """Tests for difficulty-target mining."""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_mined_block_meets_difficulty(self, workers):
+        """Test that mined blocks have the required leading zero bits."""
+        chain = Blockchain()
+        chain.append("genesis", timestamp=0.0)
+        block, stats = mine_block(
+            chain, "mined", 10, transactions=["a", "b"], workers=workers
+        )
+        assert block.hash[0] == 0 and block.hash[1] < 0x40
+        assert chain.last is block and chain.verify(from_index=0)
+        assert stats.workers == workers and stats.attempts > 0
+        assert stats.hashes_per_second_per_core > 0
+
+    def test_nonce_tampering_detected(self, tmp_path):
+        """Test that a changed nonce invalidates the block and survives storage."""
+        chain = Blockchain()
+        mine_block(chain, "genesis", 8, workers=1, timestamp=0.0)
+        with BlockStore(tmp_path) as store:
+            store.append(chain[0])
+            assert store[0].nonce == chain[0].nonce
+            assert store[0].is_consistent()
+
+        chain[0].nonce += 1
+        assert chain.first_invalid() == 0
+
+    def test_search_nonces_disjoint_strides(self):
+        """Test that a stride search only tries its own residue class."""
+        prefix = Block.create(0, 0.0, "x", bytes(32), difficulty=4).header_prefix()
+        nonce, attempts = search_nonces(prefix, 4, start=1, step=3)
+        assert nonce % 3 == 1
+        assert attempts == nonce // 3 + 1
+        assert search_nonces(prefix, 255, start=0, step=1, limit=10) == (None, 10)
+
+    def test_invalid_difficulty(self):
+        """Test that out-of-range difficulties are rejected."""
+        with pytest.raises(ValueError):
+            mine_block(Blockchain(), "x", 256, workers=1)
+
+
+class TestUnionIntersection:
+    """Tests for linked list set operations."""
+
+    def test_original_cases(self):
+        """Test the examples from the original problem."""
+        llist_1 = LinkedList([3, 2, 4, 35, 6, 65, 6, 4, 3, 21])
+        llist_2 = LinkedList([6, 32, 4, 9, 6, 1, 11, 21, 1])
+        assert set(union(llist_1, llist_2)) == {1, 2, 3, 4, 6, 9, 11, 21, 32, 35, 65}
+        assert set(intersection(llist_1, llist_2)) == {4, 6, 21}
+        assert str(union(LinkedList(), LinkedList())) == ""
+        assert str(intersection(LinkedList([17]), LinkedList([17]))) == "17 -> "
+
+    def test_tail_and_length(self):
+        """Test O(1) append bookkeeping and sortedness tracking."""
+        llist = LinkedList([1, 2, 2, 5])
+        assert llist.size() == len(llist) == 4
+        assert llist.tail.value == 5 and llist.is_sorted()
+        llist.append(3)
+        assert not llist.is_sorted() and list(llist) == [1, 2, 2, 5, 3]
+        assert not LinkedList([1, "a"]).is_sorted()
+
+    @pytest.mark.parametrize("strategy", ["auto", "hash", "merge"])
+    def test_strategies_agree(self, strategy):
+        """Test that hash and merge strategies give the same sets."""
+        llist_1 = LinkedList([1, 1, 3, 5, 7, 9])
+        llist_2 = LinkedList([1, 2, 3, 3, 4, 9, 10])
+        result = union(llist_1, llist_2, strategy)
+        assert sorted(result) == [1, 2, 3, 4, 5, 7, 9, 10]
+        assert result.size() == 8
+        assert sorted(intersection(llist_1, llist_2, strategy)) == [1, 3, 9]
+        if strategy != "hash":
+            assert list(result) == sorted(result) and result.is_sorted()
+
+    def test_merge_requires_sorted_input(self):
+        """Test that an explicit merge on unsorted lists is rejected."""
+        with pytest.raises(ValueError):
+            union(LinkedList([2, 1]), LinkedList([1]), "merge")
+        with pytest.raises(ValueError):
+            intersection(LinkedList([1]), LinkedList([1]), "bogus")
+
+    def test_incomparable_sorted_lists(self):
+        """Test that auto falls back to hashing across incomparable types."""
+        numbers, letters = LinkedList([1, 2]), LinkedList(["a", "b"])
+        assert list(union(numbers, letters)) == [1, 2, "a", "b"]
+        assert len(intersection(numbers, letters)) == 0
+        with pytest.raises(TypeError):
+            union(numbers, letters, "merge")
+
+    def test_small_sorted_intersection(self):
+        """Test that a much smaller sorted list is hashed, keeping order."""
+        large, small = LinkedList(range(1000)), LinkedList([900, 3, 40])
+        small_sorted = LinkedList([3, 40, 900])
+        for other in (small, small_sorted):
+            result = intersection(large, other)
+            assert list(result) == [3, 40, 900] and result.is_sorted()
+
+    def test_multiset_operations(self):
+        """Test k-way multiset operations against Counter arithmetic."""
+        rng = random.Random(41)
+        inputs = [
+            [rng.randrange(20) for _ in range(rng.randrange(60))] for _ in range(4)
+        ]
+        counters = [Counter(values) for values in inputs]
+        expected_union, expected_common = Counter(), Counter(inputs[0])
+        for counter in counters:
+            expected_union |= counter
+            expected_common &= counter
+        expected_difference = counters[0] - counters[1] - counters[2] - counters[3]
+        assert multiset_union(*(iter(v) for v in inputs)) == expected_union
+        assert multiset_intersection(*(iter(v) for v in inputs)) == expected_common
+        assert multiset_intersection(*inputs) == expected_common
+        assert multiset_difference(*(iter(v) for v in inputs)) == expected_difference
+        assert multiset_intersection() == Counter()
+
+    def test_calls_column_skips_header_and_short_rows(self, tmp_path):
+        """Test that a header or a truncated row is not yielded."""
+        calls_csv = tmp_path / "calls.csv"
+        calls_csv.write_text(
+            "calling number,receiving number,start timestamp,duration\n"
+            "(080)111,(080)222,01-09-2016 06:03:22,60\n"
+            "(080)333,(080)444\n"
+            "(080)555,(080)111,01-09-2016 06:03:23,7\n"
+        )
+        assert list(calls_column(calls_csv, 0)) == ["(080)111", "(080)555"]
+        assert list(calls_column(calls_csv, 1)) == ["(080)222", "(080)111"]
+
+    def test_multiset_intersection_stops_early(self):
+        """Test that an empty partial result leaves later inputs unread."""
+
+        def exploding():
+            raise AssertionError("input should not be consumed")
+            yield  # pragma: no cover
+
+        assert multiset_intersection([1, 2], [3], exploding()) == Counter()
+        assert multiset_difference([1], [1], exploding()) == Counter()
+
+        def endless():
+            for value in itertools.count():
+                assert value <= 7, "input read past the last needed value"
+                yield value
+
+        # Sized inputs are counted first; later ones are read until saturated
+        assert multiset_intersection(endless(), [7, 5]) == Counter([5, 7])
+
+    @pytest.mark.parametrize("typecode", [None, "q"])
+    def test_unrolled_list(self, typecode):
+        """Test chunk rollover, O(1) append and sortedness tracking."""
+        llist = UnrolledLinkedList(range(10), capacity=4, typecode=typecode)
+        assert list(llist) == list(range(10)) and llist.size() == 10
+        assert llist.chunk_count() == 3 and llist.is_sorted()
+        llist.append(10)
+        llist.append(11)
+        assert llist.chunk_count() == 3 and len(llist) == 12
+        llist.append(12)
+        assert llist.chunk_count() == 4 and llist.is_sorted()
+        llist.extend([13, 14, 15, 16, 17])
+        assert llist.chunk_count() == 5 and llist.is_sorted()
+        llist.extend([20, 18])
+        assert list(llist) == list(range(18)) + [20, 18]
+        assert not llist.is_sorted()
+        assert str(UnrolledLinkedList([1, 2])) == "1 -> 2 -> "
+        with pytest.raises(ValueError):
+            UnrolledLinkedList(capacity=0)
+
+    def test_unrolled_list_sorted_across_chunks(self):
+        """Test that extend checks the boundary between chunks."""
+        llist = UnrolledLinkedList([1, 2, 3], capacity=3)
+        llist.extend([0, 4, 5])
+        assert not llist.is_sorted()
+        assert UnrolledLinkedList([1, 2, 3, 3, 4], capacity=2).is_sorted()
+        assert not UnrolledLinkedList([1, "a"], capacity=1).is_sorted()
+
+    def test_unrolled_list_set_operations(self):
+        """Test that union/intersection agree with the Node-chain lists."""
+        rng = random.Random(42)
+        for sort in (False, True):
+            values_1 = [rng.randrange(30) for _ in range(40)]
+            values_2 = [rng.randrange(30) for _ in range(25)]
+            if sort:
+                values_1.sort()
+                values_2.sort()
+            unrolled_1 = UnrolledLinkedList(values_1, capacity=3, typecode="q")
+            unrolled_2 = UnrolledLinkedList(values_2, capacity=5, typecode="q")
+            assert unrolled_1.is_sorted() == sort
+            for operation in (union, intersection):
+                result = operation(unrolled_1, unrolled_2)
+                expected = operation(LinkedList(values_1), LinkedList(values_2))
+                assert isinstance(result, UnrolledLinkedList)
+                assert (result.capacity, result.typecode) == (3, "q")
+                assert list(result) == list(expected)
+                assert result.is_sorted() == expected.is_sorted()
+
+    def test_unrolled_list_mixed_typecodes(self):
+        """Test that results fall back to list chunks for mixed inputs."""
+        ints = UnrolledLinkedList([1, 2, 3], typecode="q")
+        floats = UnrolledLinkedList([2.5, 3.0], typecode="d")
+        result = union(ints, floats)
+        assert result.typecode is None
+        assert list(result) == [1, 2, 2.5, 3]
+
+
+class TestCardinalitySketch:
+    """Tests for HyperLogLog and bottom-k cardinality sketches."""
+
+    @pytest.mark.parametrize("sketch_type", [HyperLogLog, BottomKSketch])
+    def test_union_and_intersection_sizes(self, sketch_type):
+        """Test estimates stay within a few standard errors of exact sizes."""
+        a, b = sketch_type.for_error(0.03), sketch_type.for_error(0.03)
+        assert a.standard_error <= 0.03
+        a.update(range(0, 30_000))
+        b.update(itertools.chain(range(20_000, 50_000), range(20_000, 25_000)))
+        tolerance = 4 * a.standard_error
+        assert abs(a.cardinality() - 30_000) < tolerance * 30_000
+        assert abs(a.union_size(b) - 50_000) < tolerance * 50_000
+        assert abs(a.intersection_size(b) - 10_000) < tolerance * 50_000
+
+    @pytest.mark.parametrize("sketch_type", [HyperLogLog, BottomKSketch])
+    def test_merge_and_serialization(self, sketch_type):
+        """Test that merging matches one sketch of the union and round-trips."""
+        a, b, both = sketch_type(), sketch_type(), sketch_type()
+        a.update(f"a{i}" for i in range(3000))
+        b.update(f"b{i}" for i in range(2000))
+        both.update(f"a{i}" for i in range(3000))
+        both.update(f"b{i}" for i in range(2000))
+        a.merge(b)
+        assert a.to_bytes() == both.to_bytes()
+
+        restored = sketch_type.from_bytes(a.to_bytes())
+        assert restored.cardinality() == a.cardinality()
+        with pytest.raises(ValueError):
+            sketch_type.from_bytes(b"junk")
+
+    def test_sketch_parameters(self):
+        """Test exact small counts and rejected configurations."""
+        small = BottomKSketch(k=100)
+        small.update(["x", "y", "x", 1, "1"])
+        assert small.cardinality() == 3
+        assert HyperLogLog.for_error(0.01).precision == 14
+        with pytest.raises(ValueError):
+            HyperLogLog(precision=2)
+        with pytest.raises(ValueError):
+            HyperLogLog(precision=10).merge(HyperLogLog(precision=11))
+        with pytest.raises(ValueError):
+            BottomKSketch.for_error(0)
+
+    def test_estimate_telemarketers(self, tmp_path):
+        """Test the streaming estimate against the exact detector."""
+        calls = tmp_path / "calls.csv"
+        texts = tmp_path / "texts.csv"
+        calls.write_text(
+            "calling number,receiving number,timestamp,duration\n"
+            "140111,9000,01-09-2016 06:03:22,10\n"
+            "140222,9001,01-09-2016 06:04:22,10\n"
+            "9000,140222,01-09-2016 06:05:22,10\n"
+        )
+        texts.write_text("9002,9001,01-09-2016 06:03:22\n")
+        estimates = estimate_telemarketers(calls, texts)
+        assert estimates["callers"] == 3
+        assert estimates["legitimate"] == 4
+        assert estimates["telemarketers"] == 1
+
+
 if __name__ == "__main__":
     # Run tests with pytest
     pytest.main([__file__, "-v"])